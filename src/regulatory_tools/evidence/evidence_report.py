@@ -202,23 +202,26 @@ class EvidenceReport:
 
         return resolved
 
-def generate_evidence_summary(evidence_run_dir: Path) -> dict:
-    """
-    Aggregates evidence JSON files from a single evidence run directory.
+def parse_evidence_record(data: str | bytes) -> dict | None:
+    """The evidence record in *data*, or None when it is not a JSON object."""
+    try:
+        record = json.loads(data)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
 
-    Returns summary statistics used by reporting and tests.
+
+def summarize_evidence_records(records) -> dict:
+    """
+    Pass/fail counts of evidence *records* (parsed evidence JSON dicts), in
+    the shape of `generate_evidence_summary`.
     """
 
     total = 0
     passed = 0
     failed = 0
 
-    for record_file in evidence_run_dir.glob("*.json"):
-
-        try:
-            record = json.loads(record_file.read_text())
-        except Exception:
-            continue
+    for record in records:
 
         result = record.get("result")
 
@@ -234,3 +237,22 @@ def generate_evidence_summary(evidence_run_dir: Path) -> dict:
         "passed": passed,
         "failed": failed,
     }
+
+
+def generate_evidence_summary(evidence_run_dir: Path) -> dict:
+    """
+    Aggregates evidence JSON files from a single evidence run directory.
+
+    Returns summary statistics used by reporting and tests.
+    """
+
+    def records():
+        for record_file in evidence_run_dir.glob("*.json"):
+            try:
+                record = parse_evidence_record(record_file.read_text())
+            except OSError:
+                continue
+            if record is not None:
+                yield record
+
+    return summarize_evidence_records(records())
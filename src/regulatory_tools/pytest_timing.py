@@ -0,0 +1,37 @@
+"""pytest plugin recording per-test setup/call/teardown durations.
+
+Loaded by `run_pytest_with_coverage` with ``-p regulatory_tools.pytest_timing``
+and enabled with ``--test-timings=<path>``; the JSON file is written when the
+session finishes.
+"""
+
+import json
+from pathlib import Path
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--test-timings",
+        default=None,
+        help="Write per-test setup/call/teardown durations to this JSON file.",
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--test-timings")
+    if path:
+        config.pluginmanager.register(_TimingRecorder(Path(path)), "regulatory_tools_timings")
+
+
+class _TimingRecorder:
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.timings: dict[str, dict[str, float]] = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.timings.setdefault(report.nodeid, {})[report.when] = report.duration
+
+    def pytest_sessionfinish(self, session):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"tests": self.timings}, indent=2, sort_keys=True))
@@ -0,0 +1,158 @@
+"""Cache of forge health results keyed on the project inputs.
+
+A forge run analyses the whole project (complexity, dead code, type coverage,
+possibly mutation testing), which is wasted work when nothing it reads has
+changed. `ForgeCache` stores the `forge_health_as_dict` summary under a key
+built from the source tree, tests, coverage data, requirements catalog,
+dependency manifests, the forge version and the collector selection, and
+each collector's result under a key built from only the inputs that
+collector reads, so a change to the tests or coverage leaves e.g. the
+complexity result valid.
+
+Keys are content digests, not mtimes, so switching back to an earlier
+branch hits the entries recorded there. Both the reports and each
+collector's results are bounded to *max_entries*, least recently used first
+out.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from ..traceability.coverage import coverage_data_path
+from ..traceability.fingerprint import file_digest, value_digest, write_if_changed
+
+# What each collector reads besides the forge version
+COLLECTOR_INPUTS: dict[str, tuple[str, ...]] = {
+    "test_metrics": ("tests", "coverage"),
+    "complexity": ("source",),
+    "dependency_health": ("dependencies",),
+    "requirements_coverage": ("requirements", "tests"),
+    "static_analysis": ("source",),
+    "type_coverage": ("source",),
+    "dead_code": ("source", "tests"),
+    "mutation_testing": ("source", "tests"),
+}
+
+_DEPENDENCY_MANIFESTS = ("pyproject.toml", "setup.cfg", "setup.py", "requirements.txt")
+
+
+def forge_cache_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "forge" / "health_cache.json"
+
+
+def forge_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+
+        return version("forge-utils")
+    except PackageNotFoundError:
+        pass
+    try:
+        import forge
+    except ImportError:
+        return "none"
+    return str(getattr(forge, "__version__", "unknown"))
+
+
+def _tree_digest(root: Path) -> str | None:
+    if not root.is_dir():
+        return None
+    return value_digest({
+        path.relative_to(root).as_posix(): file_digest(path) for path in sorted(root.rglob("*.py"))
+    })
+
+
+def forge_input_digests(project_root: Path) -> dict[str, str | None]:
+    """Content digests of everything a forge run reads, by input name."""
+    return {
+        "source": _tree_digest(project_root / "src"),
+        "tests": _tree_digest(project_root / "tests"),
+        "coverage": file_digest(coverage_data_path(project_root)),
+        "requirements": file_digest(project_root / "docs" / "requirements.yaml"),
+        "dependencies": value_digest([file_digest(project_root / name) for name in _DEPENDENCY_MANIFESTS]),
+        "forge": forge_version(),
+    }
+
+
+class ForgeCache:
+
+    def __init__(self, path: Path, max_entries: int = 8) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.reports: dict[str, dict[str, Any]] = {}
+        self.collectors: dict[str, dict[str, dict[str, Any]]] = {}
+
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            data = {}
+        self.reports = data.get("reports", {})
+        self.collectors = data.get("collectors", {})
+        # Project name and run time of the latest forge report
+        self.meta: dict[str, Any] = data.get("meta", {})
+
+    @staticmethod
+    def report_key(inputs: dict[str, str | None]) -> str:
+        return value_digest(inputs)
+
+    @staticmethod
+    def collector_key(name: str, inputs: dict[str, str | None]) -> str:
+        names = COLLECTOR_INPUTS.get(name, tuple(inputs))
+        return value_digest([inputs["forge"], *(inputs[input_name] for input_name in names)])
+
+    def _touch(self, entries: dict[str, Any], key: str) -> Any:
+        # Dicts keep insertion order, so re-inserting marks the entry most recent
+        entries[key] = entries.pop(key)
+        return entries[key]
+
+    def _evict(self, entries: dict[str, Any]) -> None:
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+    def get(self, inputs: dict[str, str | None]) -> dict[str, Any] | None:
+        """The cached summary for *inputs*, or None."""
+        key = self.report_key(inputs)
+        if key not in self.reports:
+            return None
+        return self._touch(self.reports, key)
+
+    def collector_result(self, name: str, inputs: dict[str, str | None]) -> dict[str, Any] | None:
+        entries = self.collectors.get(name, {})
+        key = self.collector_key(name, inputs)
+        if key not in entries:
+            return None
+        return self._touch(entries, key)
+
+    def _store(self, entries: dict[str, Any], key: str, value: Any) -> None:
+        entries.pop(key, None)
+        entries[key] = value
+        self._evict(entries)
+
+    def put(self, inputs: dict[str, str | None], summary: dict[str, Any]) -> None:
+        """
+        Store *summary* and its collector results. Results marked
+        ``incomplete`` (failed or over budget) are not stored, nor is a
+        report containing one.
+        """
+        results = summary.get("collectors", {})
+        if not any(result.get("incomplete") for result in results.values()):
+            self._store(self.reports, self.report_key(inputs), summary)
+
+        for name, result in results.items():
+            if not result.get("incomplete"):
+                self._store(self.collectors.setdefault(name, {}), self.collector_key(name, inputs), result)
+
+        self.meta = {key: summary[key] for key in ("project_name", "generated_at") if key in summary}
+
+    def save(self) -> None:
+        write_if_changed(
+            self.path,
+            # Not key-sorted: entry order is the LRU order
+            json.dumps(
+                {"meta": self.meta, "reports": self.reports, "collectors": self.collectors},
+                indent=2,
+            ),
+        )
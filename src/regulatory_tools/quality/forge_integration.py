@@ -7,10 +7,22 @@ When forge IS available, `get_forge_health()` runs forge's full collector suite
 against a project (in coverage-only mode to avoid re-running tests that
 regulatory_tools already ran), and `forge_health_as_dict()` serialises the
 result into a plain dict for use by the traceability generator.
+`get_forge_summary()` runs the collectors selected in pyproject.toml
+concurrently, each in its own process that is terminated when its wall-clock
+budget runs out, behind a cache keyed on the project inputs. It needs a forge
+that can run single collectors and grade their combined scores (see
+`forge_api_missing`).
 """
 
 from __future__ import annotations
 
+import inspect
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -19,6 +31,32 @@ if TYPE_CHECKING:
 
 _FORGE_AVAILABLE: bool | None = None  # cached after first import attempt
 
+COLLECTORS = (
+    "test_metrics",
+    "complexity",
+    "dependency_health",
+    "requirements_coverage",
+    "static_analysis",
+    "type_coverage",
+    "dead_code",
+    "mutation_testing",
+)
+
+# Seconds of wall time each collector may take unless configured otherwise
+DEFAULT_COLLECTOR_BUDGET = 600.0
+
+# Collectors that can run while the tests do: they read neither the coverage
+# data nor test results. Mutation testing rewrites the source and runs the
+# tests itself, so it waits for the test run.
+PRE_TEST_COLLECTORS = (
+    "complexity",
+    "dependency_health",
+    "requirements_coverage",
+    "static_analysis",
+    "type_coverage",
+    "dead_code",
+)
+
 
 def _try_import_forge() -> bool:
     """Return True if forge's Aggregator can be imported."""
@@ -37,7 +75,8 @@ def get_forge_health(project_root: Path) -> "ProjectHealthReport | None":
     """Run forge's collector suite against *project_root*.
 
     Uses skip_test_run=True so forge reads the coverage report produced by
-    regulatory_tools' own pytest run rather than executing tests again.
+    regulatory_tools' own pytest run rather than executing tests again. The
+    XML report is rendered from the coverage data first if it is out of date.
 
     Returns None when forge is not installed or when collection fails for any
     reason — callers must handle None gracefully.
@@ -46,6 +85,11 @@ def get_forge_health(project_root: Path) -> "ProjectHealthReport | None":
         return None
     try:
         from forge.aggregator import Aggregator
+
+        from ..traceability.coverage_reports import render_coverage_reports
+
+        # Test runs only keep raw coverage data; forge reads coverage.xml
+        render_coverage_reports(project_root, ("xml",))
         return Aggregator().run(project_root, skip_test_run=True)
     except Exception as exc:
         print(f"[forge_integration] forge health check failed: {exc}")
@@ -58,18 +102,8 @@ def forge_health_as_dict(report: "ProjectHealthReport") -> dict:
     Keeps generator.py free of forge type imports — all forge types stay
     inside this module behind the TYPE_CHECKING guard.
     """
-    collector_keys = (
-        "test_metrics",
-        "complexity",
-        "dependency_health",
-        "requirements_coverage",
-        "static_analysis",
-        "type_coverage",
-        "dead_code",
-        "mutation_testing",
-    )
     collectors: dict[str, dict] = {}
-    for key in collector_keys:
+    for key in COLLECTORS:
         result = getattr(report, key, None)
         if result is None:
             continue
@@ -78,6 +112,9 @@ def forge_health_as_dict(report: "ProjectHealthReport") -> dict:
             "skipped": result.skipped,
             "skip_reason": result.skip_reason,
         }
+        if key == "test_metrics":
+            # Lets a cached summary stand in for the report's coverage figure
+            collectors[key]["line_coverage"] = getattr(result, "line_coverage", None)
 
     overall = report.overall_score
     return {
@@ -89,6 +126,296 @@ def forge_health_as_dict(report: "ProjectHealthReport") -> dict:
     }
 
 
+def _pyproject_forge_config(project_root: Path) -> dict:
+    path = project_root / "pyproject.toml"
+    if not path.is_file():
+        return {}
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10
+        try:
+            import tomli as tomllib
+        except ImportError:
+            return {}
+    with path.open("rb") as f:
+        return tomllib.load(f).get("tool", {}).get("regulatory_tools", {}).get("forge", {})
+
+
+def forge_collector_settings(
+    project_root: Path, collectors: list[str] | None = None
+) -> dict[str, float]:
+    """The collectors to run, mapped to their wall-clock budgets in seconds.
+
+    Read from ``[tool.regulatory_tools.forge]`` in the project's
+    pyproject.toml: ``collectors`` (default: all), ``budget`` (default for
+    every collector) and a ``budgets`` table per collector. *collectors*
+    overrides the configured selection. Raises ValueError for unknown names.
+    """
+    config = _pyproject_forge_config(project_root)
+
+    selected = list(collectors or config.get("collectors") or COLLECTORS)
+    unknown = sorted(set(selected) - set(COLLECTORS))
+    if unknown:
+        raise ValueError(f"Unknown forge collector(s): {', '.join(unknown)}")
+
+    default = float(config.get("budget", DEFAULT_COLLECTOR_BUDGET))
+    budgets = config.get("budgets", {})
+
+    return {name: float(budgets.get(name, default)) for name in selected}
+
+
+def forge_api_missing() -> list[str]:
+    """What the installed forge lacks of the API `get_forge_summary` needs.
+
+    The minimum supported forge runs single collectors
+    (``Aggregator(collectors=[...])``) and grades a set of collector scores
+    the way it grades a full report
+    (``forge.aggregator.grade_scores({collector: score or None})`` returning
+    ``(overall_score, grade)``). Empty when both are available.
+    """
+    from forge import aggregator
+
+    missing = []
+    try:
+        if "collectors" not in inspect.signature(aggregator.Aggregator).parameters:
+            missing.append("Aggregator(collectors=...)")
+    except (TypeError, ValueError):
+        missing.append("Aggregator(collectors=...)")
+    if not callable(getattr(aggregator, "grade_scores", None)):
+        missing.append("grade_scores")
+    return missing
+
+
+def _job_paths(project_root: Path, name: str) -> tuple[Path, Path]:
+    jobs_dir = project_root / "artifacts" / "forge" / "jobs"
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+    return jobs_dir / f"{name}.json", jobs_dir / f"{name}.log"
+
+
+def _start_job(project_root: Path, name: str, budget: float) -> dict:
+
+    output, log_path = _job_paths(project_root, name)
+    output.unlink(missing_ok=True)
+
+    with log_path.open("w") as log:
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "regulatory_tools.quality.forge_job",
+                str(project_root),
+                str(output),
+                name,
+            ],
+            cwd=project_root,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            # Own process group, so the test runs mutation testing starts are stopped with it
+            start_new_session=hasattr(os, "killpg"),
+        )
+
+    return {"proc": proc, "output": output, "budget": budget, "deadline": time.monotonic() + budget}
+
+
+def _terminate(proc: subprocess.Popen) -> None:
+    if proc.poll() is not None:
+        return
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.kill()
+    proc.wait()
+
+
+def start_forge_collectors(project_root: Path, collectors: list[str] | None = None) -> dict | None:
+    """Start the selected `PRE_TEST_COLLECTORS` that have no cached result, e.g. while pytest runs.
+
+    Pass the result as *started* to `get_forge_summary`, which waits for
+    these jobs instead of starting the collectors again; each keeps the
+    budget it started with. `cancel_forge_collectors` stops jobs that end
+    up unused. Returns None when forge is not installed or too old.
+    """
+    if not _try_import_forge() or forge_api_missing():
+        return None
+
+    from .forge_cache import ForgeCache, forge_cache_path, forge_input_digests
+
+    try:
+        budgets = forge_collector_settings(project_root, collectors)
+    except ValueError:
+        # Reported by get_forge_summary, which nothing is started ahead of
+        return None
+    inputs = forge_input_digests(project_root)
+    cache = ForgeCache(forge_cache_path(project_root))
+
+    jobs = {
+        name: _start_job(project_root, name, budget)
+        for name, budget in budgets.items()
+        if name in PRE_TEST_COLLECTORS and cache.collector_result(name, inputs) is None
+    }
+    if jobs:
+        print(f"[forge] Started ahead of the test run: {', '.join(jobs)}")
+
+    return {"inputs": inputs, "jobs": jobs}
+
+
+def cancel_forge_collectors(started: dict | None) -> None:
+    """Stop the jobs of `start_forge_collectors` that `get_forge_summary` did not take."""
+    if not started:
+        return
+    for job in started["jobs"].values():
+        _terminate(job["proc"])
+    started["jobs"].clear()
+
+
+def run_forge_collectors(
+    project_root: Path, budgets: dict[str, float], started_jobs: dict[str, dict] | None = None
+) -> tuple[dict, dict[str, dict]]:
+    """Run each collector in *budgets* concurrently in its own process, within its budget.
+
+    Collectors in *started_jobs* (see `start_forge_collectors`) are already
+    running and are only waited for.
+
+    Returns the metadata of the forge reports (without an overall score or
+    grade, see `get_forge_summary`) and one serialised result per
+    collector. A collector that fails or overruns its budget is terminated
+    and reported as skipped with the reason, marked ``incomplete`` so it is
+    not cached; the others are unaffected.
+    """
+    started_jobs = started_jobs or {}
+
+    if set(budgets) - set(started_jobs):
+        from ..traceability.coverage_reports import render_coverage_reports
+
+        # Test runs only keep raw coverage data; forge reads coverage.xml
+        render_coverage_reports(project_root, ("xml",))
+
+    jobs = {
+        name: started_jobs.get(name) or _start_job(project_root, name, budget)
+        for name, budget in budgets.items()
+    }
+
+    meta: dict = {}
+    results: dict[str, dict] = {}
+
+    for name, job in jobs.items():
+        proc = job["proc"]
+        try:
+            proc.wait(max(job["deadline"] - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            _terminate(proc)
+            reason = f"exceeded its {job['budget']:g} s budget"
+        else:
+            try:
+                summary = json.loads(job["output"].read_text())
+            except (OSError, ValueError):
+                summary = {"error": f"exited {proc.returncode}"}
+
+            if "error" not in summary and name in summary["collectors"]:
+                meta = meta or {
+                    key: value
+                    for key, value in summary.items()
+                    if key not in ("collectors", "overall_score", "grade")
+                }
+                results[name] = summary["collectors"][name]
+                continue
+
+            reason = f"failed: {summary.get('error', 'no result reported')}"
+
+        print(f"[forge] Collector {name} {reason} — reported as skipped.")
+        results[name] = {"score": None, "skipped": True, "skip_reason": reason, "incomplete": True}
+
+    return meta, results
+
+
+def get_forge_summary(
+    project_root: Path, collectors: list[str] | None = None, started: dict | None = None
+) -> dict | None:
+    """`forge_health_as_dict`-style summary of the selected collectors.
+
+    Collectors and their budgets come from `forge_collector_settings`. The
+    whole summary is cached under the content of the project inputs plus
+    the forge version, and each collector's result under the inputs it
+    reads (see `forge_cache`), so only collectors whose inputs changed run,
+    each in its own process (see `run_forge_collectors`). forge grades the
+    combined scores with ``grade_scores``.
+
+    Jobs in *started* (see `start_forge_collectors`) are used for collectors
+    whose inputs have not changed since they started; the others are
+    stopped.
+
+    Returns None when forge is not installed, is older than the minimum
+    API (see `forge_api_missing`), or no collector produced a result.
+    """
+    if not _try_import_forge():
+        return None
+
+    missing = forge_api_missing()
+    if missing:
+        print(
+            f"[forge_integration] The installed forge lacks {' and '.join(missing)}; "
+            "upgrade forge-utils to get forge health."
+        )
+        return None
+
+    from forge.aggregator import grade_scores
+
+    from .forge_cache import ForgeCache, forge_cache_path, forge_input_digests
+
+    budgets = forge_collector_settings(project_root, collectors)
+    inputs = {**forge_input_digests(project_root), "collectors": ",".join(budgets)}
+    cache = ForgeCache(forge_cache_path(project_root))
+
+    summary = cache.get(inputs)
+    if summary is not None:
+        cancel_forge_collectors(started)
+        cache.save()
+        print("[forge] Inputs unchanged — reusing the cached health report.")
+        return summary
+
+    results = {}
+    for name in budgets:
+        cached = cache.collector_result(name, inputs)
+        if cached is not None:
+            results[name] = cached
+
+    stale = {name: budget for name, budget in budgets.items() if name not in results}
+    if results:
+        print(f"[forge] Reusing cached results for: {', '.join(results)}")
+
+    started_jobs = {}
+    if started is not None:
+        for name in list(started["jobs"]):
+            # A job is only valid while what its collector reads is unchanged
+            key = ForgeCache.collector_key(name, inputs)
+            if name in stale and ForgeCache.collector_key(name, started["inputs"]) == key:
+                started_jobs[name] = started["jobs"].pop(name)
+        cancel_forge_collectors(started)
+
+    meta = dict(cache.meta)
+    if stale:
+        fresh_meta, fresh = run_forge_collectors(project_root, stale, started_jobs)
+        meta.update(fresh_meta)
+        results.update(fresh)
+
+    if all(result.get("skipped") for result in results.values()):
+        print("[forge_integration] forge health check failed: no collector produced a score.")
+        return None
+
+    meta["overall_score"], meta["grade"] = grade_scores({
+        name: None if result.get("skipped") else result["score"] for name, result in results.items()
+    })
+
+    summary = {**meta, "collectors": {name: results[name] for name in budgets if name in results}}
+    cache.put(inputs, summary)
+    cache.save()
+
+    return summary
+
+
 _COLLECTOR_DISPLAY_NAMES: dict[str, str] = {
     "test_metrics": "Test Metrics",
     "complexity": "Complexity",
@@ -0,0 +1,41 @@
+"""One forge collector job, run in its own process by `run_forge_collectors`.
+
+    python -m regulatory_tools.quality.forge_job <project_root> <output.json> <collector>
+
+Runs forge's Aggregator for the one named collector against *project_root*
+and writes the `forge_health_as_dict` summary, or ``{"error": ...}``, to
+*output.json*.
+
+A process per collector lets the caller terminate a collector when its
+budget runs out without losing the others, and keeps Aggregators from
+sharing one interpreter's state.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+from .forge_integration import forge_health_as_dict
+
+
+def main(argv: list[str] | None = None) -> int:
+
+    project_root, output, name = sys.argv[1:] if argv is None else argv
+
+    from forge.aggregator import Aggregator
+
+    try:
+        report = Aggregator(collectors=[name]).run(Path(project_root), skip_test_run=True)
+        result = forge_health_as_dict(report)
+    except Exception as exc:
+        result = {"error": str(exc)}
+
+    Path(output).write_text(json.dumps(result))
+
+    return 1 if "error" in result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
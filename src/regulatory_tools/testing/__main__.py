@@ -0,0 +1,66 @@
+import argparse
+import sys
+from pathlib import Path
+
+from ..traceability.coverage_reports import REPORT_FORMATS, render_coverage_reports
+from .warm_worker import serve, stop_worker, worker_socket_path
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog="python -m regulatory_tools.testing")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser(
+        "worker",
+        help="Start a warm pytest worker that run_tests_and_trace will use for this project.",
+    )
+    worker.add_argument("project_root", type=Path)
+    worker.add_argument(
+        "--preload",
+        default="",
+        help="Comma-separated third-party modules to keep imported (e.g. numpy,scipy).",
+    )
+    worker.add_argument("--socket", type=Path, default=None)
+
+    stop = commands.add_parser("stop-worker", help="Stop the project's warm pytest worker.")
+    stop.add_argument("project_root", type=Path)
+    stop.add_argument("--socket", type=Path, default=None)
+
+    report = commands.add_parser(
+        "coverage-report",
+        help="Render coverage reports from the project's .coverage data file.",
+    )
+    report.add_argument("project_root", type=Path)
+    report.add_argument(
+        "--format",
+        default="xml,html",
+        help=f"Comma-separated report formats ({', '.join(REPORT_FORMATS)}).",
+    )
+    report.add_argument("--data-file", type=Path, default=None)
+    report.add_argument(
+        "--force", action="store_true", help="Render even when the data file is unchanged."
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        preload = [name for name in args.preload.split(",") if name]
+        serve(args.project_root, preload=preload, socket_path=args.socket)
+    elif args.command == "stop-worker":
+        socket_path = args.socket or worker_socket_path(args.project_root)
+        if not stop_worker(socket_path):
+            print(f"No warm pytest worker listening on {socket_path}")
+            sys.exit(1)
+    elif args.command == "coverage-report":
+        formats = [name for name in args.format.split(",") if name]
+        unknown = sorted(set(formats) - set(REPORT_FORMATS))
+        if unknown:
+            parser.error(f"unknown coverage report format(s): {', '.join(unknown)}")
+        render_coverage_reports(
+            args.project_root, formats, data_file=args.data_file, force=args.force
+        )
+
+
+if __name__ == "__main__":
+    main()
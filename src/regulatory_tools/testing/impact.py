@@ -0,0 +1,300 @@
+"""Requirement-aware test impact analysis.
+
+Full runs record coverage with per-test dynamic contexts. From that data this
+module persists a ``source file → tests → requirements`` index under
+``artifacts/impact/`` and refreshes the requirement → code line map (see
+`traceability.requirement_code`). Given a set of changed files, `select_impacted_tests`
+picks the tests that executed them; after a partial run,
+`carry_forward_evidence` copies the previous evidence of every other test into
+the new evidence run and `write_impact_report` records which requirements were
+re-verified and which kept prior evidence.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+
+from ..traceability.evidence_loader import latest_evidence_run
+from ..traceability.generator import extract_requirement_ids
+from ..traceability.requirement_code import lines_by_test, update_requirement_code_map
+from ..traceability.test_scanner import collect_requirement_markers
+
+INDEX_VERSION = 2
+
+# Changes under these top-level directories never require re-running tests
+_NON_CODE_DIRS = ("docs", "artifacts")
+
+
+def impact_dir(project_root: Path) -> Path:
+    return project_root / "artifacts" / "impact"
+
+
+def impact_index_path(project_root: Path) -> Path:
+    return impact_dir(project_root) / "index.json"
+
+
+def impact_report_path(project_root: Path) -> Path:
+    return impact_dir(project_root) / "impact_report.json"
+
+
+def subset_coverage_path(project_root: Path) -> Path:
+    return impact_dir(project_root) / ".coverage.subset"
+
+
+def _tests_by_file(lines: dict[str, dict[str, int]]) -> dict[str, set[str]]:
+    """Map each source file to the test node ids that executed it."""
+    files: dict[str, set[str]] = {}
+    for node_id, measured in lines.items():
+        for rel_path in measured:
+            files.setdefault(rel_path, set()).add(node_id)
+    return files
+
+
+def _requirements_by_test(project_root: Path) -> dict[str, list[str]]:
+    requirements: dict[str, set[str]] = {}
+    for req_id, node_ids in collect_requirement_markers(project_root / "tests", project_root).items():
+        for node_id in node_ids:
+            requirements.setdefault(node_id, set()).add(req_id)
+    return {node_id: sorted(reqs) for node_id, reqs in requirements.items()}
+
+
+def _source_files(project_root: Path) -> list[str]:
+    src = project_root / "src"
+    return sorted(p.relative_to(project_root).as_posix() for p in src.rglob("*.py")) if src.exists() else []
+
+
+def _test_file_exists(project_root: Path, test_id: str) -> bool:
+    return (project_root / test_id.split("::", 1)[0]).is_file()
+
+
+def load_impact_index(project_root: Path) -> dict | None:
+    path = impact_index_path(project_root)
+    if not path.exists():
+        return None
+    try:
+        index = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def update_impact_index(
+    project_root: Path,
+    data_file: Path,
+    rerun_tests: set[str] | None = None,
+) -> dict | None:
+    """
+    Rebuild the impact index from *data_file*.
+
+    When *rerun_tests* (node ids or test files) is given the data only covers
+    those tests: their old file links are replaced and every other test keeps
+    its stored links. The requirement code map is updated the same way.
+    """
+    if not data_file.exists():
+        return None
+
+    lines = lines_by_test(data_file, project_root)
+    if lines is None:
+        return None
+
+    measured = _tests_by_file(lines)
+
+    previous = load_impact_index(project_root) if rerun_tests is not None else None
+
+    files: dict[str, set[str]] = {}
+    if previous is not None:
+        for rel_path, tests in previous["files"].items():
+            kept = {t for t in tests if not _was_selected(t, rerun_tests)}
+            if kept:
+                files[rel_path] = kept
+
+    for rel_path, tests in measured.items():
+        files.setdefault(rel_path, set()).update(tests)
+
+    index = {
+        "version": INDEX_VERSION,
+        "files": {rel_path: sorted(tests) for rel_path, tests in sorted(files.items())},
+        # Source files known when the index was built; a file not listed here is new
+        "sources": _source_files(project_root),
+        "requirements": _requirements_by_test(project_root),
+    }
+
+    path = impact_index_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(index, indent=2, sort_keys=True))
+
+    update_requirement_code_map(project_root, lines, index["requirements"], rerun_tests)
+
+    return index
+
+
+def _was_selected(test_id: str | None, selected: set[str]) -> bool:
+    """True when *test_id* or its whole test file was selected to re-run."""
+    if not test_id:
+        return False
+    return test_id in selected or test_id.split("::", 1)[0] in selected
+
+
+def _is_test_file(path: PurePosixPath) -> bool:
+    return path.parts[:1] == ("tests",) and fnmatch(path.name, "test_*.py")
+
+
+def select_impacted_tests(project_root: Path, changed_files: list[str]) -> list[str] | None:
+    """
+    Return the pytest arguments (node ids and test files) affected by *changed_files*.
+
+    Deleted test files and tests whose file no longer exists are left out.
+    Returns None when the change cannot be scoped safely — no index yet, a
+    source file the index does not know, or a change to test support code
+    or project configuration — meaning the full suite must run.
+    """
+    index = load_impact_index(project_root)
+
+    if index is None:
+        print("[impact] No test impact index — running the full suite.")
+        return None
+
+    selected: set[str] = set()
+
+    for changed in changed_files:
+        path = PurePosixPath(changed)
+
+        if _is_test_file(path):
+            selected.add(changed)
+        elif path.parts[:1] == ("tests",):
+            print(f"[impact] Test support file changed ({changed}) — running the full suite.")
+            return None
+        elif path.parts[:1] == ("src",):
+            if changed not in index["sources"] and (project_root / changed).exists():
+                print(f"[impact] New source file ({changed}) — running the full suite.")
+                return None
+            # Source files no test executed have no impacted tests
+            selected.update(index["files"].get(changed, []))
+        elif path.parts[:1] not in {(d,) for d in _NON_CODE_DIRS}:
+            print(f"[impact] Project file changed ({changed}) — running the full suite.")
+            return None
+
+    # Deleted tests have nothing to run; their evidence is not carried forward either
+    selected = {s for s in selected if _test_file_exists(project_root, s)}
+
+    # Tests inside a changed test file already run as part of that file
+    changed_test_files = {s for s in selected if "::" not in s}
+    return sorted(
+        s for s in selected
+        if s in changed_test_files or s.split("::", 1)[0] not in changed_test_files
+    )
+
+
+def carry_forward_evidence(
+    project_root: Path,
+    previous_run: Path | None,
+    selected: list[str],
+) -> Path:
+    """
+    Copy evidence of tests that did not re-run into the newest evidence run.
+
+    Carried records are marked with ``carried_forward`` and ``carried_from``
+    so they stay distinguishable from evidence produced by this run. Evidence
+    of tests whose file was deleted is dropped. Creates an evidence run
+    directory when the partial run did not write one.
+    """
+    evidence_root = project_root / "artifacts" / "evidence_runs"
+    current_run = latest_evidence_run(evidence_root)
+
+    if current_run is None or current_run == previous_run:
+        current_run = evidence_root / datetime.now().strftime("%Y%m%d_%H%M%S")
+        current_run.mkdir(parents=True, exist_ok=True)
+
+    if previous_run is None:
+        return current_run
+
+    selected_set = set(selected)
+
+    for record_file in sorted(previous_run.glob("*.json")):
+        try:
+            record = json.loads(record_file.read_text())
+        except Exception:
+            continue
+
+        test_id = record.get("test_id")
+        if _was_selected(test_id, selected_set):
+            continue
+        if test_id and not _test_file_exists(project_root, test_id):
+            continue
+
+        destination = current_run / record_file.name
+        if destination.exists():
+            continue
+
+        if "carried_from" not in record:
+            record["carried_forward"] = True
+            record["carried_from"] = previous_run.name
+            destination.write_text(json.dumps(record, indent=2))
+        else:
+            shutil.copy(record_file, destination)
+
+    return current_run
+
+
+def write_impact_report(
+    project_root: Path,
+    changed_files: list[str],
+    selected: list[str],
+    evidence_run: Path,
+) -> dict:
+    """
+    Record which requirements were re-verified by this run and which kept
+    prior evidence, and print a short summary.
+    """
+    index = load_impact_index(project_root) or {"requirements": {}}
+    selected_set = set(selected)
+
+    reverified: set[str] = set()
+    carried: set[str] = set()
+
+    for node_id, req_ids in index["requirements"].items():
+        if _was_selected(node_id, selected_set):
+            reverified.update(req_ids)
+
+    for record_file in evidence_run.glob("*.json"):
+        try:
+            record = json.loads(record_file.read_text())
+        except Exception:
+            continue
+        target = carried if record.get("carried_forward") else reverified
+        target.update(extract_requirement_ids(record))
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "evidence_run": evidence_run.name,
+        "changed_files": sorted(changed_files),
+        "rerun_tests": sorted(selected),
+        "reverified_requirements": sorted(reverified),
+        "carried_forward_requirements": sorted(carried - reverified),
+    }
+
+    path = impact_report_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+    print(
+        f"[impact] Re-ran {len(selected)} test(s): "
+        f"{len(report['reverified_requirements'])} requirement(s) re-verified, "
+        f"{len(report['carried_forward_requirements'])} kept prior evidence."
+    )
+
+    return report
+
+
+def load_impact_report(project_root: Path) -> dict | None:
+    path = impact_report_path(project_root)
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
@@ -1,8 +1,18 @@
+import os
 import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+from ..traceability.coverage_reports import render_coverage_reports
+from ..traceability.verification_cost import load_test_timings, recorded_timings_path, timing_dir
+from .timings import load_file_durations, merge_test_timings, plan_shards, update_file_durations
+from .warm_worker import run_in_worker, worker_socket_path
+
+TIMING_PLUGIN = "regulatory_tools.pytest_timing"
+COVERAGE_FAIL_UNDER = 85
+
 
 def detect_source_package(project_root):
 
@@ -18,7 +28,46 @@ def detect_source_package(project_root):
 
     return packages[0]
 
-def run_pytest_with_coverage(project_root: Path):
+
+def _run_pytest(project_root: Path, pytest_args: list[str], env: dict | None = None) -> int:
+    """
+    Run pytest for *project_root* and return its exit code.
+
+    Uses the warm worker (see `warm_worker`) when one is listening for the
+    project, otherwise a fresh ``python -m pytest`` subprocess.
+    """
+    returncode = run_in_worker(worker_socket_path(project_root), pytest_args, project_root, env)
+    if returncode is not None:
+        return returncode
+
+    command = [sys.executable, "-m", "pytest", *pytest_args]
+
+    if env is None:
+        return subprocess.run(command, cwd=project_root).returncode
+    return subprocess.run(command, cwd=project_root, env=env).returncode
+
+
+def run_pytest_with_coverage(
+    project_root: Path,
+    workers: int = 1,
+    reports: tuple[str, ...] = (),
+    record_tests: bool = False,
+):
+    """
+    Run the project's test suite under coverage.
+
+    Only the raw ``.coverage`` data file and the coverage threshold check are
+    produced; *reports* (e.g. ``("xml", "html")``) are rendered afterwards,
+    in parallel, and only when the data changed (see `coverage_reports`).
+
+    Per-test coverage contexts and test timings slow the run down and are
+    only recorded with *record_tests*, for rebuilding the impact index (see
+    `impact.update_impact_index`).
+
+    With ``workers > 1`` the test files are split into duration-balanced
+    shards that run as parallel pytest processes; their coverage data and
+    evidence runs are combined afterwards so the outputs match a serial run.
+    """
     test_dir = project_root / "tests"
     coverage_dir = project_root / "artifacts" / "coverage"
     coverage_dir.mkdir(parents=True, exist_ok=True)
@@ -30,27 +79,190 @@ def run_pytest_with_coverage(project_root: Path):
         print("No tests detected — skipping pytest execution.")
         return
 
-    result = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "pytest",
+    if workers > 1:
+        failed = _run_sharded(project_root, test_dir, source, coverage_dir, workers, record_tests)
+    else:
+        timings_file = recorded_timings_path(project_root)
+
+        pytest_args = [
             str(test_dir),
             f"--cov={source}",
-            "--cov-report=term",
-            f"--cov-report=html:{coverage_dir / 'html'}",
-            f"--cov-report=xml:{coverage_dir / 'coverage.xml'}",
-            "--cov-fail-under=85",
+            "--cov-report=",
+            f"--cov-fail-under={COVERAGE_FAIL_UNDER}",
+        ]
+        if record_tests:
+            pytest_args += [
+                "--cov-context=test",
+                "-p",
+                TIMING_PLUGIN,
+                f"--test-timings={timings_file}",
+            ]
+
+        returncode = _run_pytest(project_root, pytest_args)
+
+        if record_tests:
+            update_file_durations(project_root, load_test_timings(timings_file))
+        failed = returncode != 0
+
+    if reports:
+        render_coverage_reports(project_root, reports)
+
+    if failed:
+        print("Pytest failed.")
+        sys.exit(1)
+
+
+def run_pytest_subset(project_root: Path, tests: list[str], data_file: Path) -> None:
+    """
+    Run only *tests* (node ids or test files) with per-test coverage contexts.
+
+    Used by test impact analysis: coverage goes to *data_file* instead of the
+    full-run `.coverage`, and no reports or threshold are produced because a
+    subset cannot say anything about overall coverage.
+    """
+    source = detect_source_package(project_root)
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+
+    subset_timings = timing_dir(project_root) / "test_timings.subset.json"
+
+    returncode = _run_pytest(
+        project_root,
+        [
+            *tests,
+            f"--cov={source}",
+            "--cov-report=",
+            "--cov-context=test",
+            "-p",
+            TIMING_PLUGIN,
+            f"--test-timings={subset_timings}",
         ],
-        cwd=project_root,
+        env={**os.environ, "COVERAGE_FILE": str(data_file)},
     )
 
-    if result.returncode != 0:
+    # Tests that did not re-run keep their previous timings
+    timings = merge_test_timings(
+        [subset_timings], recorded_timings_path(project_root), keep_existing=True
+    )
+    update_file_durations(project_root, timings)
+
+    if returncode != 0:
         print("Pytest failed.")
         sys.exit(1)
 
-    # Copy coverage.xml to the project root so forge can locate it with skip_test_run=True.
-    # Forge expects coverage.xml at the project root by default.
-    xml_in_artifacts = coverage_dir / "coverage.xml"
-    if xml_in_artifacts.exists():
-        shutil.copy(xml_in_artifacts, project_root / "coverage.xml")
+
+def _run_sharded(
+    project_root: Path,
+    test_dir: Path,
+    source: Path,
+    coverage_dir: Path,
+    workers: int,
+    record_tests: bool,
+) -> bool:
+    """Run the shards and combine their outputs. Returns True when anything failed."""
+
+    test_files = sorted(
+        p.relative_to(project_root).as_posix() for p in test_dir.rglob("test_*.py")
+    )
+    shards = plan_shards(test_files, load_file_durations(project_root), workers)
+
+    evidence_root = project_root / "artifacts" / "evidence_runs"
+    runs_before = _evidence_run_names(evidence_root)
+
+    print(f"[pytest_runner] Running {len(test_files)} test files in {len(shards)} shards.")
+
+    procs = []
+    for i, files in enumerate(shards):
+        log = (coverage_dir / f"shard{i}.log").open("w")
+        env = {**os.environ, "COVERAGE_FILE": str(coverage_dir / f".coverage.shard{i}")}
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                *files,
+                f"--cov={source}",
+                "--cov-report=",
+                *(["--cov-context=test"] if record_tests else []),
+                # Timings are always recorded here, they balance the next run's shards
+                "-p",
+                TIMING_PLUGIN,
+                f"--test-timings={timing_dir(project_root) / f'test_timings.shard{i}.json'}",
+            ],
+            cwd=project_root,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        procs.append((proc, log, time.monotonic()))
+
+    failed = False
+    for i, (proc, log, started) in enumerate(procs):
+        returncode = proc.wait()
+        log.close()
+        print(
+            f"\n[pytest_runner] Shard {i + 1}/{len(procs)} "
+            f"({len(shards[i])} files) exited {returncode} after {time.monotonic() - started:.1f}s"
+        )
+        print((coverage_dir / f"shard{i}.log").read_text())
+        failed = failed or returncode != 0
+
+    timings = merge_test_timings(
+        [timing_dir(project_root) / f"test_timings.shard{i}.json" for i in range(len(shards))],
+        recorded_timings_path(project_root),
+    )
+    update_file_durations(project_root, timings)
+    _merge_evidence_runs(evidence_root, runs_before)
+
+    shard_data = [
+        str(coverage_dir / f".coverage.shard{i}")
+        for i in range(len(shards))
+        if (coverage_dir / f".coverage.shard{i}").exists()
+    ]
+
+    coverage_cli = [sys.executable, "-m", "coverage"]
+    data_file = f"--data-file={project_root / '.coverage'}"
+
+    combine = subprocess.run([*coverage_cli, "combine", data_file, *shard_data], cwd=project_root)
+    if combine.returncode != 0:
+        print(
+            f"[pytest_runner] coverage combine exited {combine.returncode} — "
+            "the shards' coverage could not be combined."
+        )
+        return True
+
+    report = subprocess.run(
+        [*coverage_cli, "report", data_file, f"--fail-under={COVERAGE_FAIL_UNDER}"],
+        cwd=project_root,
+    )
+
+    return failed or report.returncode != 0
+
+
+def _evidence_run_names(evidence_root: Path) -> set[str]:
+    if not evidence_root.exists():
+        return set()
+    return {p.name for p in evidence_root.iterdir() if p.is_dir()}
+
+
+def _merge_evidence_runs(evidence_root: Path, runs_before: set[str]) -> None:
+    """
+    Fold the evidence run directories created by parallel shards into one.
+
+    Each shard's session creates its own timestamped run directory; the
+    matrix only reads the latest run, so all records are moved into it.
+    """
+    new_runs = sorted(_evidence_run_names(evidence_root) - runs_before)
+
+    if len(new_runs) < 2:
+        return
+
+    target = evidence_root / new_runs[-1]
+
+    for name in new_runs[:-1]:
+        run = evidence_root / name
+        for record in run.iterdir():
+            destination = target / record.name
+            if destination.exists():
+                destination = target / f"{name}_{record.name}"
+            shutil.move(str(record), str(destination))
+        run.rmdir()
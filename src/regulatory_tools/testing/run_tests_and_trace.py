@@ -3,13 +3,22 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-from ..traceability.pipeline import generate_traceability_matrix
-from .pytest_runner import run_pytest_with_coverage
+from ..traceability.profiling import PipelineProfile, measure
 
 _GRADE_ORDER: dict[str, int] = {"A": 4, "B": 3, "C": 2, "D": 1, "F": 0}
 
 
-def run_tests_and_trace(project_root: Path, min_grade: str | None = "B") -> None:
+def run_tests_and_trace(
+    project_root: Path,
+    min_grade: str | None = "B",
+    workers: int = 1,
+    changed_files: list[str] | None = None,
+    coverage_reports: tuple[str, ...] = (),
+    profile: bool = False,
+    metrics_file: Path | None = None,
+    forge_collectors: list[str] | None = None,
+    matrix_formats: tuple[str, ...] = (),
+) -> None:
     """
     Full verification pipeline for regulated projects.
 
@@ -21,9 +30,119 @@ def run_tests_and_trace(project_root: Path, min_grade: str | None = "B") -> None
         5. uncovered code reporting
         6. forge health grade check (exits 1 if grade < min_grade)
         7. README forge health section update
+
+    ``workers > 1`` runs pytest as that many duration-balanced parallel shards.
+    *coverage_reports* lists the report formats ("xml", "html", "json") to
+    render from the coverage data after a full run; none by default.
+
+    With *changed_files* (paths relative to *project_root*), only the tests
+    whose recorded coverage touches those files are re-run; evidence of all
+    other tests is carried forward and the matrix lists which requirements
+    were re-verified and which kept prior evidence.
+
+    Parsing the requirements catalog and scanning test markers do not depend
+    on test results, so they run while pytest does.
+
+    Stage durations are always recorded. With *profile*, every stage is also
+    profiled (see `traceability.profiling`) and a summary table is printed at
+    the end.
+
+    After the matrix is generated, coverage, status counts, forge scores,
+    evidence counts and stage durations are written as an OpenMetrics
+    textfile to *metrics_file* (default
+    ``artifacts/metrics/regulatory_tools.prom``).
+
+    *forge_collectors* overrides the forge collectors configured in the
+    project's pyproject.toml. *matrix_formats* opts in to matrix outputs
+    besides the markdown (see `traceability.writers.FORMATS`).
     """
-    run_pytest_with_coverage(project_root)
-    forge_summary = generate_traceability_matrix(project_root)
+    pipeline_profile = PipelineProfile(project_root, detailed=profile)
+
+    try:
+        _run_tests_and_trace(
+            project_root,
+            min_grade,
+            workers,
+            changed_files,
+            coverage_reports,
+            pipeline_profile,
+            metrics_file,
+            forge_collectors,
+            matrix_formats,
+        )
+    finally:
+        if profile:
+            pipeline_profile.report()
+
+
+def _run_tests_and_trace(
+    project_root: Path,
+    min_grade: str | None,
+    workers: int,
+    changed_files: list[str] | None,
+    coverage_reports: tuple[str, ...],
+    profile: PipelineProfile,
+    metrics_file: Path | None,
+    forge_collectors: list[str] | None,
+    matrix_formats: tuple[str, ...],
+) -> None:
+
+    # The pipeline and runner chain load here rather than at import time, so
+    # `import regulatory_tools.testing` stays cheap for the CLI
+    from ..traceability.coverage import coverage_data_path
+    from ..traceability.metrics import write_metrics_textfile
+    from ..traceability.pipeline import generate_traceability_matrix, prepare_traceability
+    from .impact import select_impacted_tests, update_impact_index
+    from .pytest_runner import run_pytest_with_coverage
+
+    selected = None
+
+    if changed_files is not None:
+        selected = select_impacted_tests(project_root, changed_files)
+
+    def run_tests():
+        with measure(profile, "pytest"):
+            if selected is None:
+                run_pytest_with_coverage(
+                    project_root, workers=workers, reports=coverage_reports, record_tests=True
+                )
+                update_impact_index(project_root, coverage_data_path(project_root))
+                return None
+            return _run_impacted_tests(project_root, changed_files, selected)
+
+    if profile.detailed:
+        # Measured one at a time so peaks and profiles are not mixed up
+        impact_report = run_tests()
+        prepared = prepare_traceability(
+            project_root, profile=profile, forge_collectors=forge_collectors
+        )
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            tests = pool.submit(run_tests)
+            prepared = prepare_traceability(
+                project_root, profile=profile, forge_collectors=forge_collectors
+            )
+            try:
+                # Re-raises the SystemExit of a failed test run
+                impact_report = tests.result()
+            except BaseException:
+                from ..quality.forge_integration import cancel_forge_collectors
+
+                cancel_forge_collectors(prepared["forge_jobs"])
+                raise
+
+    forge_summary = generate_traceability_matrix(
+        project_root,
+        impact_report=impact_report,
+        formats=matrix_formats,
+        prepared=prepared,
+        profile=profile,
+        forge_collectors=forge_collectors,
+    )
+
+    write_metrics_textfile(project_root, profile, metrics_file)
 
     if forge_summary is None:
         print("[run_tests_and_trace] forge not installed — skipping grade check and README update.")
@@ -48,3 +167,30 @@ def run_tests_and_trace(project_root: Path, min_grade: str | None = "B") -> None
     if actual_rank < min_rank:
         print(f"[forge] Grade {grade} is below the required minimum {min_grade}. Failing CI.")
         sys.exit(1)
+
+
+def _run_impacted_tests(project_root: Path, changed_files: list[str], selected: list[str]) -> dict:
+
+    from ..traceability.evidence_loader import latest_evidence_run
+    from .impact import (
+        carry_forward_evidence,
+        subset_coverage_path,
+        update_impact_index,
+        write_impact_report,
+    )
+    from .pytest_runner import run_pytest_subset
+
+    previous_run = latest_evidence_run(project_root / "artifacts" / "evidence_runs")
+
+    if selected:
+        data_file = subset_coverage_path(project_root)
+        data_file.unlink(missing_ok=True)
+
+        run_pytest_subset(project_root, selected, data_file)
+        update_impact_index(project_root, data_file, rerun_tests=set(selected))
+    else:
+        print("[impact] No tests are affected by the changed files.")
+
+    evidence_run = carry_forward_evidence(project_root, previous_run, selected)
+
+    return write_impact_report(project_root, changed_files, selected, evidence_run)
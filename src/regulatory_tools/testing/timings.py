@@ -0,0 +1,99 @@
+"""Historical test durations used to balance parallel pytest shards.
+
+Per-test phase durations come from `regulatory_tools.pytest_timing`; they are summed per test
+file and kept in ``artifacts/timing/file_durations.json`` so the next sharded
+run can split the suite into shards of similar wall-clock length.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+from pathlib import Path
+
+from ..traceability.verification_cost import load_test_timings, timing_dir
+
+
+def file_durations_path(project_root: Path) -> Path:
+    return timing_dir(project_root) / "file_durations.json"
+
+
+def merge_test_timings(
+    paths: list[Path],
+    output: Path,
+    keep_existing: bool = False,
+) -> dict[str, dict[str, float]]:
+    """
+    Combine per-shard timing files into a single timing file.
+
+    With *keep_existing*, timings already in *output* are kept for tests
+    that are not present in *paths*.
+    """
+    merged = load_test_timings(output) if keep_existing else {}
+    for path in paths:
+        merged.update(load_test_timings(path))
+        path.unlink(missing_ok=True)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"tests": merged}, indent=2, sort_keys=True))
+    return merged
+
+
+def durations_per_file(timings: dict[str, dict[str, float]]) -> dict[str, float]:
+    """Sum setup/call/teardown durations of every test per test file."""
+    per_file: dict[str, float] = {}
+    for node_id, phases in timings.items():
+        test_file = node_id.split("::", 1)[0]
+        per_file[test_file] = per_file.get(test_file, 0.0) + sum(phases.values())
+    return per_file
+
+
+def load_file_durations(project_root: Path) -> dict[str, float]:
+    path = file_durations_path(project_root)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def update_file_durations(project_root: Path, timings: dict[str, dict[str, float]]) -> None:
+    """Record the latest measured duration of every test file that ran."""
+    if not timings:
+        return
+
+    durations = load_file_durations(project_root)
+    durations.update(durations_per_file(timings))
+
+    path = file_durations_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+
+def plan_shards(
+    test_files: list[str],
+    durations: dict[str, float],
+    workers: int,
+) -> list[list[str]]:
+    """
+    Split test files into at most *workers* shards of similar total duration.
+
+    Longest-processing-time-first: files are assigned, slowest first, to the
+    currently lightest shard. Files without history are assumed to take the
+    mean known duration (1s when there is no history at all).
+    """
+    known = [durations[f] for f in test_files if f in durations]
+    default = sum(known) / len(known) if known else 1.0
+
+    ordered = sorted(test_files, key=lambda f: (-durations.get(f, default), f))
+
+    heap = [(0.0, i) for i in range(max(1, min(workers, len(test_files))))]
+    shards: list[list[str]] = [[] for _ in heap]
+
+    for test_file in ordered:
+        total, i = heapq.heappop(heap)
+        shards[i].append(test_file)
+        heapq.heappush(heap, (total + durations.get(test_file, default), i))
+
+    return [sorted(shard) for shard in shards if shard]
@@ -0,0 +1,234 @@
+"""Persistent warm pytest worker.
+
+Starting ``python -m pytest`` pays interpreter start-up plus the import cost of
+the suite's heavy third-party dependencies on every run. The worker imports
+pytest, coverage and a configurable list of third-party modules once, listens
+on a local Unix socket and forks a fresh child per run. The child changes into
+the project, drops any project modules from ``sys.modules`` so project code is
+always imported fresh, and runs ``pytest.main`` with the same arguments and
+environment the command-line invocation would have used. Output is streamed
+back over the socket, followed by the exit code.
+
+POSIX only (needs ``os.fork`` and ``AF_UNIX``); callers fall back to a normal
+subprocess whenever no worker is listening.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import socket
+import sys
+import traceback
+from pathlib import Path
+
+SOCKET_ENV = "REGULATORY_TOOLS_PYTEST_WORKER"
+
+# Separates streamed pytest output from the exit code sent after the child exits
+_TRAILER = b"\x00regulatory-tools-exit:"
+
+_ALWAYS_PRELOAD = ("pytest", "_pytest.config", "coverage", "pytest_cov")
+
+
+def worker_socket_path(project_root: Path) -> Path:
+    """Socket used for *project_root*; ``$REGULATORY_TOOLS_PYTEST_WORKER`` overrides it."""
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    return project_root / "artifacts" / "pytest_worker.sock"
+
+
+def worker_supported() -> bool:
+    return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+
+def _is_under(module, root: Path) -> bool:
+    filename = getattr(module, "__file__", None)
+    if not filename:
+        return False
+    try:
+        Path(filename).resolve().relative_to(root)
+    except ValueError:
+        return False
+    return True
+
+
+def _preload(modules: list[str], project_root: Path) -> None:
+    for name in (*_ALWAYS_PRELOAD, *modules):
+        try:
+            module = importlib.import_module(name)
+        except ImportError as exc:
+            print(f"[warm_worker] Could not preload {name}: {exc}")
+            continue
+        if _is_under(module, project_root):
+            # Project code must be imported fresh by every run
+            print(f"[warm_worker] Not preloading project module {name}.")
+            _purge_project_modules(project_root)
+
+
+def _purge_project_modules(project_root: Path) -> None:
+    for name, module in list(sys.modules.items()):
+        if _is_under(module, project_root):
+            del sys.modules[name]
+
+
+def _read_request(conn: socket.socket) -> dict:
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data or b"{}")
+
+
+def _run_child(server: socket.socket, conn: socket.socket, request: dict) -> None:
+    """Body of the forked child; never returns."""
+    returncode = 1
+    try:
+        server.close()
+
+        cwd = Path(request["cwd"]).resolve()
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+
+        _purge_project_modules(cwd)
+        # Same sys.path[0] as `python -m pytest` started in *cwd*
+        sys.path[0] = str(cwd)
+        sys.argv = ["pytest", *request["args"]]
+
+        os.dup2(conn.fileno(), 1)
+        os.dup2(conn.fileno(), 2)
+
+        import pytest
+
+        returncode = int(pytest.main(request["args"]))
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(returncode)
+
+
+def serve(project_root: Path, preload: list[str] | None = None, socket_path: Path | None = None) -> None:
+    """Run the worker until a ``shutdown`` request arrives."""
+    if not worker_supported():
+        raise RuntimeError("The warm pytest worker needs os.fork and Unix sockets.")
+
+    project_root = project_root.resolve()
+    socket_path = socket_path or worker_socket_path(project_root)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+
+    _preload(preload or [], project_root)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen()
+
+    print(f"[warm_worker] Listening on {socket_path}", flush=True)
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                request = _read_request(conn)
+
+                if request.get("command") == "shutdown":
+                    break
+
+                sys.stdout.flush()
+                sys.stderr.flush()
+
+                pid = os.fork()
+                if pid == 0:
+                    _run_child(server, conn, request)
+
+                _, status = os.waitpid(pid, 0)
+                returncode = os.waitstatus_to_exitcode(status)
+                conn.sendall(_TRAILER + f"{returncode}\n".encode())
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+        print("[warm_worker] Stopped.", flush=True)
+
+
+def _connect(socket_path: Path) -> socket.socket | None:
+    if not worker_supported() or not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def run_in_worker(
+    socket_path: Path,
+    args: list[str],
+    cwd: Path,
+    env: dict[str, str] | None = None,
+) -> int | None:
+    """
+    Run ``pytest <args>`` in the warm worker and stream its output.
+
+    Returns the pytest exit code, or None when no worker is listening.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+
+    request = {"args": args, "cwd": str(cwd), "env": dict(env if env is not None else os.environ)}
+
+    out = getattr(sys.stdout, "buffer", None)
+    pending = b""
+
+    with sock:
+        sock.sendall(json.dumps(request).encode() + b"\n")
+
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            pending += chunk
+            # Hold back enough bytes to never split the trailer
+            keep = len(_TRAILER) + 16
+            if len(pending) > keep:
+                _write(out, pending[:-keep])
+                pending = pending[-keep:]
+
+    output, separator, code = pending.rpartition(_TRAILER)
+    if not separator:
+        # The worker went away before reporting an exit code
+        _write(out, pending)
+        return 1
+
+    _write(out, output)
+    return int(code.strip() or 1)
+
+
+def _write(out, data: bytes) -> None:
+    if not data:
+        return
+    sys.stdout.flush()
+    if out is not None:
+        out.write(data)
+        out.flush()
+    else:
+        sys.stdout.write(data.decode(errors="replace"))
+        sys.stdout.flush()
+
+
+def stop_worker(socket_path: Path) -> bool:
+    """Ask a running worker to exit. Returns False when none was listening."""
+    sock = _connect(socket_path)
+    if sock is None:
+        return False
+    with sock:
+        sock.sendall(json.dumps({"command": "shutdown"}).encode() + b"\n")
+    return True
@@ -1,18 +1,284 @@
+import argparse
+import json
 import sys
+from importlib import import_module
 from pathlib import Path
 
-from .pipeline import generate_traceability_matrix
+USAGE = (
+    "Usage: python -m regulatory_tools.traceability <project_root> "
+    "[--since <git-ref>] [--pages prefix|<rows-per-page>] [--formats a,b] [--collectors a,b] "
+    "[--profile]\n"
+    "       python -m regulatory_tools.traceability query <project_root> [filters] [--json]\n"
+    "       python -m regulatory_tools.traceability batch <project_root-or-glob>... [--workers N]\n"
+    "       python -m regulatory_tools.traceability serve <project_root> [--port N]\n"
+    "       python -m regulatory_tools.traceability compact <project_root> [--keep-runs N] "
+    "[--archive-after DAYS] [--expire-after DAYS]\n"
+    "       python -m regulatory_tools.traceability history <project_root> <requirement_id>"
+)
+
+# Entry points load on first use, so usage errors and subcommands only import
+# what they run (the pipeline alone pulls in YAML, XML and the forge glue)
+_LAZY = {
+    "generate_batch": ".batch",
+    "resolve_project_roots": ".batch",
+    "update_traceability_matrix_since": ".incremental",
+    "compact_evidence_runs": ".evidence_archive",
+    "FORMATS": ".writers",
+    "evidence_history": ".evidence_archive",
+    "generate_traceability_matrix": ".pipeline",
+    "PipelineProfile": ".profiling",
+    "measure": ".profiling",
+    "query_matrix": ".query",
+    "serve": ".server",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __package__), name)
+    globals()[name] = value
+    return value
+
+
+def _entry(name):
+    # Looked up on the module so tests can monkeypatch the entry points
+    return getattr(sys.modules[__name__], name)
+
+
+def _values(text):
+    return [value for value in text.split(",") if value] if text is not None else None
+
+
+def query_main(argv):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m regulatory_tools.traceability query",
+        description="Query the traceability matrix through its persisted index.",
+    )
+    parser.add_argument("project_root", type=Path)
+    parser.add_argument("--status", help="Comma-separated statuses, e.g. FAIL,UNTESTED.")
+    parser.add_argument("--prefix", help="Comma-separated id prefixes, e.g. SYS,VER.")
+    parser.add_argument("--test", help="Comma-separated pytest node ids.")
+    parser.add_argument("--evidence", help="Comma-separated evidence file names.")
+    linked = parser.add_mutually_exclusive_group()
+    linked.add_argument("--has-tests", dest="has_tests", action="store_true", default=None)
+    linked.add_argument("--no-tests", dest="has_tests", action="store_false")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per row.")
+
+    args = parser.parse_args(argv)
+
+    rows = _entry("query_matrix")(
+        args.project_root,
+        status=_values(args.status),
+        prefix=_values(args.prefix),
+        test=_values(args.test),
+        evidence=_values(args.evidence),
+        has_tests=args.has_tests,
+    )
+
+    for row in rows:
+        if args.json:
+            print(json.dumps(row))
+        else:
+            print(f"{row['requirement_id']}\t{row['status']}\t{row['title']}")
+
+
+def batch_main(argv):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m regulatory_tools.traceability batch",
+        description="Regenerate the traceability matrix of many projects on a process pool.",
+    )
+    parser.add_argument("projects", nargs="+", help="Project roots or globs, e.g. 'services/*'.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPUs).")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("artifacts") / "traceability_batch",
+        help="Directory for the consolidated summary.",
+    )
+    parser.add_argument("--cache-dir", type=Path, default=None)
+
+    args = parser.parse_args(argv)
+
+    project_roots = _entry("resolve_project_roots")(args.projects)
+    if not project_roots:
+        parser.error("no project with docs/requirements.yaml matches the given paths")
+
+    results = _entry("generate_batch")(
+        project_roots, args.output, workers=args.workers, cache_dir=args.cache_dir
+    )
+
+    if any(result["status"] != "ok" for result in results):
+        sys.exit(1)
+
+
+def serve_main(argv):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m regulatory_tools.traceability serve",
+        description="Serve live traceability status as JSON over HTTP.",
+    )
+    parser.add_argument("project_root", type=Path)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: localhost only).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between checks for changed inputs."
+    )
+
+    args = parser.parse_args(argv)
+
+    _entry("serve")(args.project_root, host=args.host, port=args.port, interval=args.interval)
+
+
+def compact_main(argv):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m regulatory_tools.traceability compact",
+        description="Archive old evidence runs and expire the oldest, keeping their summaries.",
+    )
+    parser.add_argument("project_root", type=Path)
+    parser.add_argument(
+        "--keep-runs", type=int, default=10, help="Most recent runs never archived (default: 10)."
+    )
+    parser.add_argument(
+        "--archive-after", type=float, default=30, metavar="DAYS", help="Archive older runs (default: 30)."
+    )
+    parser.add_argument(
+        "--expire-after", type=float, default=None, metavar="DAYS", help="Delete older runs (default: never)."
+    )
+
+    args = parser.parse_args(argv)
+
+    _entry("compact_evidence_runs")(
+        args.project_root,
+        keep_runs=args.keep_runs,
+        archive_after_days=args.archive_after,
+        expire_after_days=args.expire_after,
+    )
+
+
+def history_main(argv):
+
+    parser = argparse.ArgumentParser(
+        prog="python -m regulatory_tools.traceability history",
+        description="Evidence of one requirement across current and archived runs.",
+    )
+    parser.add_argument("project_root", type=Path)
+    parser.add_argument("requirement_id")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per record.")
+
+    args = parser.parse_args(argv)
+
+    for entry in _entry("evidence_history")(args.project_root, args.requirement_id):
+        if args.json:
+            print(json.dumps(entry))
+        else:
+            where = "archived" if entry["archived"] else "current"
+            print(f"{entry['run']}\t{entry['result']}\t{entry['test_id']}\t{where}")
 
 
 def main():
 
-    if len(sys.argv) != 2:
-        print("Usage: python -m regulatory_tools.traceability <project_root>")
+    args = sys.argv[1:]
+
+    if args[:1] == ["query"]:
+        query_main(args[1:])
+        return
+
+    if args[:1] == ["batch"]:
+        batch_main(args[1:])
+        return
+
+    if args[:1] == ["serve"]:
+        serve_main(args[1:])
+        return
+
+    if args[:1] == ["compact"]:
+        compact_main(args[1:])
+        return
+
+    if args[:1] == ["history"]:
+        history_main(args[1:])
+        return
+
+    since = None
+    pages = None
+    formats = None
+    collectors = None
+    profile = "--profile" in args
+
+    if profile:
+        args.remove("--profile")
+
+    if "--pages" in args:
+        index = args.index("--pages")
+        if index + 1 >= len(args):
+            print(USAGE)
+            sys.exit(1)
+        pages = args[index + 1]
+        del args[index:index + 2]
+        if pages != "prefix":
+            if not pages.isdigit() or int(pages) < 1:
+                print(USAGE)
+                sys.exit(1)
+            pages = int(pages)
+
+    if "--formats" in args:
+        index = args.index("--formats")
+        if index + 1 >= len(args):
+            print(USAGE)
+            sys.exit(1)
+        formats = _values(args[index + 1])
+        del args[index:index + 2]
+        unknown = sorted(set(formats) - set(_entry("FORMATS")))
+        if unknown:
+            print(f"Unknown matrix format(s): {', '.join(unknown)}")
+            print(USAGE)
+            sys.exit(1)
+
+    if "--collectors" in args:
+        index = args.index("--collectors")
+        if index + 1 >= len(args):
+            print(USAGE)
+            sys.exit(1)
+        collectors = _values(args[index + 1])
+        del args[index:index + 2]
+
+    if "--since" in args:
+        index = args.index("--since")
+        if index + 1 >= len(args):
+            print(USAGE)
+            sys.exit(1)
+        since = args[index + 1]
+        del args[index:index + 2]
+
+    if len(args) != 1:
+        print(USAGE)
         sys.exit(1)
 
-    project_root = Path(sys.argv[1])
+    project_root = Path(args[0])
+
+    options = {}
+    if pages is not None:
+        options["pages"] = pages
+    if formats:
+        options["formats"] = tuple(formats)
+    if collectors:
+        options["forge_collectors"] = collectors
+    if profile:
+        options["profile"] = _entry("PipelineProfile")(project_root, detailed=True)
 
-    generate_traceability_matrix(project_root)
+    try:
+        if since is not None:
+            with _entry("measure")(options.get("profile"), "incremental_update"):
+                _entry("update_traceability_matrix_since")(project_root, since)
+        else:
+            _entry("generate_traceability_matrix")(project_root, **options)
+    finally:
+        if profile:
+            options["profile"].report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+"""Traceability regeneration for many projects in one invocation.
+
+`generate_batch` runs `generate_traceability_matrix` for every project on a
+process pool. Each worker process pays interpreter startup and the YAML and
+forge imports once for all the projects it handles, and parsed requirement
+catalogs are shared through a `CatalogCache` (in memory per worker, as JSON
+on disk across workers). A consolidated summary of all projects is written
+as JSON and markdown.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import time
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from .catalog_cache import CatalogCache
+from .fingerprint import write_if_changed
+from .generator import sanitize_cell
+from .pipeline import generate_traceability_matrix
+from .state import load_state
+
+# One cache per worker process, created by `_init_worker`
+_catalog_cache: CatalogCache | None = None
+
+
+def resolve_project_roots(patterns: list[str]) -> list[Path]:
+    """
+    Project roots named by *patterns* (paths or globs), deduplicated and
+    sorted; only directories with a ``docs/requirements.yaml`` qualify.
+    """
+
+    roots = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            root = Path(match).resolve()
+            if (root / "docs" / "requirements.yaml").is_file():
+                roots.add(root)
+
+    return sorted(roots)
+
+
+def _init_worker(cache_dir: Path | None) -> None:
+    global _catalog_cache
+    _catalog_cache = CatalogCache(cache_dir)
+
+
+def _project_summary(project_root: Path) -> dict[str, Any]:
+
+    state = load_state(project_root) or {}
+    rows = state.get("matrix", [])
+    untested = sum(1 for row in rows if row["status"] == "UNTESTED")
+    failed = sum(1 for row in rows if row["status"] == "FAIL")
+    forge = state.get("forge_summary") or {}
+
+    return {
+        "requirements": len(rows),
+        "tested": len(rows) - untested,
+        "failed": failed,
+        "requirement_coverage": (len(rows) - untested) / len(rows) * 100 if rows else 0.0,
+        "code_coverage": state.get("code_coverage"),
+        "grade": forge.get("grade"),
+    }
+
+
+def _generate_project(project_root: Path) -> dict[str, Any]:
+
+    started = time.perf_counter()
+    summary: dict[str, Any] = {"project": str(project_root)}
+
+    try:
+        generate_traceability_matrix(project_root, catalog_cache=_catalog_cache)
+    except Exception as exc:
+        summary.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    else:
+        summary.update(status="ok", **_project_summary(project_root))
+
+    summary["seconds"] = time.perf_counter() - started
+
+    return summary
+
+
+def batch_summary_paths(output_dir: Path) -> tuple[Path, Path]:
+    return output_dir / "batch_summary.json", output_dir / "batch_summary.md"
+
+
+def _render_summary(results: list[dict[str, Any]]) -> str:
+
+    out = StringIO()
+    out.write("<!-- AUTO-GENERATED FILE. DO NOT EDIT MANUALLY. -->\n\n")
+    out.write("# Traceability Batch Summary\n\n")
+    out.write(
+        "| Project | Status | Requirements | Tested | Coverage | Failures | Code Coverage "
+        "| Grade |\n"
+    )
+    out.write(
+        "|---------|--------|--------------|--------|----------|----------|---------------"
+        "|-------|\n"
+    )
+
+    for result in results:
+        if result["status"] != "ok":
+            out.write(
+                f"| {sanitize_cell(result['project'])} "
+                f"| {sanitize_cell(result['error'])} | — | — | — | — | — | — |\n"
+            )
+            continue
+        code = result["code_coverage"]
+        out.write(
+            f"| {sanitize_cell(result['project'])} | ok "
+            f"| {result['requirements']} "
+            f"| {result['tested']} "
+            f"| {result['requirement_coverage']:.1f}% "
+            f"| {result['failed']} "
+            f"| {f'{code:.1f}%' if code is not None else 'N/A'} "
+            f"| {result['grade'] or 'N/A'} |\n"
+        )
+
+    ok = [r for r in results if r["status"] == "ok"]
+    total = sum(r["requirements"] for r in ok)
+    tested = sum(r["tested"] for r in ok)
+
+    out.write("\n\n---\n")
+    out.write(f"Projects: {len(results)} ({len(results) - len(ok)} failed)\n\n")
+    out.write(f"Total Requirements: {total}\n\n")
+    out.write(f"Tested: {tested}\n\n")
+    out.write(f"Failures: {sum(r['failed'] for r in ok)}\n")
+
+    return out.getvalue()
+
+
+def generate_batch(
+    project_roots: list[Path],
+    output_dir: Path,
+    workers: int | None = None,
+    cache_dir: Path | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Regenerate the traceability outputs of every project in *project_roots*
+    on a pool of *workers* processes and write the consolidated summary to
+    *output_dir*.
+
+    A project that fails is reported in the summary instead of stopping the
+    batch. *cache_dir* (default ``<output_dir>/catalog_cache``) holds the
+    shared parsed catalogs. Returns one summary dict per project.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_dir = cache_dir or output_dir / "catalog_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(cache_dir,)
+    ) as pool:
+        results = list(pool.map(_generate_project, project_roots))
+
+    json_path, markdown_path = batch_summary_paths(output_dir)
+    write_if_changed(json_path, json.dumps({"projects": results}, indent=2))
+    write_if_changed(markdown_path, _render_summary(results))
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    print(
+        f"[traceability] Batch of {len(results)} project(s) finished, {failed} failed — "
+        f"summary saved to {markdown_path}"
+    )
+
+    return results
@@ -0,0 +1,60 @@
+"""Line sets stored as Python ints, bit *n* set for line *n*.
+
+Set algebra over whole files becomes ``|``, ``&`` and ``& ~``, and a bitmap
+serialises to a short hex string for the JSON artifacts.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
+def from_lines(lines: Iterable[int]) -> int:
+    bits = 0
+    for line in lines:
+        bits |= 1 << line
+    return bits
+
+
+def to_lines(bits: int) -> list[int]:
+    lines = []
+    while bits:
+        low = bits & -bits
+        lines.append(low.bit_length() - 1)
+        bits ^= low
+    return lines
+
+
+def count(bits: int) -> int:
+    return bits.bit_count()
+
+
+def to_ranges(bits: int) -> list[tuple[int, int]]:
+    """
+    Inclusive ``(start, end)`` runs of consecutive lines in *bits*.
+
+    Any gap ends a run, so a range never spans a line that is not in *bits*.
+    """
+    ranges: list[tuple[int, int]] = []
+    start = end = None
+
+    for line in to_lines(bits):
+        if end is not None and line == end + 1:
+            end = line
+            continue
+        if start is not None:
+            ranges.append((start, end))
+        start = end = line
+
+    if start is not None:
+        ranges.append((start, end))
+
+    return ranges
+
+
+def encode(bits: int) -> str:
+    return format(bits, "x")
+
+
+def decode(text: str) -> int:
+    return int(text, 16)
@@ -0,0 +1,62 @@
+"""Parsed requirement catalogs shared between projects.
+
+Projects in a monorepo often point at the same (or an identical copy of a)
+requirements catalog. `CatalogCache` keys parsed catalogs by the SHA-256 of
+the YAML file, keeps them in memory for the process and, with a directory,
+also as JSON on disk so other processes (e.g. batch workers) skip the YAML
+parse as well.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from .fingerprint import file_digest, write_if_changed
+from .generator import load_requirements
+
+
+class CatalogCache:
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory
+        self._catalogs: dict[str, dict[str, dict[str, str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, requirements_yaml: Path) -> dict[str, dict[str, str]]:
+        """`load_requirements` for *requirements_yaml*, parsed at most once per content."""
+
+        digest = file_digest(requirements_yaml)
+        if digest is None:
+            return load_requirements(requirements_yaml)  # raises the usual error
+
+        with self._lock:
+            catalog = self._catalogs.get(digest)
+        if catalog is not None:
+            self.hits += 1
+            return catalog
+
+        cached = self.directory / f"{digest}.json" if self.directory is not None else None
+
+        catalog = None
+        if cached is not None:
+            try:
+                catalog = json.loads(cached.read_text())
+            except (OSError, ValueError):
+                catalog = None
+
+        if catalog is None:
+            self.misses += 1
+            catalog = load_requirements(requirements_yaml)
+            if cached is not None:
+                write_if_changed(cached, json.dumps(catalog, sort_keys=True))
+        else:
+            self.hits += 1
+
+        with self._lock:
+            self._catalogs[digest] = catalog
+
+        return catalog
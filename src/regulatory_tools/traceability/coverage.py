@@ -1,19 +1,32 @@
 from __future__ import annotations
 
-import xml.etree.ElementTree as ET
+import io
+import json
 from pathlib import Path
 
+from . import bitsets
+from .fingerprint import write_if_changed
+from .matrix import TraceMatrix
+
 
 def compute_requirement_coverage(
-    matrix: list[dict],
+    matrix,
 ) -> tuple[float, int, int, list[str]]:
     """
-    Calculate requirement coverage statistics.
+    Calculate requirement coverage statistics for a `TraceMatrix` or a list
+    of row dicts.
 
     Returns:
         coverage_percent, tested_count, total_count, untested_requirements
     """
 
+    if isinstance(matrix, TraceMatrix):
+        counts = matrix.status_counts()
+        total = len(matrix)
+        tested_count = counts["PASS"] + counts["LINKED"]
+        coverage = (tested_count / total) * 100 if total > 0 else 0.0
+        return coverage, tested_count, total, matrix.untested()
+
     total = len(matrix)
 
     tested = [
@@ -36,12 +49,56 @@ def compute_requirement_coverage(
     return coverage, tested_count, total, untested
 
 
+def load_coverage_data(project_root: Path):
+    """
+    Open the project's ``.coverage`` data file as a `CoverageDataReader`.
+
+    Returns None when there is no data file or coverage is not installed.
+    """
+
+    data_file = coverage_data_path(project_root)
+
+    if not data_file.exists():
+        return None
+
+    try:
+        from .coverage_data import CoverageDataReader
+        return CoverageDataReader(project_root, data_file)
+    except ImportError:
+        return None
+
+
 def compute_code_coverage(
     project_root: Path,
-) -> tuple[float | None, dict[str, list[int]]]:
+    reader=None,
+) -> tuple[float | None, dict[str, list[tuple[int, int]]]]:
+    """
+    Compute overall coverage and collect uncovered line ranges per file.
+
+    Reads the raw ``.coverage`` data file (or the already opened *reader*)
+    when it exists and coverage is installed, otherwise falls back to parsing
+    coverage.xml.
+    """
+
+    reader = reader or load_coverage_data(project_root)
+
+    if reader is not None:
+        return reader.percent(), reader.uncovered_ranges()
+
+    return parse_coverage_xml(project_root)
+
+
+def parse_coverage_xml(
+    project_root: Path,
+) -> tuple[float | None, dict[str, list[tuple[int, int]]]]:
     """
     Parse coverage.xml to compute overall coverage and
     collect uncovered lines per file.
+
+    The report is streamed with ``iterparse`` and each element is dropped once
+    read, so memory stays flat however large the XML is. Uncovered lines are
+    returned as inclusive ``(start, end)`` ranges of consecutive line numbers,
+    in line order whatever order the report lists them in.
     """
 
     coverage_xml = coverage_xml_path(project_root)
@@ -49,50 +106,104 @@ def compute_code_coverage(
     if not coverage_xml.exists():
         return None, {}
 
-    tree = ET.parse(coverage_xml)
-    root = tree.getroot()
+    import xml.etree.ElementTree as ET
+
+    coverage_percent = None
+    missed: dict[str, int] = {}
+
+    parents: list[ET.Element] = []
+    filename = None
+    in_methods = False
 
-    coverage_percent = float(root.attrib.get("line-rate", 0)) * 100
+    for event, elem in ET.iterparse(coverage_xml, events=("start", "end")):
 
-    uncovered: dict[str, list[int]] = {}
+        tag = elem.tag
 
-    for cls in root.findall(".//class"):
+        if event == "start":
+            parents.append(elem)
 
-        filename = cls.attrib["filename"]
+            if tag == "coverage":
+                coverage_percent = float(elem.attrib.get("line-rate", 0)) * 100
+            elif tag == "class":
+                filename = elem.attrib["filename"]
+            elif tag == "methods":
+                in_methods = True
+            continue
 
-        missing: list[int] = []
+        parents.pop()
 
-        for line in cls.findall(".//line"):
+        if tag == "line":
+            # Method-level <line>s repeat the class-level ones
+            if filename is not None and not in_methods:
+                if elem.attrib.get("hits") == "0":
+                    missed[filename] = missed.get(filename, 0) | 1 << int(elem.attrib["number"])
+        elif tag == "methods":
+            in_methods = False
+        elif tag == "class":
+            filename = None
+        else:
+            continue
 
-            if line.attrib.get("hits") == "0":
-                missing.append(int(line.attrib["number"]))
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
 
-        if missing:
-            uncovered[filename] = sorted(missing)
+    return coverage_percent, {name: bitsets.to_ranges(bits) for name, bits in missed.items()}
 
-    return coverage_percent, uncovered
 
+def format_line_range(start: int, end: int) -> str:
+    return f"line {start}" if start == end else f"lines {start}-{end}"
 
-def save_uncovered_lines(project_root: Path, uncovered: dict[str, list[int]]) -> None:
+
+def save_uncovered_lines(
+    project_root: Path,
+    uncovered: dict[str, list[tuple[int, int]]],
+) -> None:
 
     coverage_dir = project_root / "artifacts" / "coverage"
     coverage_dir.mkdir(parents=True, exist_ok=True)
 
     output = coverage_dir / "uncovered_lines.txt"
 
-    with output.open("w") as f:
+    with io.StringIO() as f:
 
-        for file, lines in sorted(uncovered.items()):
+        for file, ranges in sorted(uncovered.items()):
 
             f.write(f"{file}\n")
 
-            for ln in lines:
-                f.write(f"  line {ln}\n")
+            for start, end in ranges:
+                f.write(f"  {format_line_range(start, end)}\n")
 
             f.write("\n")
 
+        write_if_changed(output, f.getvalue())
+
+    write_if_changed(
+        uncovered_lines_json_path(project_root),
+        json.dumps(
+            {
+                "format": "ranges",
+                "files": {
+                    file: [[start, end] for start, end in ranges]
+                    for file, ranges in sorted(uncovered.items())
+                },
+            },
+            indent=2,
+        ),
+    )
+
     print(f"[Coverage] Uncovered lines saved to {output}")
 
 
 def coverage_xml_path(project_root: Path) -> Path:
     return project_root / "artifacts" / "coverage" / "coverage.xml"
+
+
+def coverage_data_path(project_root: Path) -> Path:
+    """Raw coverage.py data written by the pytest-cov run (its default location)."""
+    return project_root / ".coverage"
+
+
+def uncovered_lines_json_path(project_root: Path) -> Path:
+    """Machine-readable uncovered ranges: ``{"files": {path: [[start, end], ...]}}``."""
+    return project_root / "artifacts" / "coverage" / "uncovered_lines.json"
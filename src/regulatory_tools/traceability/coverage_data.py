@@ -0,0 +1,133 @@
+"""Coverage read straight from coverage.py's ``.coverage`` SQLite data file.
+
+Avoids rendering and re-parsing coverage.xml: files are analysed lazily, one
+at a time, through the coverage API and kept as line bitmaps (see
+`bitsets`). Paths are project-relative POSIX paths.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from . import bitsets
+from .coverage import coverage_data_path
+
+# Where coverage.py looks for its configuration, in its own order of precedence
+_CONFIG_FILES = (".coveragerc", "setup.cfg", "tox.ini", "pyproject.toml")
+
+
+def _config_file(project_root: Path) -> str | bool:
+    for name in _CONFIG_FILES:
+        if (project_root / name).exists():
+            return str(project_root / name)
+    return False
+
+
+def _matcher(project_root: Path, patterns: list[str] | None, name: str):
+    """coverage's own matcher for *patterns*, relative ones taken from *project_root*."""
+    if not patterns:
+        return None
+
+    from coverage.files import GlobMatcher
+
+    prepped = []
+    for pattern in patterns:
+        prepped.append(pattern)
+        if not pattern.startswith(("*", "?")):
+            prepped.append(str(project_root / pattern))
+    return GlobMatcher(prepped, name)
+
+
+class CoverageDataReader:
+    """
+    Lazy per-file view of a coverage data file.
+
+    Only files ``coverage report`` would list count: the ``[report]`` include
+    and omit patterns of the project's coverage config are applied.
+
+    Raises ImportError when coverage is not installed.
+    """
+
+    def __init__(self, project_root: Path, data_file: Path | None = None) -> None:
+        from coverage import Coverage
+
+        self.project_root = project_root.resolve()
+        self.data_file = data_file or coverage_data_path(project_root)
+
+        self._cov = Coverage(
+            data_file=str(self.data_file),
+            config_file=_config_file(self.project_root),
+        )
+        self._cov.load()
+
+        config = self._cov.config
+        self._include = _matcher(self.project_root, config.report_include, "report_include")
+        self._omit = _matcher(self.project_root, config.report_omit, "report_omit")
+
+        self._measured: dict[str, str] | None = None
+        self._bitmaps: dict[str, tuple[int, int]] = {}
+
+    def _measured_paths(self) -> dict[str, str]:
+        if self._measured is None:
+            self._measured = {}
+            for measured in self._cov.get_data().measured_files():
+                if self._include is not None and not self._include.match(measured):
+                    continue
+                if self._omit is not None and self._omit.match(measured):
+                    continue
+                try:
+                    rel_path = Path(measured).resolve().relative_to(self.project_root)
+                except ValueError:
+                    continue
+                self._measured[rel_path.as_posix()] = measured
+        return self._measured
+
+    def measured_files(self) -> list[str]:
+        return sorted(self._measured_paths())
+
+    def line_bitmaps(self, rel_path: str) -> tuple[int, int]:
+        """``(statements, executed)`` bitmaps for *rel_path*; both 0 when unknown."""
+        if rel_path not in self._bitmaps:
+            self._bitmaps[rel_path] = self._analyse(rel_path)
+        return self._bitmaps[rel_path]
+
+    def _analyse(self, rel_path: str) -> tuple[int, int]:
+        from coverage.exceptions import CoverageException
+
+        measured = self._measured_paths().get(rel_path)
+        if measured is None:
+            return 0, 0
+
+        try:
+            _, statements, _, missing, _ = self._cov.analysis2(measured)
+        except CoverageException as exc:
+            # Source deleted or unparsable since the run
+            print(f"[Coverage] Skipping {rel_path}: {exc}")
+            return 0, 0
+
+        statement_bits = bitsets.from_lines(statements)
+        return statement_bits, statement_bits & ~bitsets.from_lines(missing)
+
+    def totals(self) -> tuple[int, int]:
+        """``(executed, statements)`` summed over every measured file."""
+        executed = statements = 0
+        for rel_path in self.measured_files():
+            statement_bits, executed_bits = self.line_bitmaps(rel_path)
+            statements += bitsets.count(statement_bits)
+            executed += bitsets.count(executed_bits)
+        return executed, statements
+
+    def percent(self) -> float | None:
+        executed, statements = self.totals()
+        if statements == 0:
+            return None
+        return executed / statements * 100
+
+    def uncovered_ranges(self) -> dict[str, list[tuple[int, int]]]:
+        uncovered = {}
+        for rel_path in self.measured_files():
+            statement_bits, executed_bits = self.line_bitmaps(rel_path)
+            missing = statement_bits & ~executed_bits
+            if missing:
+                uncovered[rel_path] = bitsets.to_ranges(missing)
+        return uncovered
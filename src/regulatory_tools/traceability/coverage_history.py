@@ -0,0 +1,163 @@
+"""Per-run coverage snapshots and the diff between two of them.
+
+Every pipeline run with new coverage data stores each file's covered and
+uncovered lines as hex bitmaps in ``artifacts/coverage/history/<run>.json``.
+Comparing two snapshots is then a handful of bitwise operations per file.
+
+Lines are compared by number, so edits that shift code show up as lines
+covered and uncovered at the same time.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from . import bitsets
+from .coverage_reports import data_file_hash
+from .fingerprint import write_if_changed
+
+HISTORY_VERSION = 1
+
+
+def history_dir(project_root: Path) -> Path:
+    return project_root / "artifacts" / "coverage" / "history"
+
+
+def list_coverage_runs(project_root: Path) -> list[str]:
+    """Snapshot run ids, oldest first."""
+    directory = history_dir(project_root)
+    if not directory.exists():
+        return []
+    return sorted(p.stem for p in directory.glob("*.json"))
+
+
+def _read_snapshot(project_root: Path, run_id: str) -> dict | None:
+    try:
+        snapshot = json.loads((history_dir(project_root) / f"{run_id}.json").read_text())
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get("version") == HISTORY_VERSION else None
+
+
+def load_coverage_snapshot(project_root: Path, run_id: str) -> dict[str, tuple[int, int]] | None:
+    """``{file: (covered, uncovered)}`` line bitmaps of *run_id*."""
+    snapshot = _read_snapshot(project_root, run_id)
+    if snapshot is None:
+        return None
+    return {
+        rel_path: (bitsets.decode(lines["covered"]), bitsets.decode(lines["uncovered"]))
+        for rel_path, lines in snapshot["files"].items()
+    }
+
+
+def record_coverage_snapshot(project_root: Path, reader, run_id: str | None = None) -> str | None:
+    """
+    Store the coverage of *reader* (a `CoverageDataReader`) as a new run.
+
+    Returns the new run id, or None when the data file is unchanged since the
+    latest snapshot.
+    """
+    data_hash = data_file_hash(reader.data_file)
+
+    runs = list_coverage_runs(project_root)
+    if runs:
+        latest = _read_snapshot(project_root, runs[-1])
+        if latest is not None and latest.get("data_hash") == data_hash:
+            return None
+
+    files = {}
+    for rel_path in reader.measured_files():
+        statements, executed = reader.line_bitmaps(rel_path)
+        if statements:
+            files[rel_path] = {
+                "covered": bitsets.encode(executed),
+                "uncovered": bitsets.encode(statements & ~executed),
+            }
+
+    run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    write_if_changed(
+        history_dir(project_root) / f"{run_id}.json",
+        json.dumps(
+            {
+                "version": HISTORY_VERSION,
+                "run": run_id,
+                "data_hash": data_hash,
+                "files": files,
+            },
+            sort_keys=True,
+        ),
+    )
+
+    return run_id
+
+
+def _percent(covered: int, uncovered: int) -> float | None:
+    statements = bitsets.count(covered) + bitsets.count(uncovered)
+    if statements == 0:
+        return None
+    return bitsets.count(covered) / statements * 100
+
+
+def diff_coverage(
+    base: dict[str, tuple[int, int]],
+    head: dict[str, tuple[int, int]],
+) -> dict[str, dict]:
+    """
+    Per-file changes from *base* to *head*, only for files that changed.
+
+    ``newly_uncovered`` are lines uncovered in *head* that were not uncovered
+    in *base* (regressions and new untested code); ``newly_covered`` are lines
+    covered in *head* that were not covered in *base*. Both are line ranges.
+    """
+    changes = {}
+
+    for rel_path in sorted(base.keys() | head.keys()):
+        old_covered, old_uncovered = base.get(rel_path, (0, 0))
+        new_covered, new_uncovered = head.get(rel_path, (0, 0))
+
+        newly_uncovered = new_uncovered & ~old_uncovered
+        newly_covered = new_covered & ~old_covered
+
+        if not newly_uncovered and not newly_covered:
+            continue
+
+        changes[rel_path] = {
+            "before": _percent(old_covered, old_uncovered),
+            "after": _percent(new_covered, new_uncovered),
+            "newly_uncovered": bitsets.to_ranges(newly_uncovered),
+            "newly_covered": bitsets.to_ranges(newly_covered),
+        }
+
+    return changes
+
+
+def coverage_delta(
+    project_root: Path,
+    base: str | None = None,
+    head: str | None = None,
+) -> dict | None:
+    """
+    Diff two stored runs, by default the two most recent ones.
+
+    Returns None when fewer than two snapshots exist.
+    """
+    runs = list_coverage_runs(project_root)
+
+    head = head or (runs[-1] if runs else None)
+    if base is None:
+        older = [r for r in runs if r < head] if head else []
+        base = older[-1] if older else None
+
+    if base is None or head is None:
+        return None
+
+    base_files = load_coverage_snapshot(project_root, base)
+    head_files = load_coverage_snapshot(project_root, head)
+
+    if base_files is None or head_files is None:
+        return None
+
+    return {"base": base, "head": head, "files": diff_coverage(base_files, head_files)}
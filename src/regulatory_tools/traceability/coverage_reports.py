@@ -0,0 +1,127 @@
+"""On-demand coverage report rendering.
+
+Test runs only collect the raw ``.coverage`` data file. XML, HTML and JSON
+reports are rendered afterwards from it, each in its own ``coverage``
+process so they render in parallel. A format is skipped when its output
+exists and was rendered from a data file with the same content hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from .coverage import coverage_data_path, coverage_xml_path
+from .fingerprint import write_if_changed
+
+REPORT_FORMATS = ("xml", "html", "json")
+
+
+def report_output_path(project_root: Path, fmt: str) -> Path:
+    coverage_dir = project_root / "artifacts" / "coverage"
+    return {
+        "xml": coverage_xml_path(project_root),
+        "html": coverage_dir / "html",
+        "json": coverage_dir / "coverage.json",
+    }[fmt]
+
+
+def report_state_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "coverage" / "reports.json"
+
+
+def data_file_hash(data_file: Path) -> str:
+    digest = hashlib.sha256()
+    with data_file.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_report_state(project_root: Path) -> dict[str, str]:
+    path = report_state_path(project_root)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _render_command(project_root: Path, data_file: Path, fmt: str) -> list[str]:
+    output = report_output_path(project_root, fmt)
+    flag = "-d" if fmt == "html" else "-o"
+    return [sys.executable, "-m", "coverage", fmt, f"--data-file={data_file}", flag, str(output)]
+
+
+def render_coverage_reports(
+    project_root: Path,
+    formats: tuple[str, ...] | list[str] = ("xml",),
+    data_file: Path | None = None,
+    force: bool = False,
+) -> list[str]:
+    """
+    Render the requested report *formats* from *data_file* (the project's
+    ``.coverage`` by default).
+
+    Returns the formats actually rendered; formats whose output is already up
+    to date with the data file are skipped unless *force* is set.
+    """
+    unknown = sorted(set(formats) - set(REPORT_FORMATS))
+    if unknown:
+        raise ValueError(f"Unknown coverage report format(s): {', '.join(unknown)}")
+
+    data_file = data_file or coverage_data_path(project_root)
+
+    if not data_file.exists():
+        print(f"[Coverage] No coverage data at {data_file} — no reports rendered.")
+        return []
+
+    state = _load_report_state(project_root)
+    current = data_file_hash(data_file)
+
+    pending = [
+        fmt for fmt in dict.fromkeys(formats)
+        if force
+        or state.get(fmt) != current
+        or not report_output_path(project_root, fmt).exists()
+    ]
+
+    for fmt in sorted(set(formats) - set(pending)):
+        print(f"[Coverage] {fmt} report is up to date.")
+
+    report_output_path(project_root, "xml").parent.mkdir(parents=True, exist_ok=True)
+
+    def render(fmt: str) -> int:
+        return subprocess.run(
+            _render_command(project_root, data_file, fmt), cwd=project_root
+        ).returncode
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as pool:
+        results = dict(zip(pending, pool.map(render, pending), strict=True))
+
+    rendered = []
+    for fmt, returncode in results.items():
+        if returncode == 0:
+            state[fmt] = current
+            rendered.append(fmt)
+        else:
+            state.pop(fmt, None)
+            print(f"[Coverage] Rendering the {fmt} report failed (exit {returncode}).")
+
+    write_if_changed(report_state_path(project_root), json.dumps(state, indent=2, sort_keys=True))
+
+    xml_report = report_output_path(project_root, "xml")
+    if "xml" in formats and xml_report.exists():
+        # Forge expects coverage.xml at the project root by default
+        root_copy = project_root / "coverage.xml"
+        if "xml" in rendered or not root_copy.exists():
+            shutil.copy(xml_report, root_copy)
+
+    return rendered
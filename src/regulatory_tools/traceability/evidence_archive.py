@@ -0,0 +1,291 @@
+"""Retention and compaction of old evidence runs.
+
+`compact_evidence_runs` packs every evidence run older than the retention
+policy into one zip archive per run under ``artifacts/evidence_archive/``,
+next to an offset index (``<run>.index.json``) and a summary in the shape of
+`generate_evidence_summary` (``<run>.summary.json``), and removes the run
+directory. Runs older than the expiry age are deleted, archive included;
+their summaries are kept.
+
+The index maps each record file to the offset of its zip entry and carries
+the record's result, test id and requirement ids, so history queries
+(`evidence_history`) answer from the indexes alone and single records are
+read with one seek (`read_archived_record`) instead of unpacking the run.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import struct
+import time
+import zipfile
+import zlib
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..evidence.evidence_report import parse_evidence_record, summarize_evidence_records
+from .fingerprint import write_if_changed
+from .generator import extract_requirement_ids
+
+INDEX_VERSION = 1
+
+# Local file header: signature, version, flags, method, mtime, mdate, crc,
+# compressed size, size, name length, extra length
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+
+_DAY = 24 * 60 * 60
+
+
+def evidence_archive_dir(project_root: Path) -> Path:
+    return project_root / "artifacts" / "evidence_archive"
+
+
+def archive_paths(archive_dir: Path, run: str) -> tuple[Path, Path, Path]:
+    """The archive, index and summary paths of *run*."""
+    return (
+        archive_dir / f"{run}.zip",
+        archive_dir / f"{run}.index.json",
+        archive_dir / f"{run}.summary.json",
+    )
+
+
+def _run_time(run_dir: Path) -> float:
+    # Runs are named after their start time; other names fall back to the mtime
+    try:
+        return datetime.strptime(run_dir.name, "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return run_dir.stat().st_mtime
+
+
+def pack_evidence_run(run_dir: Path, archive_dir: Path) -> dict[str, Any]:
+    """
+    Pack the records of *run_dir* into its archive, write the offset index
+    and the summary, and return the summary. The run directory is left in
+    place.
+    """
+
+    archive, index_path, summary_path = archive_paths(archive_dir, run_dir.name)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    partial = archive.with_name(f".{archive.name}.tmp")
+    entries: dict[str, dict[str, Any]] = {}
+    records = []
+
+    with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for record_file in sorted(run_dir.glob("*.json")):
+            data = record_file.read_bytes()
+            zf.writestr(record_file.name, data)
+            info = zf.getinfo(record_file.name)
+
+            record = parse_evidence_record(data)
+            if record is None:
+                # Kept in the archive, left out of the summary like generate_evidence_summary does
+                record = {}
+            else:
+                records.append(record)
+
+            entries[record_file.name] = {
+                "offset": info.header_offset,
+                "size": info.compress_size,
+                "method": info.compress_type,
+                "result": record.get("result"),
+                "test_id": record.get("test_id"),
+                "requirements": sorted(extract_requirement_ids(record)),
+            }
+
+    partial.replace(archive)
+
+    write_if_changed(
+        index_path,
+        json.dumps({"version": INDEX_VERSION, "run": run_dir.name, "records": entries}, sort_keys=True),
+    )
+
+    summary = _run_summary(run_dir, records, archived=True)
+    write_if_changed(summary_path, json.dumps(summary, indent=2, sort_keys=True))
+
+    return summary
+
+
+def _run_summary(run_dir: Path, records: list[dict[str, Any]], archived: bool) -> dict[str, Any]:
+    return {
+        "run": run_dir.name,
+        "run_time": _run_time(run_dir),
+        "archived": archived,
+        "expired": not archived,
+        **summarize_evidence_records(records),
+        "requirements": sorted({req for record in records for req in extract_requirement_ids(record)}),
+    }
+
+
+def compact_evidence_runs(
+    project_root: Path,
+    keep_runs: int = 10,
+    archive_after_days: float = 30,
+    expire_after_days: float | None = None,
+    now: float | None = None,
+) -> dict[str, list[str]]:
+    """
+    Apply the retention policy to the project's evidence runs.
+
+    The *keep_runs* most recent runs (at least the latest one, which the
+    matrix reads) stay as directories. Older runs are packed with
+    `pack_evidence_run` once they are *archive_after_days* old; runs and
+    archives older than *expire_after_days* are deleted, keeping only their
+    summaries. Returns the names of the ``archived`` and ``expired`` runs.
+    """
+
+    now = time.time() if now is None else now
+    evidence_root = project_root / "artifacts" / "evidence_runs"
+    archive_dir = evidence_archive_dir(project_root)
+
+    runs = [p for p in evidence_root.iterdir() if p.is_dir()] if evidence_root.exists() else []
+    # Oldest first by start time, so renamed or odd-named runs do not jump the queue
+    runs.sort(key=lambda run_dir: (_run_time(run_dir), run_dir.name))
+    candidates = runs[: max(len(runs) - max(keep_runs, 1), 0)]
+
+    def expired(run_time: float) -> bool:
+        return expire_after_days is not None and now - run_time >= expire_after_days * _DAY
+
+    archived, gone = [], []
+
+    for run_dir in candidates:
+        run_time = _run_time(run_dir)
+        if expired(run_time):
+            _expire_run_dir(run_dir, archive_dir)
+            gone.append(run_dir.name)
+        elif now - run_time >= archive_after_days * _DAY:
+            pack_evidence_run(run_dir, archive_dir)
+            archived.append(run_dir.name)
+        else:
+            continue
+        shutil.rmtree(run_dir)
+
+    for summary_path in sorted(archive_dir.glob("*.summary.json")) if archive_dir.exists() else []:
+        summary = json.loads(summary_path.read_text())
+        if summary["archived"] and expired(summary["run_time"]):
+            _expire_archive(archive_dir, summary)
+            gone.append(summary["run"])
+
+    print(
+        f"[evidence] Archived {len(archived)} run(s) and expired {len(gone)} run(s) "
+        f"in {archive_dir}"
+    )
+
+    return {"archived": archived, "expired": gone}
+
+
+def _expire_run_dir(run_dir: Path, archive_dir: Path) -> None:
+
+    records = []
+    for record_file in run_dir.glob("*.json"):
+        record = parse_evidence_record(record_file.read_text())
+        if record is not None:
+            records.append(record)
+
+    _, _, summary_path = archive_paths(archive_dir, run_dir.name)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    write_if_changed(
+        summary_path, json.dumps(_run_summary(run_dir, records, archived=False), indent=2, sort_keys=True)
+    )
+
+
+def _expire_archive(archive_dir: Path, summary: dict[str, Any]) -> None:
+    archive, index_path, summary_path = archive_paths(archive_dir, summary["run"])
+    archive.unlink(missing_ok=True)
+    index_path.unlink(missing_ok=True)
+    write_if_changed(
+        summary_path,
+        json.dumps({**summary, "archived": False, "expired": True}, indent=2, sort_keys=True),
+    )
+
+
+def load_archive_index(archive_dir: Path, run: str) -> dict[str, dict[str, Any]]:
+    """``{record file: entry}`` of an archived run."""
+    _, index_path, _ = archive_paths(archive_dir, run)
+    index = json.loads(index_path.read_text())
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported evidence archive index version in {index_path}")
+    return index["records"]
+
+
+def _read_entry(f, entry: dict[str, Any]) -> bytes:
+
+    f.seek(entry["offset"])
+    header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_SIGNATURE:
+        raise ValueError("Evidence archive index does not match the archive")
+
+    # Skip the file name and extra field to the entry's data
+    f.seek(header[9] + header[10], 1)
+    data = f.read(entry["size"])
+
+    if entry["method"] == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+def read_archived_record(archive_dir: Path, run: str, name: str) -> dict[str, Any]:
+    """One evidence record of an archived run, read through the offset index."""
+    entry = load_archive_index(archive_dir, run)[name]
+    archive, _, _ = archive_paths(archive_dir, run)
+    with archive.open("rb") as f:
+        return json.loads(_read_entry(f, entry))
+
+
+def iter_archived_records(archive_dir: Path, run: str) -> Iterator[dict[str, Any]]:
+    """The records of an archived run, each tagged with ``_evidence_file`` like `load_latest_evidence`."""
+    index = load_archive_index(archive_dir, run)
+    archive, _, _ = archive_paths(archive_dir, run)
+    with archive.open("rb") as f:
+        for name, entry in sorted(index.items(), key=lambda item: item[1]["offset"]):
+            record = parse_evidence_record(_read_entry(f, entry))
+            if record is None:
+                continue
+            record["_evidence_file"] = name
+            yield record
+
+
+def evidence_history(project_root: Path, requirement_id: str) -> list[dict[str, Any]]:
+    """
+    Evidence of *requirement_id* in every run still held, oldest first:
+    archived runs are answered from their indexes, run directories are read.
+    Each entry has ``run``, ``evidence_file``, ``test_id``, ``result`` and
+    ``archived``.
+    """
+
+    evidence_root = project_root / "artifacts" / "evidence_runs"
+    archive_dir = evidence_archive_dir(project_root)
+
+    history = []
+
+    if archive_dir.exists():
+        for index_path in archive_dir.glob("*.index.json"):
+            run = index_path.name.removesuffix(".index.json")
+            for name, entry in load_archive_index(archive_dir, run).items():
+                if requirement_id in entry["requirements"]:
+                    history.append({
+                        "run": run,
+                        "evidence_file": name,
+                        "test_id": entry["test_id"],
+                        "result": entry["result"],
+                        "archived": True,
+                    })
+
+    if evidence_root.exists():
+        for run_dir in (p for p in evidence_root.iterdir() if p.is_dir()):
+            for record_file in run_dir.glob("*.json"):
+                record = parse_evidence_record(record_file.read_text())
+                if record is not None and requirement_id in extract_requirement_ids(record):
+                    history.append({
+                        "run": run_dir.name,
+                        "evidence_file": record_file.name,
+                        "test_id": record.get("test_id"),
+                        "result": record.get("result"),
+                        "archived": False,
+                    })
+
+    return sorted(history, key=lambda entry: (entry["run"], entry["evidence_file"]))
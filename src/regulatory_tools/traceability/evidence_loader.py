@@ -2,17 +2,25 @@ import json
 from pathlib import Path
 
 
-def load_latest_evidence(root: Path):
+def latest_evidence_run(root: Path) -> Path | None:
 
     if not root.exists():
-        return []
+        return None
 
     evidence_runs = sorted(p for p in root.iterdir() if p.is_dir())
 
     if not evidence_runs:
-        return []
+        return None
+
+    return evidence_runs[-1]
+
 
-    latest = evidence_runs[-1]
+def load_latest_evidence(root: Path):
+
+    latest = latest_evidence_run(root)
+
+    if latest is None:
+        return []
 
     records = []
 
@@ -0,0 +1,124 @@
+"""Input fingerprints and write-if-changed output for the traceability pipeline.
+
+`generate_traceability_matrix` stores one fingerprint per input in its state
+and compares them on the next call to decide what, if anything, has to be
+recomputed. Outputs go through `write_if_changed`, so files whose bytes would
+not change keep their mtime and downstream caches stay valid.
+"""
+
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TextIO
+
+from .evidence_loader import latest_evidence_run
+
+
+def file_digest(path: Path) -> str | None:
+    """SHA-256 of the file's bytes, or None when it does not exist."""
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_digest(paths: Iterable[Path], root: Path) -> str:
+    """
+    Digest of the names, sizes and mtimes of *paths*.
+
+    Used for inputs with many files (evidence runs, source trees) where
+    reading every byte would cost about as much as the work it guards.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = path.stat()
+        digest.update(f"{path.relative_to(root).as_posix()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def value_digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def digest_test_files(test_dir: Path, project_root: Path) -> dict[str, str]:
+    """``{rel_path: sha256}`` of every ``test_*.py`` file under *test_dir*."""
+    return {
+        test_file.relative_to(project_root).as_posix(): file_digest(test_file)
+        for test_file in test_dir.rglob("test_*.py")
+    }
+
+
+def matrix_input_fingerprints(project_root: Path, test_files: dict[str, str]) -> dict[str, str | None]:
+    """Fingerprints of what the matrix rows are built from: catalog, test markers, evidence."""
+    evidence_run = latest_evidence_run(project_root / "artifacts" / "evidence_runs")
+    return {
+        "requirements": file_digest(project_root / "docs" / "requirements.yaml"),
+        "tests": value_digest(test_files),
+        "evidence": evidence_run and value_digest(
+            [evidence_run.name, stat_digest(evidence_run.glob("*.json"), evidence_run)]
+        ),
+    }
+
+
+def _temporary_path(path: Path) -> Path:
+    # Opened normally (not mkstemp) so the file gets the usual umask permissions
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+@contextmanager
+def open_if_changed(path: Path, newline: str | None = None) -> Iterator[TextIO]:
+    """
+    Stream text into a temporary file next to *path*, then atomically replace
+    *path* with it unless the bytes are identical.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temporary_path(path)
+
+    try:
+        with tmp.open("w", encoding="utf-8", newline=newline) as f:
+            yield f
+
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            tmp.unlink()
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path: Path, data: str | bytes) -> bool:
+    """
+    Atomically replace *path* with *data* unless it already holds those bytes.
+
+    Returns True when the file was written.
+    """
+    content = data.encode() if isinstance(data, str) else data
+
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = _temporary_path(path)
+    try:
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    return True
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import re
+from collections import Counter
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, TextIO
 
 from .evidence_loader import load_latest_evidence
+from .fingerprint import open_if_changed
+from .matrix import TraceMatrix
+from .writers import MatrixWriter, write_matrix
 
 
 def _extract_requirement_ids_from_issues(record: dict[str, Any]) -> list[str]:
@@ -23,7 +27,7 @@ def _extract_requirement_ids_from_issues(record: dict[str, Any]) -> list[str]:
     return issue_ids
 
 
-def _extract_requirement_ids(record: dict[str, Any]) -> list[str]:
+def extract_requirement_ids(record: dict[str, Any]) -> list[str]:
     """
     Extract requirement IDs from an evidence record.
 
@@ -49,6 +53,8 @@ def _extract_requirement_ids(record: dict[str, Any]) -> list[str]:
 
 
 def load_requirements(requirements_yaml: Path) -> dict[str, dict[str, str]]:
+    import yaml  # deferred: only needed when a catalog is actually parsed
+
     with requirements_yaml.open() as f:
         data = yaml.safe_load(f)
 
@@ -65,9 +71,17 @@ def load_requirements(requirements_yaml: Path) -> dict[str, dict[str, str]]:
 def build_trace_matrix(
     requirements_yaml: Path,
     evidence_root: Path,
-) -> list[dict[str, Any]]:
+    requirements: dict[str, dict[str, str]] | None = None,
+) -> TraceMatrix:
+    """
+    Evidence-only matrix rows, sorted by requirement id.
+
+    *requirements* is the already parsed catalog (see `load_requirements`);
+    *requirements_yaml* is read when it is not given.
+    """
 
-    requirements = load_requirements(requirements_yaml)
+    if requirements is None:
+        requirements = load_requirements(requirements_yaml)
 
     try:
         evidence = load_latest_evidence(evidence_root)
@@ -78,18 +92,16 @@ def build_trace_matrix(
     evidence_map: dict[str, list[dict[str, Any]]] = {}
 
     for record in evidence:
-        req_ids = _extract_requirement_ids(record)
+        req_ids = extract_requirement_ids(record)
 
         for req in req_ids:
             evidence_map.setdefault(req, []).append(record)
 
-    matrix = []
+    matrix = TraceMatrix()
 
-    for req_id, meta in requirements.items():
+    for req_id in sorted(requirements):
         records = evidence_map.get(req_id, [])
 
-        tests = sorted({r.get("test_id") or "" for r in records})
-        files = sorted({r.get("_evidence_file") or "" for r in records})
         results = {r.get("result", "") for r in records}
 
         if not records:
@@ -100,19 +112,17 @@ def build_trace_matrix(
             status = "PASS"
 
         matrix.append(
-            {
-                "requirement_id": req_id,
-                "title": meta["title"],
-                "tests": ", ".join(filter(None, tests)),
-                "evidence_files": ", ".join(filter(None, files)),
-                "status": status,
-            }
+            req_id,
+            requirements[req_id]["title"],
+            tests=[r.get("test_id") for r in records],
+            evidence_files=[r.get("_evidence_file") for r in records],
+            status=status,
         )
 
-    return sorted(matrix, key=lambda x: x["requirement_id"])
+    return matrix
 
 
-def _sanitize_cell(text: str) -> str:
+def sanitize_cell(text: str) -> str:
     """
     Ensure markdown table integrity:
     - Remove newlines
@@ -127,17 +137,46 @@ def _sanitize_cell(text: str) -> str:
     return text
 
 
-def write_markdown(
-        matrix: list[dict[str, Any]],
-        output: Path,
-        req_coverage_summary: dict[str, Any] | None = None,
-        code_coverage_summary: dict[str, Any] | None = None,
-        forge_health: dict[str, Any] | None = None,
-    ) -> None:
+def _format_percent(value: float | None) -> str:
+    return "—" if value is None else f"{value:.1f}%"
+
 
-    output.parent.mkdir(parents=True, exist_ok=True)
+def _format_ranges(ranges: list) -> str:
+    return ", ".join(str(s) if s == e else f"{s}-{e}" for s, e in ranges) or "—"
 
-    with output.open("w") as f:
+
+class MarkdownWriter(MatrixWriter):
+    """
+    ``docs/traceability_matrix.md``: summary sections, the traceability table,
+    then untested requirements, verification cost and totals.
+    """
+
+    def __init__(
+            self,
+            output: Path,
+            req_coverage_summary: dict[str, Any] | None = None,
+            code_coverage_summary: dict[str, Any] | None = None,
+            forge_health: dict[str, Any] | None = None,
+            impact_summary: dict[str, Any] | None = None,
+            verification_cost: list[dict[str, Any]] | None = None,
+            requirement_code: dict[str, Any] | None = None,
+            coverage_delta: dict[str, Any] | None = None,
+        ) -> None:
+
+        super().__init__(output)
+
+        self.req_coverage_summary = req_coverage_summary
+        self.code_coverage_summary = code_coverage_summary
+        self.forge_health = forge_health
+        self.impact_summary = impact_summary
+        self.verification_cost = verification_cost
+        self.requirement_code = requirement_code
+        self.coverage_delta = coverage_delta
+        self.code_by_requirement = (requirement_code or {}).get("requirements")
+
+        self.counts: Counter[str] = Counter()
+
+    def begin(self, f: TextIO) -> None:
 
         f.write("<!-- AUTO-GENERATED FILE. DO NOT EDIT MANUALLY. -->\n\n")
         f.write("# Requirements Traceability Matrix\n\n")
@@ -146,24 +185,24 @@ def write_markdown(
         # Requirement Coverage Summary
         # ---------------------------------------------------------
 
-        if req_coverage_summary:
+        if self.req_coverage_summary:
 
             f.write("## Requirement Coverage\n\n")
 
             f.write(
-                f"**Coverage:** {req_coverage_summary['coverage']:.1f}% "
-                f"({req_coverage_summary['tested']} / {req_coverage_summary['total']} requirements tested)\n\n"
+                f"**Coverage:** {self.req_coverage_summary['coverage']:.1f}% "
+                f"({self.req_coverage_summary['tested']} / {self.req_coverage_summary['total']} requirements tested)\n\n"
             )
 
         # ---------------------------------------------------------
         # Code Coverage Summary
         # ---------------------------------------------------------
 
-        if code_coverage_summary:
+        if self.code_coverage_summary:
 
             f.write("## Code Coverage\n\n")
 
-            coverage = code_coverage_summary.get("coverage")
+            coverage = self.code_coverage_summary.get("coverage")
 
             if coverage is None:
                 f.write("**Line Coverage:** N/A\n\n")
@@ -175,16 +214,69 @@ def write_markdown(
                 "`artifacts/coverage/uncovered_lines.txt`\n\n"
             )
 
+            if self.requirement_code:
+                f.write(
+                    "Source lines executed by each requirement's tests saved in "
+                    "`artifacts/coverage/requirement_code.json`\n\n"
+                )
+
+        # ---------------------------------------------------------
+        # Coverage Delta (against the previous coverage snapshot)
+        # ---------------------------------------------------------
+
+        if self.coverage_delta:
+
+            f.write("## Coverage Delta\n\n")
+
+            changed = self.coverage_delta["files"]
+
+            f.write(
+                f"Run `{self.coverage_delta['head']}` compared with `{self.coverage_delta['base']}`: "
+                f"{len(changed)} file(s) changed.\n\n"
+            )
+
+            if changed:
+                f.write("| File | Before | After | Newly Uncovered | Newly Covered |\n")
+                f.write("|------|--------|-------|-----------------|---------------|\n")
+                for file, delta in changed.items():
+                    f.write(
+                        f"| {sanitize_cell(file)} "
+                        f"| {_format_percent(delta['before'])} "
+                        f"| {_format_percent(delta['after'])} "
+                        f"| {_format_ranges(delta['newly_uncovered'])} "
+                        f"| {_format_ranges(delta['newly_covered'])} |\n"
+                    )
+                f.write("\n")
+
+        # ---------------------------------------------------------
+        # Test Impact Analysis (only for partial, impact-scoped runs)
+        # ---------------------------------------------------------
+
+        if self.impact_summary:
+
+            f.write("## Test Impact Analysis\n\n")
+
+            f.write(
+                f"Partial run for {len(self.impact_summary['changed_files'])} changed file(s): "
+                f"{len(self.impact_summary['rerun_tests'])} test(s) re-run.\n\n"
+            )
+
+            reverified = ", ".join(self.impact_summary["reverified_requirements"]) or "none"
+            carried = ", ".join(self.impact_summary["carried_forward_requirements"]) or "none"
+
+            f.write(f"**Re-verified in this run:** {sanitize_cell(reverified)}\n\n")
+            f.write(f"**Prior evidence carried forward:** {sanitize_cell(carried)}\n\n")
+
         # ---------------------------------------------------------
         # Forge Code Health (optional — only when forge is installed)
         # ---------------------------------------------------------
 
-        if forge_health is not None:
+        if self.forge_health is not None:
             f.write("## Forge Code Health\n\n")
 
-            score = forge_health.get("overall_score")
-            grade = forge_health.get("grade", "N/A")
-            generated_at = forge_health.get("generated_at", "")
+            score = self.forge_health.get("overall_score")
+            grade = self.forge_health.get("grade", "N/A")
+            generated_at = self.forge_health.get("generated_at", "")
 
             if score is not None:
                 f.write(f"**Overall Score:** {score:.1%}  **Grade:** {grade}\n\n")
@@ -194,7 +286,7 @@ def write_markdown(
             if generated_at:
                 f.write(f"*Generated at {generated_at}*\n\n")
 
-            collectors = forge_health.get("collectors", {})
+            collectors = self.forge_health.get("collectors", {})
             if collectors:
                 f.write("| Collector | Score | Status |\n")
                 f.write("|-----------|-------|--------|\n")
@@ -202,7 +294,7 @@ def write_markdown(
                     display_name = name.replace("_", " ").title()
                     if data.get("skipped"):
                         reason = data.get("skip_reason") or "skipped"
-                        f.write(f"| {display_name} | — | {_sanitize_cell(reason)} |\n")
+                        f.write(f"| {display_name} | — | {sanitize_cell(reason)} |\n")
                     else:
                         s = data.get("score")
                         score_cell = f"{s:.1%}" if s is not None else "—"
@@ -214,48 +306,306 @@ def write_markdown(
         # Traceability Table
         # ---------------------------------------------------------
 
+        if self.code_by_requirement is None:
+            f.write(
+                "| Requirement ID | Title | Linked Tests | Evidence Artifacts | Status |\n"
+            )
+            f.write(
+                "|----------------|-------------|--------------|--------------------|--------|\n"
+            )
+        else:
+            f.write(
+                "| Requirement ID | Title | Linked Tests | Evidence Artifacts | Status "
+                "| Covered Code |\n"
+            )
+            f.write(
+                "|----------------|-------------|--------------|--------------------|--------"
+                "|--------------|\n"
+            )
+
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+
+        self.counts[record["status"]] += 1
+
         f.write(
-            "| Requirement ID | Title | Linked Tests | Evidence Artifacts | Status |\n"
-        )
-        f.write(
-            "|----------------|-------------|--------------|--------------------|--------|\n"
+            f"| {sanitize_cell(record['requirement_id'])} "
+            f"| {sanitize_cell(record['title'])} "
+            f"| {sanitize_cell(', '.join(record['tests']))} "
+            f"| {sanitize_cell(', '.join(record['evidence_files']))} "
+            f"| {sanitize_cell(record['status'])} "
         )
 
-        for row in matrix:
+        if self.code_by_requirement is not None:
+            code = self.code_by_requirement.get(record["requirement_id"])
+            cell = f"{code['lines']} line(s) in {len(code['files'])} file(s)" if code else "—"
+            f.write(f"| {cell} ")
 
-            f.write(
-                f"| {_sanitize_cell(row['requirement_id'])} "
-                f"| {_sanitize_cell(row['title'])} "
-                f"| {_sanitize_cell(row['tests'])} "
-                f"| {_sanitize_cell(row['evidence_files'])} "
-                f"| {_sanitize_cell(row['status'])} |\n"
-            )
+        f.write("|\n")
 
+    def end(self, f: TextIO) -> None:
 
         f.write("\n\n---\n")
 
-        if req_coverage_summary and req_coverage_summary.get("untested"):
+        if self.req_coverage_summary and self.req_coverage_summary.get("untested"):
             f.write("\n## Untested Requirements\n\n")
-            for req in req_coverage_summary["untested"]:
+            for req in self.req_coverage_summary["untested"]:
                 f.write(f"- {req}\n")
 
+        # ---------------------------------------------------------
+        # Verification Cost (per-requirement test durations)
+        # ---------------------------------------------------------
+
+        if self.verification_cost:
+            f.write("\n## Verification Cost\n\n")
+            f.write(
+                "| Requirement ID | Tests | Setup (s) | Call (s) | Teardown (s) | Total (s) |\n"
+            )
+            f.write(
+                "|----------------|-------|-----------|----------|--------------|-----------|\n"
+            )
+            for row in self.verification_cost:
+                f.write(
+                    f"| {sanitize_cell(row['requirement_id'])} "
+                    f"| {row['tests']} "
+                    f"| {row['setup']:.3f} "
+                    f"| {row['call']:.3f} "
+                    f"| {row['teardown']:.3f} "
+                    f"| {row['total']:.3f} |\n"
+                )
+
         # ---------------------------------------------------------
         # Summary Stats
         # ---------------------------------------------------------
 
-        total = len(matrix)
-        tested = sum(1 for r in matrix if r["status"] != "UNTESTED")
-        failed = sum(1 for r in matrix if r["status"] == "FAIL")
+        total = sum(self.counts.values())
+        tested = total - self.counts["UNTESTED"]
+        failed = self.counts["FAIL"]
+
+        f.write("\n\n---\n")
+        f.write(f"Total Requirements: {total}\n\n")
+        f.write(f"Tested: {tested}\n\n")
+        f.write(f"Failures: {failed}\n")
+
+
+def pages_dir(project_root: Path) -> Path:
+    return project_root / "docs" / "traceability"
+
+
+_PAGE_LINK = re.compile(r"^\| \[[^\]]*\]\(([^)/]+\.md)\) \|", re.MULTILINE)
+
+
+def indexed_pages(index: Path) -> list[Path]:
+    """The page files listed in the page index *index*; none when it does not exist."""
+    try:
+        text = index.read_text()
+    except OSError:
+        return []
+    return [index.parent / name for name in _PAGE_LINK.findall(text)]
+
+
+class PagedMarkdownWriter(MatrixWriter):
+    """
+    The traceability table split into pages next to an index page.
+
+    Rows go to one page per requirement prefix (``SYS.md``, ``VER.md``, ...)
+    or, with *page_size*, to fixed-size pages (``page-0001.md``, ...). The
+    index written to *output* lists every page with its coverage. Pages are
+    only replaced when their content changes. Pages listed in the previous
+    index that are no longer produced are removed; other files next to the
+    index are left alone. A page that would take the index's file name is
+    written as ``<name>-page.md``.
+
+    Rows must arrive grouped by prefix, as `build_trace_matrix` sorts them.
+    """
+
+    def __init__(self, output: Path, page_size: int | None = None) -> None:
+
+        super().__init__(output)
+
+        if page_size is not None and page_size < 1:
+            raise ValueError(f"page_size must be positive, got {page_size}")
+
+        self.page_size = page_size
+        self.pages: dict[str, dict[str, Any]] = {}
+
+        self._rows = 0
+        self._page: TextIO | None = None
+        self._page_stack = ExitStack()
+        self._previous: list[Path] = []
+
+    def _page_name(self, record: dict[str, Any]) -> str:
+        if self.page_size is None:
+            return record["requirement_id"].split("-", 1)[0]
+        return f"page-{self._rows // self.page_size + 1:04d}"
+
+    def _page_file(self, name: str) -> str:
+        if f"{name}.md".casefold() == self.output.name.casefold():
+            return f"{name}-page.md"
+        return f"{name}.md"
+
+    def begin(self, f: TextIO) -> None:
+        self.pages = {}
+        self._rows = 0
+
+    def _open_page(self, name: str, first_id: str) -> None:
+
+        if name in self.pages:
+            raise ValueError(
+                f"Requirements with prefix {name} are not contiguous; sort the matrix by id"
+            )
+
+        self._page_stack.close()
+        page_file = self._page_file(name)
+        self._page = self._page_stack.enter_context(open_if_changed(self.output.parent / page_file))
+        self.pages[name] = {
+            "file": page_file, "first": first_id, "last": first_id, "total": 0, "counts": Counter()
+        }
+
+        self._page.write("<!-- AUTO-GENERATED FILE. DO NOT EDIT MANUALLY. -->\n\n")
+        self._page.write(f"# Requirements Traceability Matrix — {name}\n\n")
+        self._page.write(f"[Index]({self.output.name})\n\n")
+        self._page.write(
+            "| Requirement ID | Title | Linked Tests | Evidence Artifacts | Status |\n"
+        )
+        self._page.write(
+            "|----------------|-------------|--------------|--------------------|--------|\n"
+        )
+
+    def _close_page(self) -> None:
+
+        if self._page is None:
+            return
+
+        name = next(reversed(self.pages))
+        page = self.pages[name]
+        tested = page["total"] - page["counts"]["UNTESTED"]
+
+        self._page.write("\n\n---\n")
+        self._page.write(f"Total Requirements: {page['total']}\n\n")
+        self._page.write(f"Tested: {tested}\n\n")
+        self._page.write(f"Failures: {page['counts']['FAIL']}\n")
+
+        self._page_stack.close()
+        self._page = None
+
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+
+        name = self._page_name(record)
+
+        if not self.pages or next(reversed(self.pages)) != name:
+            self._close_page()
+            self._open_page(name, record["requirement_id"])
+
+        self._rows += 1
+
+        page = self.pages[name]
+        page["last"] = record["requirement_id"]
+        page["total"] += 1
+        page["counts"][record["status"]] += 1
+
+        self._page.write(
+            f"| {sanitize_cell(record['requirement_id'])} "
+            f"| {sanitize_cell(record['title'])} "
+            f"| {sanitize_cell(', '.join(record['tests']))} "
+            f"| {sanitize_cell(', '.join(record['evidence_files']))} "
+            f"| {sanitize_cell(record['status'])} |\n"
+        )
+
+    def end(self, f: TextIO) -> None:
+
+        self._close_page()
+
+        f.write("<!-- AUTO-GENERATED FILE. DO NOT EDIT MANUALLY. -->\n\n")
+        f.write("# Requirements Traceability Matrix\n\n")
+        f.write("| Page | Requirements | Range | Tested | Coverage | Failures |\n")
+        f.write("|------|--------------|-------|--------|----------|----------|\n")
+
+        total = tested = failed = 0
+
+        for name, page in self.pages.items():
+            page_tested = page["total"] - page["counts"]["UNTESTED"]
+            total += page["total"]
+            tested += page_tested
+            failed += page["counts"]["FAIL"]
+            f.write(
+                f"| [{name}]({page['file']}) "
+                f"| {page['total']} "
+                f"| {sanitize_cell(page['first'])} – {sanitize_cell(page['last'])} "
+                f"| {page_tested} "
+                f"| {page_tested / page['total'] * 100:.1f}% "
+                f"| {page['counts']['FAIL']} |\n"
+            )
 
         f.write("\n\n---\n")
         f.write(f"Total Requirements: {total}\n\n")
         f.write(f"Tested: {tested}\n\n")
         f.write(f"Failures: {failed}\n")
 
+    def __enter__(self) -> PagedMarkdownWriter:
+        # Read before the new index replaces it
+        self._previous = indexed_pages(self.output)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self._page_stack.__exit__(*exc_info)
+
+        if exc_info[0] is not None:
+            return
+
+        # Drop pages of a previous layout; only files the old index listed are ours
+        written = {page["file"] for page in self.pages.values()}
+        for path in self._previous:
+            if path.name not in written and path != self.output:
+                path.unlink(missing_ok=True)
+
+
+def page_writers(project_root: Path, pages: str | int | None) -> list[PagedMarkdownWriter]:
+    """Writers for the *pages* mode: None (off), ``"prefix"`` or a page size."""
+    if pages is None:
+        return []
+    if pages == "prefix":
+        return [PagedMarkdownWriter(pages_dir(project_root) / "index.md")]
+    return [PagedMarkdownWriter(pages_dir(project_root) / "index.md", page_size=int(pages))]
+
+
+def write_markdown(
+        matrix: TraceMatrix | list[dict[str, Any]],
+        output: Path,
+        req_coverage_summary: dict[str, Any] | None = None,
+        code_coverage_summary: dict[str, Any] | None = None,
+        forge_health: dict[str, Any] | None = None,
+        impact_summary: dict[str, Any] | None = None,
+        verification_cost: list[dict[str, Any]] | None = None,
+        requirement_code: dict[str, Any] | None = None,
+        coverage_delta: dict[str, Any] | None = None,
+    ) -> None:
+
+    write_matrix(
+        matrix,
+        [
+            MarkdownWriter(
+                output,
+                req_coverage_summary=req_coverage_summary,
+                code_coverage_summary=code_coverage_summary,
+                forge_health=forge_health,
+                impact_summary=impact_summary,
+                verification_cost=verification_cost,
+                requirement_code=requirement_code,
+                coverage_delta=coverage_delta,
+            )
+        ],
+    )
+
+
 def apply_test_markers(
-    matrix: list[dict[str, Any]], marker_links: dict[str, list[str]]
+    matrix: TraceMatrix | list[dict[str, Any]], marker_links: dict[str, list[str]]
 ) -> None:
 
+    if isinstance(matrix, TraceMatrix):
+        matrix.apply_markers(marker_links)
+        return
+
     for row in matrix:
 
         req_id = row["requirement_id"]
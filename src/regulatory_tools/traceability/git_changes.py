@@ -0,0 +1,44 @@
+"""Thin wrappers around local `git` used by incremental traceability runs."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+
+def _git(project_root: Path, *args: str) -> list[str]:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def git_head(project_root: Path) -> str | None:
+    """Return the commit checked out at *project_root*, or None outside a repo."""
+    try:
+        return _git(project_root, "rev-parse", "HEAD")[0]
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return None
+
+
+def git_changed_files(project_root: Path, since: str) -> set[str]:
+    """
+    Files changed in the working tree relative to *since*.
+
+    Includes committed, staged and unstaged changes as well as untracked
+    files. Paths are POSIX-style and relative to *project_root*.
+
+    Raises RuntimeError when git is unavailable or *since* cannot be resolved.
+    """
+    try:
+        changed = _git(project_root, "diff", "--name-only", "--relative", since, "--")
+        untracked = _git(project_root, "ls-files", "--others", "--exclude-standard")
+    except (OSError, subprocess.CalledProcessError) as exc:
+        detail = getattr(exc, "stderr", None) or exc
+        raise RuntimeError(f"git diff against '{since}' failed: {detail}") from exc
+
+    return set(changed) | set(untracked)
@@ -0,0 +1,166 @@
+"""Git-diff-scoped incremental traceability updates.
+
+`update_traceability_matrix_since` reuses the state stored by the last
+`generate_traceability_matrix` run, re-scans only the test files that changed
+since a git ref and patches the matrix rows whose marker links moved. Anything
+it cannot patch safely (no stored state, git failure, edited requirements
+catalog) falls back to a full regeneration.
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+
+from .coverage import compute_requirement_coverage
+from .coverage_history import coverage_delta
+from .evidence_loader import latest_evidence_run
+from .fingerprint import digest_test_files, file_digest, matrix_input_fingerprints, value_digest
+from .generator import MarkdownWriter, build_trace_matrix, page_writers
+from .git_changes import git_changed_files, git_head
+from .matrix import TraceMatrix
+from .pipeline import generate_traceability_matrix, output_digests
+from .query import save_matrix_index
+from .requirement_code import load_requirement_code_map, requirement_code_path
+from .state import load_state, save_state
+from .test_scanner import merge_marker_scans, rescan_test_files
+from .verification_cost import (
+    compute_verification_cost,
+    load_test_timings,
+    recorded_timings_path,
+    save_verification_cost,
+)
+from .writers import output_writers, write_matrix
+
+REQUIREMENTS_YAML = "docs/requirements.yaml"
+
+
+def _is_test_file(rel_path: str) -> bool:
+    path = PurePosixPath(rel_path)
+    return path.parts[:1] == ("tests",) and fnmatch(path.name, "test_*.py")
+
+
+def update_traceability_matrix_since(project_root: Path, since: str):
+    """
+    Regenerate the traceability outputs for changes made since *since*.
+
+    The outputs are written in the formats and pages of the last full run.
+    Returns the forge summary stored by that run (forge is not re-run
+    incrementally), matching the return value of
+    `generate_traceability_matrix`.
+    """
+
+    state = load_state(project_root)
+
+    if state is None:
+        print("[traceability] No stored traceability state — running full regeneration.")
+        return generate_traceability_matrix(project_root)
+
+    formats = tuple(state["formats"])
+    pages = state.get("pages")
+
+    try:
+        changed = git_changed_files(project_root, since)
+        # The stored scan reflects the tree at the last run, which may predate *since*
+        if state.get("head"):
+            changed |= git_changed_files(project_root, state["head"])
+    except RuntimeError as exc:
+        print(f"[traceability] {exc} — running full regeneration.")
+        return generate_traceability_matrix(project_root, formats=formats, pages=pages)
+
+    if REQUIREMENTS_YAML in changed:
+        print("[traceability] Requirements catalog changed — running full regeneration.")
+        return generate_traceability_matrix(project_root, formats=formats, pages=pages)
+
+    evidence_root = project_root / "artifacts" / "evidence_runs"
+    latest_run = latest_evidence_run(evidence_root)
+    latest_name = latest_run.name if latest_run else None
+
+    affected: set[str] = set()
+
+    if latest_name == state.get("evidence_run"):
+        base_matrix = TraceMatrix.from_rows(state["base_matrix"])
+        matrix = TraceMatrix.from_rows(state["matrix"])
+    else:
+        # A new evidence run invalidates every evidence-backed status
+        base_matrix = build_trace_matrix(
+            requirements_yaml=project_root / REQUIREMENTS_YAML,
+            evidence_root=evidence_root,
+        )
+        matrix = base_matrix.copy()
+        affected.update(base_matrix.ids)
+
+    marker_scan = state["marker_scan"]
+    changed_tests = sorted(p for p in changed if _is_test_file(p))
+
+    affected |= rescan_test_files(project_root, marker_scan, changed_tests)
+
+    marker_links = merge_marker_scans(marker_scan)
+    patched = matrix.patch(base_matrix, marker_links, affected)
+
+    print(
+        f"[traceability] Incremental update since {since}: "
+        f"{len(changed_tests)} changed test file(s), {len(patched)} row(s) patched."
+    )
+
+    coverage, tested, total, untested = compute_requirement_coverage(matrix)
+    forge_summary = state.get("forge_summary")
+
+    verification_cost = compute_verification_cost(
+        load_test_timings(recorded_timings_path(project_root)), marker_links
+    )
+    save_verification_cost(project_root, verification_cost)
+
+    markdown = MarkdownWriter(
+        project_root / "docs" / "traceability_matrix.md",
+        req_coverage_summary={
+            "coverage": coverage,
+            "tested": tested,
+            "total": total,
+            "untested": untested,
+        },
+        code_coverage_summary={
+            "coverage": state.get("code_coverage")
+        },
+        forge_health=forge_summary,
+        verification_cost=verification_cost,
+        requirement_code=load_requirement_code_map(project_root),
+        coverage_delta=coverage_delta(project_root),
+    )
+
+    # Keep the other matrix formats in step with the markdown
+    write_matrix(
+        matrix,
+        [markdown, *output_writers(project_root, formats), *page_writers(project_root, pages)],
+    )
+
+    test_files = digest_test_files(project_root / "tests", project_root)
+    matrix_inputs = matrix_input_fingerprints(project_root, test_files)
+
+    save_matrix_index(project_root, matrix, matrix_inputs)
+
+    save_state(
+        project_root,
+        {
+            **state,
+            "head": git_head(project_root),
+            "evidence_run": latest_name,
+            "marker_scan": marker_scan,
+            "base_matrix": base_matrix.to_rows(),
+            "matrix": matrix.to_rows(),
+            "verification_cost": verification_cost,
+            "test_files": test_files,
+            # Only the inputs read here are brought up to date; coverage and
+            # forge keep theirs, so the next full run still recomputes them
+            "fingerprints": {
+                **state["fingerprints"],
+                **matrix_inputs,
+                "timings": file_digest(recorded_timings_path(project_root)),
+                "requirement_code": file_digest(requirement_code_path(project_root)),
+                "impact": value_digest(None),
+            },
+            "outputs": output_digests(project_root, formats, pages),
+        },
+    )
+
+    return forge_summary
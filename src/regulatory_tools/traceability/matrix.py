@@ -0,0 +1,192 @@
+"""Columnar traceability matrix.
+
+One list per column instead of one dict per requirement: ids, titles, test
+and evidence file names are interned, linked tests and evidence files are
+kept as sets (joined into the rendered ``"a, b"`` strings only on output) and
+statuses are one byte per row, so status counts are a single pass over a
+bytearray.
+
+`TraceMatrix` is also a read-only sequence of the row dicts the matrix used to
+be, and `to_rows()` returns them as a plain list, so callers and stored state
+that expect ``list[dict]`` keep working.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+STATUSES = ("UNTESTED", "LINKED", "PASS", "FAIL")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+UNTESTED = STATUS_CODES["UNTESTED"]
+LINKED = STATUS_CODES["LINKED"]
+
+
+def _split(cell: str | Iterable[str]) -> set[str]:
+    if isinstance(cell, str):
+        return {sys.intern(t.strip()) for t in cell.split(",") if t.strip()}
+    return {sys.intern(t) for t in cell if t}
+
+
+class TraceMatrix(Sequence):
+
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+        self.titles: list[str] = []
+        self.tests: list[set[str]] = []
+        self.evidence_files: list[set[str]] = []
+        self.status = bytearray()
+        self._positions: dict[str, int] = {}
+
+    def append(
+        self,
+        requirement_id: str,
+        title: str = "",
+        tests: str | Iterable[str] = (),
+        evidence_files: str | Iterable[str] = (),
+        status: str = "UNTESTED",
+    ) -> None:
+        requirement_id = sys.intern(requirement_id)
+        self._positions[requirement_id] = len(self.ids)
+        self.ids.append(requirement_id)
+        self.titles.append(title)
+        self.tests.append(_split(tests))
+        self.evidence_files.append(_split(evidence_files))
+        self.status.append(STATUS_CODES[status])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict[str, Any]]) -> TraceMatrix:
+        matrix = cls()
+        for row in rows:
+            matrix.append(
+                row["requirement_id"],
+                row.get("title", ""),
+                row.get("tests", ""),
+                row.get("evidence_files", ""),
+                row.get("status", "UNTESTED"),
+            )
+        return matrix
+
+    def copy(self) -> TraceMatrix:
+        matrix = TraceMatrix()
+        matrix.ids = list(self.ids)
+        matrix.titles = list(self.titles)
+        matrix.tests = [set(t) for t in self.tests]
+        matrix.evidence_files = [set(e) for e in self.evidence_files]
+        matrix.status = bytearray(self.status)
+        matrix._positions = dict(self._positions)
+        return matrix
+
+    def position(self, requirement_id: str) -> int | None:
+        return self._positions.get(requirement_id)
+
+    # ---------------------------------------------------------
+    # Row views
+    # ---------------------------------------------------------
+
+    def row(self, i: int) -> dict[str, Any]:
+        return {
+            "requirement_id": self.ids[i],
+            "title": self.titles[i],
+            "tests": ", ".join(sorted(self.tests[i])),
+            "evidence_files": ", ".join(sorted(self.evidence_files[i])),
+            "status": STATUSES[self.status[i]],
+        }
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        """Rows with ``tests`` and ``evidence_files`` as sorted lists, for output writers."""
+        for i in range(len(self.ids)):
+            yield {
+                "requirement_id": self.ids[i],
+                "title": self.titles[i],
+                "tests": sorted(self.tests[i]),
+                "evidence_files": sorted(self.evidence_files[i]),
+                "status": STATUSES[self.status[i]],
+            }
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        return [self.row(i) for i in range(len(self.ids))]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.row(j) for j in range(*i.indices(len(self.ids)))]
+        if i < 0:
+            i += len(self.ids)
+        if not 0 <= i < len(self.ids):
+            raise IndexError("TraceMatrix index out of range")
+        return self.row(i)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self.row(i) for i in range(len(self.ids)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TraceMatrix):
+            return (
+                self.ids == other.ids
+                and self.titles == other.titles
+                and self.tests == other.tests
+                and self.evidence_files == other.evidence_files
+                and self.status == other.status
+            )
+        if isinstance(other, list):
+            return self.to_rows() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TraceMatrix({len(self.ids)} requirements)"
+
+    # ---------------------------------------------------------
+    # Column operations
+    # ---------------------------------------------------------
+
+    def apply_markers(self, marker_links: dict[str, list[str]]) -> None:
+        """Link marked tests; rows without evidence become LINKED."""
+        for requirement_id, node_ids in marker_links.items():
+            i = self._positions.get(requirement_id)
+            if i is None or not node_ids:
+                continue
+            self.tests[i].update(sys.intern(n) for n in node_ids)
+            if self.status[i] == UNTESTED:
+                self.status[i] = LINKED
+
+    def reset_row(self, requirement_id: str, base: TraceMatrix) -> None:
+        """Replace a row with its (evidence-only) version from *base*."""
+        i = self._positions[requirement_id]
+        j = base._positions[requirement_id]
+        self.titles[i] = base.titles[j]
+        self.tests[i] = set(base.tests[j])
+        self.evidence_files[i] = set(base.evidence_files[j])
+        self.status[i] = base.status[j]
+
+    def patch(
+        self,
+        base: TraceMatrix,
+        marker_links: dict[str, list[str]],
+        requirement_ids: Iterable[str],
+    ) -> list[str]:
+        """
+        Rebuild the rows of *requirement_ids* from *base* plus their markers.
+
+        Returns the ids of the rows that were patched.
+        """
+        wanted = set(requirement_ids)
+        patched = [req_id for req_id in self.ids if req_id in wanted]
+        for req_id in patched:
+            self.reset_row(req_id, base)
+        self.apply_markers({req_id: marker_links.get(req_id, []) for req_id in patched})
+        return patched
+
+    def status_counts(self) -> dict[str, int]:
+        counts = Counter(self.status)
+        return {status: counts[code] for code, status in enumerate(STATUSES)}
+
+    def untested(self) -> list[str]:
+        return [self.ids[i] for i, code in enumerate(self.status) if code == UNTESTED]
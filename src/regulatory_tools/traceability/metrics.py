@@ -0,0 +1,138 @@
+"""OpenMetrics textfile export of verification and pipeline metrics.
+
+`write_metrics_textfile` renders the state of the last traceability run
+(requirement and code coverage, requirements per status, forge scores,
+evidence and verification cost) plus the per-stage durations of a
+`PipelineProfile` as gauges, for node-exporter's textfile collector or any
+other OpenMetrics scraper. Every sample carries a ``project`` label so files
+from several projects can be collected side by side.
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Any
+
+from .evidence_loader import latest_evidence_run
+from .fingerprint import write_if_changed
+from .matrix import STATUSES
+from .state import load_state
+
+PREFIX = "regulatory_tools"
+
+
+def metrics_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "metrics" / f"{PREFIX}.prom"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metrics:
+
+    def __init__(self, project: str) -> None:
+        self.project = project
+        self.families: dict[str, tuple[str, list[tuple[dict[str, str], float]]]] = {}
+
+    def add(self, name: str, help_text: str, value: float | None, **labels: str) -> None:
+        if value is None:
+            return
+        _, samples = self.families.setdefault(f"{PREFIX}_{name}", (help_text, []))
+        samples.append(({"project": self.project, **labels}, value))
+
+    def render(self) -> str:
+        lines = []
+        for name, (help_text, samples) in self.families.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"# HELP {name} {help_text}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def collect_metrics(project_root: Path, profile=None) -> str:
+    """OpenMetrics text for *project_root*; *profile* adds per-stage durations."""
+
+    metrics = _Metrics(project_root.resolve().name)
+    state: dict[str, Any] = load_state(project_root) or {}
+
+    rows = state.get("matrix", [])
+    counts = dict.fromkeys(STATUSES, 0)
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+
+    if rows:
+        metrics.add(
+            "requirement_coverage_ratio",
+            "Fraction of requirements with linked tests or evidence.",
+            (len(rows) - counts["UNTESTED"]) / len(rows),
+        )
+    for status, count in counts.items():
+        metrics.add("requirements", "Requirements per traceability status.", count, status=status)
+
+    code_coverage = state.get("code_coverage")
+    metrics.add(
+        "code_coverage_ratio",
+        "Line coverage of the project's source package.",
+        code_coverage / 100 if code_coverage is not None else None,
+    )
+
+    evidence_run = latest_evidence_run(project_root / "artifacts" / "evidence_runs")
+    metrics.add(
+        "evidence_records",
+        "Evidence records in the latest evidence run.",
+        len(list(evidence_run.glob("*.json"))) if evidence_run else 0,
+    )
+
+    for row in state.get("verification_cost") or []:
+        metrics.add(
+            "verification_cost_seconds",
+            "Summed durations of the tests linked to the requirement.",
+            row["total"],
+            requirement=row["requirement_id"],
+        )
+
+    forge = state.get("forge_summary")
+    if forge:
+        metrics.add("forge_score", "Overall forge health score (0-1).", forge.get("overall_score"))
+        for collector, data in forge.get("collectors", {}).items():
+            if not data.get("skipped"):
+                metrics.add(
+                    "forge_collector_score",
+                    "Score of each forge collector (0-1).",
+                    data.get("score"),
+                    collector=collector,
+                )
+
+    if profile is not None:
+        for stage, seconds in profile.durations().items():
+            metrics.add(
+                "pipeline_stage_duration_seconds",
+                "Wall time of each pipeline stage in the last run.",
+                seconds,
+                stage=stage,
+            )
+
+    return metrics.render()
+
+
+def write_metrics_textfile(project_root: Path, profile=None, path: Path | None = None) -> Path:
+    """
+    Atomically write the metrics of the last run to *path* (by default
+    ``artifacts/metrics/regulatory_tools.prom``), so scrapers never see a
+    partial file.
+    """
+    path = path or metrics_path(project_root)
+    write_if_changed(path, collect_metrics(project_root, profile))
+    print(f"[metrics] OpenMetrics textfile saved to {path}")
+    return path
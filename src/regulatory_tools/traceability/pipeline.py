@@ -1,56 +1,310 @@
+from __future__ import annotations
 
-from .coverage import compute_code_coverage, compute_requirement_coverage, save_uncovered_lines
-from .generator import apply_test_markers, build_trace_matrix, write_markdown
-from .test_scanner import collect_requirement_markers
+from pathlib import Path
 
+from .coverage import (
+    compute_code_coverage,
+    compute_requirement_coverage,
+    coverage_data_path,
+    coverage_xml_path,
+    load_coverage_data,
+    save_uncovered_lines,
+    uncovered_lines_json_path,
+)
+from .coverage_history import coverage_delta, record_coverage_snapshot
+from .evidence_loader import latest_evidence_run
+from .fingerprint import (
+    digest_test_files,
+    file_digest,
+    matrix_input_fingerprints,
+    stat_digest,
+    value_digest,
+)
+from .generator import (
+    MarkdownWriter,
+    apply_test_markers,
+    build_trace_matrix,
+    indexed_pages,
+    load_requirements,
+    page_writers,
+    pages_dir,
+)
+from .git_changes import git_head
+from .matrix import TraceMatrix
+from .profiling import measure
+from .query import query_index_path, save_matrix_index
+from .requirement_code import load_requirement_code_map, requirement_code_path
+from .stages import Stage, run_stages
+from .state import load_state, save_state
+from .test_scanner import merge_marker_scans, rescan_test_files, scan_test_markers
+from .verification_cost import (
+    compute_verification_cost,
+    load_test_timings,
+    recorded_timings_path,
+    save_verification_cost,
+)
+from .writers import output_writers, write_matrix
 
-def generate_traceability_matrix(project_root):
+# Sections recomputed when one of these inputs changed
+_ROW_INPUTS = {"requirements", "evidence"}
+_COST_INPUTS = {"tests", "timings"}
+_COVERAGE_INPUTS = {"coverage", "source", "requirements", "tests", "forge"}
+
+# Stages that do not depend on test results, see `prepare_traceability`
+_PREPARED_STAGES = ("requirements", "marker_scan", "marker_links")
+
+_PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _input_fingerprints(
+    project_root: Path,
+    test_files: dict[str, str],
+    impact_report,
+    formats: tuple[str, ...],
+    pages: str | int | None,
+    forge_collectors: list[str] | None = None,
+) -> dict:
+
+    src = project_root / "src"
+
+    forge_settings = None
+    try:
+        from ..quality.forge_integration import _try_import_forge, forge_collector_settings
+        forge_installed = _try_import_forge()
+        if forge_installed:
+            forge_settings = forge_collector_settings(project_root, forge_collectors)
+    except ImportError:
+        forge_installed = False
+    except ValueError:
+        # Unknown collector names; get_forge_summary reports them when code health is computed
+        pass
+
+    return {
+        **matrix_input_fingerprints(project_root, test_files),
+        "coverage": value_digest(
+            [file_digest(coverage_data_path(project_root)), file_digest(coverage_xml_path(project_root))]
+        ),
+        "timings": file_digest(recorded_timings_path(project_root)),
+        "requirement_code": file_digest(requirement_code_path(project_root)),
+        "impact": value_digest(impact_report),
+        # What forge and the coverage analysis read besides the coverage data
+        "source": value_digest(
+            [stat_digest(src.rglob("*.py"), src) if src.exists() else None, forge_installed]
+        ),
+        # Selected forge collectors and their budgets
+        "forge": value_digest(forge_settings),
+        "tooling": _tooling_fingerprint(),
+        "formats": value_digest([sorted(formats), pages]),
+    }
+
+
+def _tooling_fingerprint() -> str:
+    return stat_digest(_PACKAGE_ROOT.rglob("*.py"), _PACKAGE_ROOT)
+
+
+def _can_reuse(state: dict | None, tooling: str) -> bool:
+    # Stored results are only reusable if they were produced by this code
+    return (
+        state is not None
+        and "fingerprints" in state
+        and state["fingerprints"].get("tooling") == tooling
+    )
+
+
+def prepare_traceability(
+    project_root: Path,
+    workers: int | None = None,
+    profile=None,
+    catalog_cache=None,
+    forge_collectors=None,
+) -> dict:
+    """
+    Run the stages that do not depend on test results (requirements catalog,
+    test marker scan) ahead of time, e.g. while pytest is running, and start
+    the forge collectors that do not read coverage (see
+    `forge_integration.start_forge_collectors`).
+
+    Pass the result as ``prepared`` to `generate_traceability_matrix`, which
+    uses it unless the test files or the stored state changed in between.
+    """
+
+    if profile is not None and profile.detailed:
+        workers = 1
+
+    with measure(profile, "prepare_fingerprints") as record:
+        state = load_state(project_root)
+        test_files = digest_test_files(project_root / "tests", project_root)
+        reuse = _can_reuse(state, _tooling_fingerprint())
+        record["counts"]["files"] = len(test_files)
+
+    # Assume the rows have to be rebuilt, so the catalog is always parsed
+    stages = [
+        stage
+        for stage in _pipeline_stages(
+            project_root, state, test_files, set(_ROW_INPUTS), reuse, catalog_cache
+        )
+        if stage.name in _PREPARED_STAGES
+    ]
+    values = run_stages(stages, max_workers=workers, profile=profile)
+
+    forge_jobs = None
+    try:
+        from ..quality.forge_integration import start_forge_collectors
+        forge_jobs = start_forge_collectors(project_root, forge_collectors)
+    except ImportError:
+        pass
+
+    return {
+        "reuse": reuse,
+        "test_files": test_files,
+        "forge_jobs": forge_jobs,
+        **{name: values[name] for name in _PREPARED_STAGES},
+    }
+
+
+def _output_paths(project_root: Path, formats: tuple[str, ...], pages: str | int | None) -> list[Path]:
+    paths = [
+        project_root / "docs" / "traceability_matrix.md",
+        project_root / "artifacts" / "coverage" / "uncovered_lines.txt",
+        uncovered_lines_json_path(project_root),
+        query_index_path(project_root),
+        *(writer.output for writer in output_writers(project_root, formats)),
+    ]
+    if pages is not None:
+        index = pages_dir(project_root) / "index.md"
+        paths += [index, *indexed_pages(index)]
+    return paths
+
+
+def output_digests(
+    project_root: Path,
+    formats: tuple[str, ...],
+    pages: str | int | None,
+) -> dict[str, str | None]:
+    """Digests of the files written for *formats* and *pages*, stored as ``state["outputs"]``."""
+    return {
+        path.relative_to(project_root).as_posix(): file_digest(path)
+        for path in _output_paths(project_root, formats, pages)
+    }
+
+
+def generate_traceability_matrix(
+    project_root,
+    impact_report=None,
+    formats=(),
+    pages=None,
+    workers=None,
+    prepared=None,
+    profile=None,
+    catalog_cache=None,
+    forge_collectors=None,
+):
+    """
+    Regenerate the traceability matrix and its coverage artifacts.
+
+    Every input is fingerprinted and compared with the previous run: when
+    nothing changed this returns immediately without touching any file;
+    otherwise only the affected rows and sections are recomputed, and output
+    files are only rewritten when their bytes change.
+
+    The matrix is written to ``docs/traceability_matrix.md`` and, in the same
+    pass over the rows, in each of the opt-in *formats* (keys of
+    `writers.FORMATS`) to ``artifacts/traceability/``.
+
+    With *pages* (``"prefix"`` or a page size) the table is also split into
+    pages under ``docs/traceability/`` with an index page of per-page
+    coverage; only pages whose rows changed are rewritten.
+
+    The work is split into stages (see `_pipeline_stages`) that run on a
+    thread pool of *workers* threads as soon as their inputs are ready;
+    ``workers=1`` runs them one after another with identical results.
+    Stages already run by `prepare_traceability` are taken from *prepared*,
+    and forge waits for the collectors it started.
+
+    With a *profile* (`profiling.PipelineProfile`) every stage is timed; a
+    detailed profile runs the stages serially. A *catalog_cache*
+    (`catalog_cache.CatalogCache`) shares parsed requirement catalogs
+    between projects.
+
+    *forge_collectors* overrides the forge collectors configured in the
+    project's pyproject.toml (see `forge_integration.forge_collector_settings`).
+    """
+
+    formats = tuple(formats)
 
     (project_root / "artifacts").mkdir(exist_ok=True)
     (project_root / "artifacts" / "evidence_runs").mkdir(exist_ok=True)
     (project_root / "artifacts" / "coverage").mkdir(exist_ok=True)
 
     test_dir = project_root / "tests"
-    requirements_yaml = project_root / "docs" / "requirements.yaml"
     evidence_root = project_root / "artifacts" / "evidence_runs"
     output = project_root / "docs" / "traceability_matrix.md"
 
-    marker_links = collect_requirement_markers(test_dir, project_root)
+    if profile is not None and profile.detailed:
+        workers = 1
 
-    matrix = build_trace_matrix(
-        requirements_yaml=requirements_yaml,
-        evidence_root=evidence_root,
-    )
+    forge_jobs = prepared.get("forge_jobs") if prepared is not None else None
 
-    apply_test_markers(matrix, marker_links)
+    with measure(profile, "fingerprints") as record:
+        state = load_state(project_root)
 
-    coverage, tested, total, untested = compute_requirement_coverage(matrix)
+        test_files = digest_test_files(test_dir, project_root)
+        fingerprints = _input_fingerprints(
+            project_root, test_files, impact_report, formats, pages, forge_collectors
+        )
+        unchanged = (
+            state is not None
+            and state.get("fingerprints") == fingerprints
+            and state.get("outputs") == output_digests(project_root, formats, pages)
+        )
+        record["counts"]["files"] = len(test_files)
 
-    # Attempt forge health check (reads existing coverage.xml — does not re-run tests)
-    forge_summary = None
-    code_coverage = None
-    uncovered: dict = {}
+    if unchanged:
+        print("[traceability] No inputs changed — traceability outputs are up to date.")
+        _cancel_forge_jobs(forge_jobs)
+        return state.get("forge_summary")
 
-    try:
-        from ..quality.forge_integration import forge_health_as_dict, get_forge_health
-        forge_report = get_forge_health(project_root)
-        if forge_report is not None:
-            forge_summary = forge_health_as_dict(forge_report)
-            tm = forge_report.test_metrics
-            if not tm.skipped and tm.line_coverage is not None:
-                code_coverage = tm.line_coverage
-    except ImportError:
-        pass
+    previous = (state or {}).get("fingerprints", {})
+    changed = {key for key, value in fingerprints.items() if previous.get(key) != value}
 
-    # Fall back to standalone coverage parsing when forge is unavailable or
-    # when forge's test_metrics couldn't read a coverage report
-    if code_coverage is None:
-        code_coverage, uncovered = compute_code_coverage(project_root)
+    reuse = _can_reuse(state, fingerprints["tooling"])
 
-    save_uncovered_lines(project_root, uncovered)
+    seed = {}
+    if (
+        prepared is not None
+        and prepared["reuse"] == reuse
+        and prepared["test_files"] == test_files
+    ):
+        seed = {name: prepared[name] for name in _PREPARED_STAGES}
+
+    try:
+        results = run_stages(
+            _pipeline_stages(
+                project_root,
+                state,
+                test_files,
+                changed,
+                reuse,
+                catalog_cache,
+                forge_collectors,
+                forge_jobs,
+            ),
+            seed,
+            max_workers=workers,
+            profile=profile,
+        )
+    finally:
+        # Jobs forge did not wait for, e.g. when code health was reused
+        _cancel_forge_jobs(forge_jobs)
+
+    marker_scan = results["marker_scan"][0]
+    base_matrix = results["base_matrix"]
+    matrix = results["matrix"]
+    coverage, tested, total, untested = results["requirement_coverage"]
+    verification_cost = results["verification_cost"]
+    code_coverage, forge_summary = results["code_health"]
 
-    write_markdown(
-        matrix,
+    markdown = MarkdownWriter(
         output,
         req_coverage_summary={
             "coverage": coverage,
@@ -62,6 +316,207 @@ def generate_traceability_matrix(project_root):
             "coverage": code_coverage
         },
         forge_health=forge_summary,
+        impact_summary=impact_report,
+        verification_cost=verification_cost,
+        requirement_code=results["requirement_code"],
+        coverage_delta=results["coverage_delta"],
     )
 
+    writers = [markdown, *output_writers(project_root, formats), *page_writers(project_root, pages)]
+
+    with measure(profile, "write_outputs") as record:
+        write_matrix(matrix, writers)
+
+        save_matrix_index(
+            project_root,
+            matrix,
+            {key: fingerprints[key] for key in ("requirements", "tests", "evidence")},
+        )
+        record["counts"].update(records=len(matrix), files=len(writers) + 1)
+
+    with measure(profile, "save_state"):
+        latest_run = latest_evidence_run(evidence_root)
+
+        save_state(
+            project_root,
+            {
+                "head": git_head(project_root),
+                "evidence_run": latest_run.name if latest_run else None,
+                "marker_scan": marker_scan,
+                "base_matrix": base_matrix.to_rows(),
+                "matrix": matrix.to_rows(),
+                "code_coverage": code_coverage,
+                "forge_summary": forge_summary,
+                "verification_cost": verification_cost,
+                "test_files": test_files,
+                "fingerprints": fingerprints,
+                "formats": list(formats),
+                "pages": pages,
+                "outputs": output_digests(project_root, formats, pages),
+            },
+        )
+
     return forge_summary
+
+
+def _pipeline_stages(
+    project_root: Path,
+    state: dict | None,
+    test_files: dict[str, str],
+    changed: set[str],
+    reuse: bool,
+    catalog_cache=None,
+    forge_collectors: list[str] | None = None,
+    forge_jobs: dict | None = None,
+) -> list[Stage]:
+    """
+    The stages of a (re)generation, dependencies first.
+
+    The catalog, evidence loading, marker scanning, the forge/coverage
+    analysis and the requirement code map are independent of each other; the
+    matrix waits for the evidence rows and the markers, the coverage delta
+    for the new coverage snapshot.
+    """
+
+    test_dir = project_root / "tests"
+
+    def scan_markers():
+        if not reuse:
+            return scan_test_markers(test_dir, project_root), None
+        marker_scan = state["marker_scan"]
+        stored_files = state.get("test_files", {})
+        changed_tests = sorted(
+            rel_path
+            for rel_path in stored_files.keys() | test_files.keys()
+            if stored_files.get(rel_path) != test_files.get(rel_path)
+        )
+        return marker_scan, rescan_test_files(project_root, marker_scan, changed_tests)
+
+    def link_markers(marker_scan):
+        return merge_marker_scans(marker_scan[0])
+
+    requirements_yaml = project_root / "docs" / "requirements.yaml"
+
+    def parse_requirements():
+        if reuse and not changed & _ROW_INPUTS:
+            return None
+        if catalog_cache is not None:
+            return catalog_cache.load(requirements_yaml)
+        return load_requirements(requirements_yaml)
+
+    def load_base_matrix(requirements):
+        if reuse and not changed & _ROW_INPUTS:
+            return TraceMatrix.from_rows(state["base_matrix"])
+        # Evidence-only rows, kept so incremental runs can re-apply markers per row
+        return build_trace_matrix(
+            requirements_yaml=requirements_yaml,
+            evidence_root=project_root / "artifacts" / "evidence_runs",
+            requirements=requirements,
+        )
+
+    def link_matrix(base_matrix, marker_scan, marker_links):
+        if reuse and not changed & _ROW_INPUTS:
+            matrix = TraceMatrix.from_rows(state["matrix"])
+            patched = matrix.patch(base_matrix, marker_links, marker_scan[1])
+            print(
+                f"[traceability] Inputs changed: {', '.join(sorted(changed))} — "
+                f"{len(patched)} row(s) patched."
+            )
+            return matrix
+        matrix = base_matrix.copy()
+        apply_test_markers(matrix, marker_links)
+        return matrix
+
+    def verification_cost(marker_links):
+        if reuse and not changed & _COST_INPUTS:
+            return state["verification_cost"]
+        cost = compute_verification_cost(load_test_timings(recorded_timings_path(project_root)), marker_links)
+        save_verification_cost(project_root, cost)
+        return cost
+
+    def code_health():
+        if reuse and not changed & _COVERAGE_INPUTS:
+            return state["code_coverage"], state["forge_summary"]
+        return _compute_code_health(project_root, forge_collectors, forge_jobs)
+
+    return [
+        Stage("marker_scan", scan_markers, counts=lambda scan: {"files": len(scan[0])}),
+        Stage(
+            "marker_links",
+            link_markers,
+            ["marker_scan"],
+            counts=lambda links: {"records": sum(map(len, links.values()))},
+        ),
+        Stage(
+            "requirements",
+            parse_requirements,
+            counts=lambda catalog: {"records": len(catalog)} if catalog is not None else {},
+        ),
+        Stage(
+            "base_matrix",
+            load_base_matrix,
+            ["requirements"],
+            counts=lambda base: {
+                "records": len(base),
+                "files": sum(map(len, base.evidence_files)),
+            },
+        ),
+        Stage(
+            "matrix",
+            link_matrix,
+            ["base_matrix", "marker_scan", "marker_links"],
+            counts=lambda matrix: {"records": len(matrix)},
+        ),
+        Stage("requirement_coverage", compute_requirement_coverage, ["matrix"]),
+        Stage(
+            "verification_cost",
+            verification_cost,
+            ["marker_links"],
+            counts=lambda cost: {"records": len(cost)},
+        ),
+        Stage("code_health", code_health),
+        Stage("requirement_code", lambda: load_requirement_code_map(project_root)),
+        # Needs the snapshot code_health records from the new coverage data
+        Stage("coverage_delta", lambda code_health: coverage_delta(project_root), ["code_health"]),
+    ]
+
+
+def _cancel_forge_jobs(forge_jobs: dict | None) -> None:
+    if forge_jobs:
+        from ..quality.forge_integration import cancel_forge_collectors
+        cancel_forge_collectors(forge_jobs)
+
+
+def _compute_code_health(
+    project_root: Path, forge_collectors: list[str] | None = None, forge_jobs: dict | None = None
+):
+    """Run forge (when installed) and the coverage analysis; returns (code_coverage, forge_summary)."""
+
+    # Attempt forge health check (reads existing coverage.xml — does not re-run tests)
+    forge_summary = None
+    code_coverage = None
+    uncovered: dict = {}
+
+    coverage_data = load_coverage_data(project_root)
+
+    try:
+        from ..quality.forge_integration import get_forge_summary
+        forge_summary = get_forge_summary(project_root, forge_collectors, forge_jobs)
+        if forge_summary is not None:
+            tm = forge_summary["collectors"].get("test_metrics", {})
+            if not tm.get("skipped") and tm.get("line_coverage") is not None:
+                code_coverage = tm["line_coverage"]
+    except ImportError:
+        pass
+
+    # Fall back to standalone coverage parsing when forge is unavailable or
+    # when forge's test_metrics couldn't read a coverage report
+    if code_coverage is None:
+        code_coverage, uncovered = compute_code_coverage(project_root, coverage_data)
+
+    save_uncovered_lines(project_root, uncovered)
+
+    if coverage_data is not None:
+        record_coverage_snapshot(project_root, coverage_data)
+
+    return code_coverage, forge_summary
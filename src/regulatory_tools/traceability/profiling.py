@@ -0,0 +1,128 @@
+"""Per-stage instrumentation for the traceability pipeline.
+
+`PipelineProfile.stage` measures a block of work: wall and CPU time always,
+and with ``detailed=True`` (``--profile``) also the tracemalloc peak and a
+cProfile dump per stage. Stages can attach record/file counts. `report`
+writes ``artifacts/profile/timings.json`` next to the ``<stage>.pstats``
+dumps and prints a summary table.
+
+CPU time is the thread's own, so stages running concurrently on the stage
+pool are measured separately. tracemalloc's peak is process-wide, so the
+pipeline runs its stages serially while a detailed profile is taken.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+from .fingerprint import write_if_changed
+
+
+def profile_dir(project_root: Path) -> Path:
+    return project_root / "artifacts" / "profile"
+
+
+def measure(profile: PipelineProfile | None, name: str) -> AbstractContextManager[dict[str, Any]]:
+    """``profile.stage(name)``, or a no-op block when not profiling."""
+    if profile is None:
+        return nullcontext({"counts": {}})
+    return profile.stage(name)
+
+
+class PipelineProfile:
+
+    def __init__(self, project_root: Path, detailed: bool = False) -> None:
+        self.project_root = project_root
+        self.detailed = detailed
+        self.stages: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        if detailed:
+            profile_dir(project_root).mkdir(parents=True, exist_ok=True)
+            for dump in profile_dir(project_root).glob("*.pstats"):
+                dump.unlink()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, Any]]:
+        """
+        Measure the enclosed block as stage *name*.
+
+        Yields the stage's record; set ``record["counts"]`` entries (e.g.
+        ``records``, ``files``) to report how much work it did.
+        """
+
+        record: dict[str, Any] = {"stage": name, "counts": {}}
+
+        profiler = None
+        if self.detailed:
+            import cProfile
+            import tracemalloc
+
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+
+        try:
+            yield record
+        finally:
+            record["wall"] = time.perf_counter() - wall
+            record["cpu"] = time.thread_time() - cpu
+
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_dir(self.project_root) / f"{name}.pstats")
+                record["peak_memory"] = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+
+            with self._lock:
+                self.stages.append(record)
+
+    def run(self, name: str, func: Callable[[], Any], counts: Callable[[Any], dict] | None = None) -> Any:
+        """Call *func* as stage *name*; *counts* derives the stage's counts from its result."""
+        with self.stage(name) as record:
+            result = func()
+            if counts is not None:
+                record["counts"].update(counts(result))
+        return result
+
+    def durations(self) -> dict[str, float]:
+        """Wall time per stage name (summed when a stage ran more than once)."""
+        totals: dict[str, float] = {}
+        for record in self.stages:
+            totals[record["stage"]] = totals.get(record["stage"], 0.0) + record["wall"]
+        return totals
+
+    def report(self) -> Path:
+        """Write the JSON timing report and print the per-stage summary table."""
+
+        path = profile_dir(self.project_root) / "timings.json"
+        write_if_changed(
+            path,
+            json.dumps({"detailed": self.detailed, "stages": self.stages}, indent=2, sort_keys=True),
+        )
+
+        print("[profile] Stage                      Wall (s)   CPU (s)   Peak (MiB)  Counts")
+        for record in self.stages:
+            peak = record.get("peak_memory")
+            peak_cell = f"{peak / (1 << 20):10.1f}" if peak is not None else f"{'—':>10}"
+            counts = ", ".join(f"{key}={value}" for key, value in sorted(record["counts"].items()))
+            print(
+                f"[profile] {record['stage']:<26} {record['wall']:8.3f} {record['cpu']:9.3f} "
+                f"{peak_cell}  {counts}"
+            )
+        print(f"[profile] Timing report saved to {path.relative_to(self.project_root).as_posix()}")
+
+        return path
@@ -0,0 +1,189 @@
+"""Indexed queries over the traceability matrix.
+
+`MatrixIndex` keeps the matrix rows plus secondary indexes from status, id
+prefix, linked test node id and evidence file to row positions, so a query
+intersects a few small position lists instead of scanning every row.
+
+The pipeline saves the index to ``artifacts/traceability/query_index.json``
+together with the fingerprints of the inputs the rows are built from.
+`load_matrix_index` reuses that snapshot while those inputs are unchanged and
+otherwise rebuilds only the matrix (catalog, evidence and test markers, no
+coverage or forge), so queries never rerun the whole pipeline.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from .fingerprint import digest_test_files, matrix_input_fingerprints, write_if_changed
+from .generator import apply_test_markers, build_trace_matrix
+from .matrix import TraceMatrix
+from .test_scanner import merge_marker_scans, scan_test_markers
+
+INDEX_VERSION = 1
+
+INDEXES = ("status", "prefix", "test", "evidence")
+
+
+def query_index_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "traceability" / "query_index.json"
+
+
+def requirement_prefix(requirement_id: str) -> str:
+    return requirement_id.split("-", 1)[0]
+
+
+def _as_set(value: str | Iterable[str]) -> set[str]:
+    return {value} if isinstance(value, str) else set(value)
+
+
+class MatrixIndex:
+    """Matrix rows (``tests``/``evidence_files`` as lists) with secondary indexes."""
+
+    def __init__(
+        self,
+        records: list[dict[str, Any]],
+        indexes: dict[str, dict[str, list[int]]] | None = None,
+    ) -> None:
+        self.records = records
+        self.indexes = indexes if indexes is not None else self._build_indexes(records)
+
+    @classmethod
+    def from_matrix(cls, matrix: TraceMatrix) -> MatrixIndex:
+        return cls(list(matrix.records()))
+
+    @staticmethod
+    def _build_indexes(records: list[dict[str, Any]]) -> dict[str, dict[str, list[int]]]:
+
+        indexes: dict[str, dict[str, list[int]]] = {name: {} for name in INDEXES}
+
+        for i, record in enumerate(records):
+            indexes["status"].setdefault(record["status"], []).append(i)
+            indexes["prefix"].setdefault(requirement_prefix(record["requirement_id"]), []).append(i)
+            for node_id in record["tests"]:
+                indexes["test"].setdefault(node_id, []).append(i)
+            for evidence_file in record["evidence_files"]:
+                indexes["evidence"].setdefault(evidence_file, []).append(i)
+
+        return indexes
+
+    def _lookup(self, index: str, keys: set[str]) -> set[int]:
+        positions: set[int] = set()
+        for key in keys:
+            positions.update(self.indexes[index].get(key, ()))
+        return positions
+
+    def query(
+        self,
+        status: str | Iterable[str] | None = None,
+        prefix: str | Iterable[str] | None = None,
+        test: str | Iterable[str] | None = None,
+        evidence: str | Iterable[str] | None = None,
+        has_tests: bool | None = None,
+        has_evidence: bool | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Rows matching every given filter, in matrix order.
+
+        Each indexed filter takes one value or several (any of them matches);
+        prefixes are given with or without the trailing ``-``. *has_tests* and
+        *has_evidence* keep rows with (True) or without (False) linked tests or
+        evidence files.
+        """
+
+        lookups = []
+        if status is not None:
+            lookups.append(("status", _as_set(status)))
+        if prefix is not None:
+            lookups.append(("prefix", {p.rstrip("-") for p in _as_set(prefix)}))
+        if test is not None:
+            lookups.append(("test", _as_set(test)))
+        if evidence is not None:
+            lookups.append(("evidence", _as_set(evidence)))
+
+        if lookups:
+            candidates = None
+            # Smallest index lists first, so the intersection shrinks fast
+            for index, keys in sorted(
+                lookups, key=lambda item: sum(len(self.indexes[item[0]].get(k, ())) for k in item[1])
+            ):
+                found = self._lookup(index, keys)
+                candidates = found if candidates is None else candidates & found
+                if not candidates:
+                    return []
+            positions = sorted(candidates)
+        else:
+            positions = range(len(self.records))
+
+        rows = [self.records[i] for i in positions]
+
+        if has_tests is not None:
+            rows = [row for row in rows if bool(row["tests"]) == has_tests]
+        if has_evidence is not None:
+            rows = [row for row in rows if bool(row["evidence_files"]) == has_evidence]
+
+        return rows
+
+    def to_snapshot(self, sources: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "sources": sources,
+            "records": self.records,
+            "indexes": self.indexes,
+        }
+
+
+def save_matrix_index(project_root: Path, matrix: TraceMatrix, sources: dict[str, Any]) -> MatrixIndex:
+    """Persist the index of *matrix*, built from inputs with fingerprints *sources*."""
+    index = MatrixIndex.from_matrix(matrix)
+    write_if_changed(
+        query_index_path(project_root),
+        json.dumps(index.to_snapshot(sources), sort_keys=True),
+    )
+    return index
+
+
+def _load_snapshot(project_root: Path) -> dict[str, Any] | None:
+    try:
+        snapshot = json.loads(query_index_path(project_root).read_text())
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get("version") == INDEX_VERSION else None
+
+
+def load_matrix_index(project_root: Path) -> MatrixIndex:
+    """
+    The persisted matrix index, rebuilt (and saved) first when the catalog,
+    the test files or the latest evidence run changed since it was written.
+    """
+
+    test_files = digest_test_files(project_root / "tests", project_root)
+    sources = matrix_input_fingerprints(project_root, test_files)
+
+    snapshot = _load_snapshot(project_root)
+
+    if snapshot is not None and snapshot.get("sources") == sources:
+        return MatrixIndex(snapshot["records"], snapshot["indexes"])
+
+    # stderr, so the rows on stdout stay pipeable (``query --json | jq``)
+    print("[traceability] Matrix inputs changed — rebuilding the query index.", file=sys.stderr)
+
+    matrix = build_trace_matrix(
+        requirements_yaml=project_root / "docs" / "requirements.yaml",
+        evidence_root=project_root / "artifacts" / "evidence_runs",
+    )
+    apply_test_markers(
+        matrix,
+        merge_marker_scans(scan_test_markers(project_root / "tests", project_root)),
+    )
+
+    return save_matrix_index(project_root, matrix, sources)
+
+
+def query_matrix(project_root: Path, **filters) -> list[dict[str, Any]]:
+    """`MatrixIndex.query` over the persisted index of *project_root*."""
+    return load_matrix_index(project_root).query(**filters)
@@ -0,0 +1,179 @@
+"""Requirement → source line map.
+
+Joins the per-test coverage contexts recorded by the test run with the
+``@pytest.mark.requirement`` markers: each requirement gets the union of the
+lines its tests executed, per file, as bitmaps (see `bitsets`). The per-test
+lines are kept under ``artifacts/impact/`` so a partial run only replaces the
+tests it re-ran and only recomputes the requirements linked to them.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from . import bitsets
+from .test_scanner import strip_parametrization
+
+MAP_VERSION = 1
+
+
+def per_test_lines_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "impact" / "test_lines.json"
+
+
+def requirement_code_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "coverage" / "requirement_code.json"
+
+
+def lines_by_test(data_file: Path, project_root: Path) -> dict[str, dict[str, int]] | None:
+    """
+    Read *data_file* into ``{test node id: {source file: line bitmap}}``.
+
+    Returns None when coverage is not installed.
+    """
+    try:
+        from coverage import CoverageData
+    except ImportError:
+        print("[requirement_code] coverage is not installed — cannot read per-test coverage.")
+        return None
+
+    data = CoverageData(basename=str(data_file))
+    data.read()
+
+    root = project_root.resolve()
+    tests: dict[str, dict[str, int]] = {}
+
+    for measured in data.measured_files():
+        try:
+            rel_path = Path(measured).resolve().relative_to(root).as_posix()
+        except ValueError:
+            continue
+
+        for lineno, contexts in data.contexts_by_lineno(measured).items():
+            for context in contexts:
+                # pytest-cov contexts look like "<node id>|setup|run|teardown";
+                # the empty context covers import-time execution
+                if not context:
+                    continue
+                files = tests.setdefault(context.rsplit("|", 1)[0], {})
+                files[rel_path] = files.get(rel_path, 0) | (1 << lineno)
+
+    return tests
+
+
+def _load(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == MAP_VERSION else None
+
+
+def load_test_lines(project_root: Path) -> dict[str, dict[str, int]]:
+    stored = _load(per_test_lines_path(project_root)) or {"tests": {}}
+    return {
+        node_id: {rel_path: bitsets.decode(bits) for rel_path, bits in files.items()}
+        for node_id, files in stored["tests"].items()
+    }
+
+
+def load_requirement_code_map(project_root: Path) -> dict | None:
+    return _load(requirement_code_path(project_root))
+
+
+def _rerun(node_id: str, rerun_tests: set[str]) -> bool:
+    """True when *node_id*, its parametrized function or its test file re-ran."""
+    return (
+        node_id in rerun_tests
+        or strip_parametrization(node_id) in rerun_tests
+        or node_id.split("::", 1)[0] in rerun_tests
+    )
+
+
+def update_requirement_code_map(
+    project_root: Path,
+    measured: dict[str, dict[str, int]],
+    requirements_by_test: dict[str, list[str]],
+    rerun_tests: set[str] | None = None,
+) -> dict:
+    """
+    Store the per-test lines of this run and rebuild the requirement map.
+
+    *measured* comes from `lines_by_test`. When *rerun_tests* is given the run
+    only covered those tests: every other test keeps its stored lines, and
+    requirements whose tests neither re-ran nor changed keep their stored
+    entry.
+    """
+    previous = None
+    tests: dict[str, dict[str, int]] = {}
+
+    if rerun_tests is not None:
+        previous = load_requirement_code_map(project_root)
+        tests = {
+            node_id: files
+            for node_id, files in load_test_lines(project_root).items()
+            if not _rerun(node_id, rerun_tests)
+        }
+
+    tests.update(measured)
+
+    tests_by_requirement: dict[str, list[str]] = {}
+    for node_id in sorted(tests):
+        for req_id in requirements_by_test.get(strip_parametrization(node_id), []):
+            tests_by_requirement.setdefault(req_id, []).append(node_id)
+
+    requirements = {}
+
+    for req_id, node_ids in sorted(tests_by_requirement.items()):
+
+        stored = previous["requirements"].get(req_id) if previous else None
+        if (
+            stored is not None
+            and stored["tests"] == node_ids
+            and not any(_rerun(n, rerun_tests) for n in node_ids)
+        ):
+            requirements[req_id] = stored
+            continue
+
+        files: dict[str, int] = {}
+        for node_id in node_ids:
+            for rel_path, bits in tests[node_id].items():
+                files[rel_path] = files.get(rel_path, 0) | bits
+
+        requirements[req_id] = {
+            "tests": node_ids,
+            "lines": sum(bitsets.count(bits) for bits in files.values()),
+            "files": {rel_path: bitsets.encode(bits) for rel_path, bits in sorted(files.items())},
+        }
+
+    files_index: dict[str, list[str]] = {}
+    for req_id, entry in requirements.items():
+        for rel_path in entry["files"]:
+            files_index.setdefault(rel_path, []).append(req_id)
+
+    code_map = {
+        "version": MAP_VERSION,
+        "requirements": requirements,
+        "files": dict(sorted(files_index.items())),
+    }
+
+    for path, data in (
+        (
+            per_test_lines_path(project_root),
+            {
+                "version": MAP_VERSION,
+                "tests": {
+                    node_id: {rel_path: bitsets.encode(bits) for rel_path, bits in files.items()}
+                    for node_id, files in sorted(tests.items())
+                },
+            },
+        ),
+        (requirement_code_path(project_root), code_map),
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2, sort_keys=True))
+
+    return code_map
@@ -0,0 +1,319 @@
+"""Long-running HTTP service for live traceability status.
+
+`TraceabilityService` keeps a project's requirement catalog, test marker
+scan, latest evidence rows and coverage figure in memory. A watcher thread
+polls the stat fingerprints of those inputs and refreshes only what changed:
+edited test files are re-scanned one by one and their rows patched, a new
+catalog or evidence run rebuilds the rows, new coverage data reloads the
+coverage figure. `serve` answers JSON on localhost:
+
+    GET /summary               requirements per status, requirement and code coverage
+    GET /matrix                rows, filtered like ``query`` (``?status=FAIL,UNTESTED``,
+                               ``prefix``, ``test``, ``evidence``, ``has_tests``,
+                               ``has_evidence``)
+    GET /requirements/<id>     one row with its evidence records
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .coverage import compute_code_coverage, compute_requirement_coverage, coverage_data_path
+from .evidence_loader import latest_evidence_run
+from .generator import apply_test_markers, build_trace_matrix, load_requirements
+from .query import MatrixIndex
+from .test_scanner import merge_marker_scans, rescan_test_files, scan_test_markers
+
+DEFAULT_PORT = 8765
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class TraceabilityService:
+    """In-memory traceability state of *project_root*, refreshed incrementally."""
+
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = project_root
+        self.requirements_yaml = project_root / "docs" / "requirements.yaml"
+        self.evidence_root = project_root / "artifacts" / "evidence_runs"
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stamps: dict[str, Any] = {}
+        self._test_stamps: dict[str, tuple[int, int] | None] = {}
+
+        self.catalog: dict[str, dict[str, str]] = {}
+        self.scans: dict[str, dict[str, list[str]]] = {}
+        self.base_matrix = None
+        self.matrix = None
+        self.index: MatrixIndex | None = None
+        self.code_coverage: float | None = None
+        self.evidence_run: str | None = None
+        self.refreshed_at: str | None = None
+
+        self.refresh()
+
+    def _input_stamps(self) -> dict[str, Any]:
+        evidence_run = latest_evidence_run(self.evidence_root)
+        return {
+            "requirements": _stamp(self.requirements_yaml),
+            "evidence": evidence_run and [
+                evidence_run.name,
+                sorted((p.name, _stamp(p)) for p in evidence_run.glob("*.json")),
+            ],
+            "coverage": _stamp(coverage_data_path(self.project_root)),
+        }
+
+    def _test_file_stamps(self) -> dict[str, tuple[int, int] | None]:
+        return {
+            path.relative_to(self.project_root).as_posix(): _stamp(path)
+            for path in (self.project_root / "tests").rglob("test_*.py")
+        }
+
+    def refresh(self) -> set[str]:
+        """
+        Reload the inputs that changed since the last refresh.
+
+        Returns the names of the refreshed inputs (``requirements``,
+        ``evidence``, ``coverage``, ``tests``); empty when nothing changed.
+        """
+
+        stamps = self._input_stamps()
+        test_stamps = self._test_file_stamps()
+
+        changed = {name for name, stamp in stamps.items() if self._stamps.get(name, ()) != stamp}
+        changed_tests = sorted(
+            rel_path
+            for rel_path in self._test_stamps.keys() | test_stamps.keys()
+            if self._test_stamps.get(rel_path) != test_stamps.get(rel_path)
+        )
+        first = self.matrix is None
+
+        if not changed and not changed_tests:
+            return set()
+
+        # Built aside and swapped in at the end, so requests never see a half-refreshed state
+        scans = self.scans
+        affected: set[str] = set()
+        if first:
+            scans = scan_test_markers(self.project_root / "tests", self.project_root)
+        elif changed_tests:
+            scans = dict(scans)
+            affected = rescan_test_files(self.project_root, scans, changed_tests)
+        marker_links = merge_marker_scans(scans)
+
+        catalog = self.catalog
+        if first or "requirements" in changed:
+            catalog = load_requirements(self.requirements_yaml)
+
+        base_matrix, matrix, index = self.base_matrix, self.matrix, self.index
+        if first or changed & {"requirements", "evidence"}:
+            base_matrix = build_trace_matrix(self.requirements_yaml, self.evidence_root, catalog)
+            matrix = base_matrix.copy()
+            apply_test_markers(matrix, marker_links)
+            index = MatrixIndex.from_matrix(matrix)
+        elif affected:
+            matrix = matrix.copy()
+            matrix.patch(base_matrix, marker_links, affected)
+            index = MatrixIndex.from_matrix(matrix)
+
+        code_coverage = self.code_coverage
+        if first or "coverage" in changed:
+            code_coverage = compute_code_coverage(self.project_root)[0]
+
+        with self._lock:
+            self.scans = scans
+            self.catalog = catalog
+            self.base_matrix = base_matrix
+            self.matrix = matrix
+            self.index = index
+            self.code_coverage = code_coverage
+            self.evidence_run = stamps["evidence"][0] if stamps["evidence"] else None
+            self.refreshed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self._stamps = stamps
+            self._test_stamps = test_stamps
+
+        refreshed = changed | ({"tests"} if changed_tests else set())
+        if not first:
+            print(f"[serve] Refreshed: {', '.join(sorted(refreshed))}")
+
+        return refreshed
+
+    def watch(self, interval: float = 1.0) -> threading.Thread:
+        """Refresh every *interval* seconds on a daemon thread until `stop`."""
+
+        def poll() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as exc:
+                    # Keep serving the last good state, e.g. while a file is half written
+                    print(f"[serve] Refresh failed: {exc}")
+
+        thread = threading.Thread(target=poll, name="traceability-watch", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            matrix, code_coverage = self.matrix, self.code_coverage
+            evidence_run, refreshed_at = self.evidence_run, self.refreshed_at
+        coverage, tested, total, _ = compute_requirement_coverage(matrix)
+        return {
+            "project": self.project_root.resolve().name,
+            "requirements": total,
+            "tested": tested,
+            "statuses": matrix.status_counts(),
+            "requirement_coverage": coverage,
+            "code_coverage": code_coverage,
+            "evidence_run": evidence_run,
+            "refreshed_at": refreshed_at,
+        }
+
+    def rows(self, **filters) -> list[dict[str, Any]]:
+        """`MatrixIndex.query` over the in-memory matrix."""
+        with self._lock:
+            index = self.index
+        return index.query(**filters)
+
+    def requirement(self, requirement_id: str) -> dict[str, Any] | None:
+        """The row of *requirement_id* with its evidence records, or None."""
+
+        with self._lock:
+            matrix, index, evidence_run = self.matrix, self.index, self.evidence_run
+        # Index records are in matrix order
+        position = matrix.position(requirement_id)
+        if position is None:
+            return None
+
+        record = index.records[position]
+        # Only this row's few evidence files are read, on demand
+        evidence = []
+        for name in record["evidence_files"]:
+            try:
+                evidence.append(json.loads((self.evidence_root / evidence_run / name).read_text()))
+            except (OSError, ValueError):
+                continue
+
+        return {**record, "evidence": evidence}
+
+
+_LIST_FILTERS = ("status", "prefix", "test", "evidence")
+_FLAG_FILTERS = ("has_tests", "has_evidence")
+_FLAGS = {"true": True, "1": True, "false": False, "0": False}
+
+
+def _filters(query: str) -> dict[str, Any]:
+
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    unknown = sorted(set(params) - set(_LIST_FILTERS) - set(_FLAG_FILTERS))
+    if unknown:
+        raise ValueError(f"unknown filter(s): {', '.join(unknown)}")
+
+    filters: dict[str, Any] = {}
+    for key in _LIST_FILTERS:
+        if key in params:
+            filters[key] = [value for value in params[key].split(",") if value]
+    for key in _FLAG_FILTERS:
+        if key in params:
+            if params[key].lower() not in _FLAGS:
+                raise ValueError(f"{key} must be true or false")
+            filters[key] = _FLAGS[params[key].lower()]
+
+    return filters
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    server: _Server
+
+    def do_GET(self) -> None:
+
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/")
+        service = self.server.service
+
+        try:
+            if path == "/summary":
+                self._reply(200, service.summary())
+            elif path == "/matrix":
+                self._reply(200, service.rows(**_filters(url.query)))
+            elif path.startswith("/requirements/"):
+                requirement_id = unquote(path.removeprefix("/requirements/"))
+                detail = service.requirement(requirement_id)
+                if detail is None:
+                    self._reply(404, {"error": f"unknown requirement {requirement_id}"})
+                else:
+                    self._reply(200, detail)
+            else:
+                self._reply(404, {"error": f"no such endpoint {url.path}"})
+        except ValueError as exc:
+            self._reply(400, {"error": str(exc)})
+
+    def _reply(self, status: int, body: Any) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Dashboards poll; one line per request would drown the refresh messages
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: TraceabilityService) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def make_server(
+    service: TraceabilityService, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+) -> ThreadingHTTPServer:
+    """An HTTP server answering from *service*; ``port=0`` picks a free port."""
+    return _Server((host, port), service)
+
+
+def serve(
+    project_root: Path, host: str = "127.0.0.1", port: int = DEFAULT_PORT, interval: float = 1.0
+) -> None:
+    """Serve the live traceability status of *project_root* until interrupted."""
+
+    service = TraceabilityService(project_root)
+    service.watch(interval)
+
+    with make_server(service, host, port) as server:
+        print(
+            f"[serve] Serving traceability status of {project_root} on "
+            f"http://{server.server_address[0]}:{server.server_address[1]}/summary"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.stop()
@@ -0,0 +1,120 @@
+"""A small dependency graph of pipeline stages run on a thread pool.
+
+Each `Stage` names the values it needs; its function is called with them as
+keyword arguments and its return value is stored under the stage's name for
+the stages that depend on it. Stages whose inputs are all available run
+concurrently, so independent I/O-bound steps (evidence loading, marker
+scanning, the forge run) overlap.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+
+class Stage:
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        counts: Callable[[Any], dict[str, int]] | None = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        # Derives record/file counts from the result for the pipeline profile
+        self.counts = counts
+
+    def run(self, values: dict[str, Any], profile=None) -> Any:
+        kwargs = {name: values[name] for name in self.inputs}
+        if profile is None:
+            return self.func(**kwargs)
+        return profile.run(self.name, lambda: self.func(**kwargs), self.counts)
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, inputs={self.inputs!r})"
+
+
+def _check_graph(stages: list[Stage], values: dict[str, Any]) -> None:
+
+    names = set(values)
+    seen = set()
+    for stage in stages:
+        if stage.name in seen:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        seen.add(stage.name)
+    names |= seen
+
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in names]
+        if missing:
+            raise ValueError(f"Stage {stage.name} needs unknown input(s): {', '.join(missing)}")
+
+
+def run_stages(
+    stages: Iterable[Stage],
+    values: dict[str, Any] | None = None,
+    max_workers: int | None = None,
+    profile=None,
+) -> dict[str, Any]:
+    """
+    Run *stages* as soon as their inputs are available.
+
+    *values* are the initial inputs; stages whose name is already in
+    *values* were computed earlier and are skipped. Returns the values
+    together with every stage result.
+
+    With ``max_workers=1`` stages run one after another in the order given
+    (which must then list dependencies first); otherwise they run on a thread
+    pool of that size. The first exception raised by a stage is re-raised
+    once running stages have finished, and no further stages start.
+
+    With a *profile* (`profiling.PipelineProfile`) every stage is measured.
+    """
+
+    stages = list(stages)
+    values = dict(values or {})
+
+    _check_graph(stages, values)
+
+    stages = [stage for stage in stages if stage.name not in values]
+
+    if max_workers == 1:
+        for stage in stages:
+            values[stage.name] = stage.run(values, profile)
+        return values
+
+    # Deferred: concurrent.futures pulls in logging, which CLI startup does not need
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pending = list(stages)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        while pending or running:
+
+            ready = [stage for stage in pending if all(name in values for name in stage.inputs)]
+            for stage in ready:
+                pending.remove(stage)
+                running[pool.submit(stage.run, dict(values), profile)] = stage
+
+            if not running:
+                names = ", ".join(stage.name for stage in pending)
+                raise ValueError(f"Stage dependencies form a cycle: {names}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    values[stage.name] = future.result()
+                except BaseException:
+                    pending.clear()
+                    wait(running)
+                    raise
+
+    return values
@@ -0,0 +1,47 @@
+"""Persisted traceability state shared between full and incremental runs.
+
+A full `generate_traceability_matrix` run stores the per-file marker scan,
+the evidence-only matrix rows and the summaries it rendered, so later
+incremental runs can patch the matrix instead of rebuilding it.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from .fingerprint import write_if_changed
+
+STATE_VERSION = 2
+
+
+def state_path(project_root: Path) -> Path:
+    return project_root / "artifacts" / "traceability" / "state.json"
+
+
+def load_state(project_root: Path) -> dict[str, Any] | None:
+    """Return the stored state, or None when missing, unreadable or outdated."""
+
+    path = state_path(project_root)
+
+    if not path.exists():
+        return None
+
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    if state.get("version") != STATE_VERSION:
+        return None
+
+    return state
+
+
+def save_state(project_root: Path, state: dict[str, Any]) -> None:
+
+    write_if_changed(
+        state_path(project_root),
+        json.dumps({**state, "version": STATE_VERSION}, indent=2, sort_keys=True),
+    )
@@ -1,40 +1,116 @@
 import ast
+import re
 from pathlib import Path
 
+_PARAM_SUFFIX = re.compile(r"\[.*\]$")
 
-def collect_requirement_markers(test_root: Path, project_root: Path = None):
+
+def strip_parametrization(node_id: str) -> str:
+    """The node id of the marked test function, without a ``[param]`` suffix."""
+    return _PARAM_SUFFIX.sub("", node_id)
+
+
+def scan_test_file(test_file: Path, project_root: Path) -> dict[str, list[str]]:
     """
-    Scan pytest files and collect requirement markers.
+    Collect requirement markers from a single pytest file.
 
     Returns:
         dict[str, list[str]]
         { requirement_id: [test_node_ids...] }
     """
 
+    requirement_map = {}
+
+    module = ast.parse(test_file.read_text())
+
+    for node in module.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        test_name = node.name
+
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call):
+                if (
+                    isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr == "requirement"
+                ):
+
+                    for arg in decorator.args:
+                        req_id = arg.value
+                        node_id = f"{test_file.relative_to(project_root)}::{test_name}"
+                        requirement_map.setdefault(req_id, []).append(node_id)
+
+    return requirement_map
+
+
+def scan_test_markers(test_root: Path, project_root: Path = None):
+    """
+    Scan pytest files and keep the requirement markers grouped per file.
+
+    Returns:
+        dict[str, dict[str, list[str]]]
+        { test_file (relative to project_root): { requirement_id: [test_node_ids...] } }
+    """
+
     if project_root is None:
         project_root = test_root
 
-    requirement_map = {}
+    scans = {}
 
     for test_file in test_root.rglob("test_*.py"):
-        module = ast.parse(test_file.read_text())
+        scans[test_file.relative_to(project_root).as_posix()] = scan_test_file(
+            test_file, project_root
+        )
 
-        for node in module.body:
-            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                continue
+    return scans
 
-            test_name = node.name
 
-            for decorator in node.decorator_list:
-                if isinstance(decorator, ast.Call):
-                    if (
-                        isinstance(decorator.func, ast.Attribute)
-                        and decorator.func.attr == "requirement"
-                    ):
+def rescan_test_files(
+    project_root: Path,
+    scans: dict[str, dict[str, list[str]]],
+    rel_paths,
+) -> set[str]:
+    """
+    Re-scan *rel_paths* in place in *scans*; deleted files are dropped.
 
-                        for arg in decorator.args:
-                            req_id = arg.value
-                            node_id = f"{test_file.relative_to(project_root)}::{test_name}"
-                            requirement_map.setdefault(req_id, []).append(node_id)
+    Returns the requirement ids whose marker links may have moved.
+    """
+
+    affected = set()
+
+    for rel_path in rel_paths:
+        affected.update(scans.pop(rel_path, {}))
+
+        test_file = project_root / rel_path
+        if test_file.exists():
+            scans[rel_path] = scan_test_file(test_file, project_root)
+            affected.update(scans[rel_path])
+
+    return affected
+
+
+def merge_marker_scans(scans: dict[str, dict[str, list[str]]]) -> dict[str, list[str]]:
+    """
+    Flatten per-file marker scans into { requirement_id: [test_node_ids...] }.
+    """
+
+    requirement_map = {}
+
+    for file_links in scans.values():
+        for req_id, node_ids in file_links.items():
+            requirement_map.setdefault(req_id, []).extend(node_ids)
 
     return requirement_map
+
+
+def collect_requirement_markers(test_root: Path, project_root: Path = None):
+    """
+    Scan pytest files and collect requirement markers.
+
+    Returns:
+        dict[str, list[str]]
+        { requirement_id: [test_node_ids...] }
+    """
+
+    return merge_marker_scans(scan_test_markers(test_root, project_root))
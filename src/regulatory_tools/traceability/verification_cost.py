@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from .fingerprint import write_if_changed
+from .test_scanner import strip_parametrization
+
+PHASES = ("setup", "call", "teardown")
+
+
+def timing_dir(project_root: Path) -> Path:
+    return project_root / "artifacts" / "timing"
+
+
+def recorded_timings_path(project_root: Path) -> Path:
+    """Per-test phase durations written by the ``regulatory_tools.pytest_timing`` plugin."""
+    return timing_dir(project_root) / "test_timings.json"
+
+
+def verification_cost_path(project_root: Path) -> Path:
+    return timing_dir(project_root) / "verification_cost.json"
+
+
+def load_test_timings(path: Path) -> dict[str, dict[str, float]]:
+    """Return { node_id: { phase: seconds } } from a timing plugin file."""
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text()).get("tests", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def compute_verification_cost(
+    timings: dict[str, dict[str, float]],
+    marker_links: dict[str, list[str]],
+) -> list[dict]:
+    """
+    Aggregate per-test phase durations per requirement.
+
+    A test linked to several requirements counts in full towards each of
+    them. Parametrized cases are summed into their marked test function.
+
+    Returns rows sorted by total seconds, most expensive first.
+    """
+
+    per_test: dict[str, dict[str, float]] = {}
+
+    for node_id, phases in timings.items():
+        test = per_test.setdefault(strip_parametrization(node_id), dict.fromkeys(PHASES, 0.0))
+        for phase in PHASES:
+            test[phase] += phases.get(phase, 0.0)
+
+    rows = []
+
+    for req_id, node_ids in marker_links.items():
+        timed = [per_test[n] for n in sorted(set(node_ids)) if n in per_test]
+
+        if not timed:
+            continue
+
+        row = {"requirement_id": req_id, "tests": len(timed)}
+        for phase in PHASES:
+            row[phase] = sum(t[phase] for t in timed)
+        row["total"] = sum(row[phase] for phase in PHASES)
+
+        rows.append(row)
+
+    return sorted(rows, key=lambda r: (-r["total"], r["requirement_id"]))
+
+
+def save_verification_cost(project_root: Path, cost: list[dict]) -> None:
+
+    write_if_changed(verification_cost_path(project_root), json.dumps({"requirements": cost}, indent=2))
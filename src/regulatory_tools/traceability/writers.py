@@ -0,0 +1,248 @@
+"""Streaming matrix output writers.
+
+A writer gets ``begin`` once, ``write_row`` for every requirement and ``end``
+once, each time with its own open output file, and writes as it goes.
+`write_matrix` drives any number of writers through a single pass over the
+matrix rows, so producing every format costs one traversal. Files are only
+replaced when their content changed (see `fingerprint.open_if_changed`).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from html import escape
+from pathlib import Path
+from typing import Any, TextIO
+
+from .fingerprint import open_if_changed
+from .matrix import TraceMatrix
+
+FIELDS = ("requirement_id", "title", "tests", "evidence_files", "status")
+
+
+class MatrixWriter(ABC):
+    """Base class: subclasses implement `write_row` and optionally `begin`/`end`."""
+
+    # Passed to open(); the csv module needs untranslated newlines
+    newline: str | None = None
+
+    def __init__(self, output: Path) -> None:
+        self.output = output
+
+    def begin(self, f: TextIO) -> None:  # noqa: B027
+        pass
+
+    @abstractmethod
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+        ...
+
+    def end(self, f: TextIO) -> None:  # noqa: B027
+        pass
+
+    # Entered by `write_matrix` around the whole pass, for writers that manage
+    # files of their own; the exception info lets them discard partial output
+    def __enter__(self) -> MatrixWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # noqa: B027
+        pass
+
+
+def _split(cell: str | list[str]) -> list[str]:
+    if isinstance(cell, list):
+        return cell
+    return [t.strip() for t in cell.split(",") if t.strip()]
+
+
+def iter_records(matrix: TraceMatrix | Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Matrix rows with ``tests`` and ``evidence_files`` as lists."""
+    if isinstance(matrix, TraceMatrix):
+        yield from matrix.records()
+        return
+    for row in matrix:
+        yield {
+            "requirement_id": row["requirement_id"],
+            "title": row.get("title", ""),
+            "tests": _split(row.get("tests", "")),
+            "evidence_files": _split(row.get("evidence_files", "")),
+            "status": row.get("status", "UNTESTED"),
+        }
+
+
+def write_matrix(
+    matrix: TraceMatrix | Iterable[dict[str, Any]],
+    writers: list[MatrixWriter],
+) -> None:
+    """Stream *matrix* through all *writers* in one pass over its rows."""
+    with ExitStack() as stack:
+        for writer in writers:
+            stack.enter_context(writer)
+
+        outputs = [
+            (writer, stack.enter_context(open_if_changed(writer.output, newline=writer.newline)))
+            for writer in writers
+        ]
+
+        for writer, f in outputs:
+            writer.begin(f)
+
+        for record in iter_records(matrix):
+            for writer, f in outputs:
+                writer.write_row(f, record)
+
+        for writer, f in outputs:
+            writer.end(f)
+
+
+class JsonLinesWriter(MatrixWriter):
+    """One JSON object per requirement, one per line."""
+
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n")
+
+
+class CsvWriter(MatrixWriter):
+    """Spreadsheet-friendly CSV; list columns are joined with ``", "``."""
+
+    newline = ""
+
+    def begin(self, f: TextIO) -> None:
+        self._csv = csv.writer(f)
+        self._csv.writerow(FIELDS)
+
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+        self._csv.writerow(
+            [
+                record["requirement_id"],
+                record["title"],
+                ", ".join(record["tests"]),
+                ", ".join(record["evidence_files"]),
+                record["status"],
+            ]
+        )
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<!-- AUTO-GENERATED FILE. DO NOT EDIT MANUALLY. -->
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Requirements Traceability Matrix</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #f0f0f0; position: sticky; top: 0; }
+td.status-PASS { background: #dff0d8; }
+td.status-LINKED { background: #e8f0fb; }
+td.status-FAIL { background: #f2dede; }
+td.status-UNTESTED { background: #fcf8e3; }
+ul { margin: 0; padding-left: 1.2em; }
+</style>
+</head>
+<body>
+<h1>Requirements Traceability Matrix</h1>
+<table>
+<thead>
+<tr><th>Requirement ID</th><th>Title</th><th>Linked Tests</th><th>Evidence Artifacts</th><th>Status</th></tr>
+</thead>
+<tbody>
+"""
+
+
+def _attr(value: str) -> str:
+    return f'"{escape(value, quote=True)}"'
+
+
+def _html_list(items: list[str]) -> str:
+    if not items:
+        return ""
+    return "<ul>" + "".join(f"<li>{escape(item)}</li>" for item in items) + "</ul>"
+
+
+class HtmlWriter(MatrixWriter):
+    """Self-contained HTML page (inline CSS, no external assets)."""
+
+    def begin(self, f: TextIO) -> None:
+        self.counts: Counter[str] = Counter()
+        f.write(_HTML_HEAD)
+
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+        status = record["status"]
+        self.counts[status] += 1
+        f.write(
+            f"<tr><td>{escape(record['requirement_id'])}</td>"
+            f"<td>{escape(record['title'])}</td>"
+            f"<td>{_html_list(record['tests'])}</td>"
+            f"<td>{_html_list(record['evidence_files'])}</td>"
+            f"<td class=\"status-{escape(status)}\">{escape(status)}</td></tr>\n"
+        )
+
+    def end(self, f: TextIO) -> None:
+        total = sum(self.counts.values())
+        f.write("</tbody>\n</table>\n")
+        f.write(
+            f"<p>Total Requirements: {total} &middot; "
+            f"Tested: {total - self.counts['UNTESTED']} &middot; "
+            f"Failures: {self.counts['FAIL']}</p>\n"
+        )
+        f.write("</body>\n</html>\n")
+
+
+class JUnitWriter(MatrixWriter):
+    """
+    JUnit-style XML with one test case per requirement, for CI dashboards:
+    FAIL requirements are failures and UNTESTED ones are skipped.
+    """
+
+    def begin(self, f: TextIO) -> None:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        f.write('<testsuites>\n<testsuite name="requirements-traceability">\n')
+
+    def write_row(self, f: TextIO, record: dict[str, Any]) -> None:
+        req_id = record["requirement_id"]
+        prefix = req_id.split("-", 1)[0]
+        f.write(f"<testcase classname={_attr(prefix)} name={_attr(req_id)}>")
+
+        status = record["status"]
+        if status == "FAIL":
+            evidence = ", ".join(record["evidence_files"]) or "no evidence file"
+            f.write(f"<failure message={_attr(f'Failing evidence: {evidence}')}/>")
+        elif status == "UNTESTED":
+            f.write('<skipped message="No linked tests or evidence"/>')
+
+        if record["tests"]:
+            f.write(
+                f"<system-out>{escape(', '.join(record['tests']), quote=False)}</system-out>"
+            )
+
+        f.write("</testcase>\n")
+
+    def end(self, f: TextIO) -> None:
+        f.write("</testsuite>\n</testsuites>\n")
+
+
+# Format name → (writer class, file name under artifacts/traceability/)
+FORMATS: dict[str, tuple[type[MatrixWriter], str]] = {
+    "jsonl": (JsonLinesWriter, "matrix.jsonl"),
+    "csv": (CsvWriter, "matrix.csv"),
+    "html": (HtmlWriter, "matrix.html"),
+    "junit": (JUnitWriter, "matrix.junit.xml"),
+}
+
+
+def output_writers(project_root: Path, formats: Iterable[str]) -> list[MatrixWriter]:
+    """Writers for *formats* (keys of `FORMATS`) under ``artifacts/traceability/``."""
+    writers = []
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown matrix output format: {fmt}")
+        writer_class, filename = FORMATS[fmt]
+        writers.append(writer_class(project_root / "artifacts" / "traceability" / filename))
+    return writers
@@ -23,4 +23,44 @@ def evidence_output_dir():
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     run_dir = root / run_id
     run_dir.mkdir(parents=True, exist_ok=True)
-    return run_dir
\ No newline at end of file
+    return run_dir
+
+# ---------------------------------------------------------------------
+# Traceability Projects
+# ---------------------------------------------------------------------
+
+DUMMY_REQUIREMENTS = """
+requirements:
+  - id: VER-001
+    description: Dummy requirement 1
+  - id: VER-002
+    description: Dummy requirement 2
+  - id: VER-003
+    description: Dummy requirement 3
+"""
+
+MARKED_TEST = 'import pytest\n\n@pytest.mark.requirement("VER-001")\ndef test_a():\n    assert True\n'
+
+
+@pytest.fixture
+def make_traceability_project():
+    """
+    Returns a factory laying out a minimal project at a path: a catalog of
+    VER-001..VER-003 and, unless ``marked_test=False``, tests/test_a.py
+    linking test_a to VER-001.
+    """
+    def make(project: Path, marked_test: bool = True) -> Path:
+        (project / "docs").mkdir(parents=True)
+        (project / "tests").mkdir()
+        (project / "docs" / "requirements.yaml").write_text(DUMMY_REQUIREMENTS)
+        if marked_test:
+            (project / "tests" / "test_a.py").write_text(MARKED_TEST)
+        return project
+
+    return make
+
+
+@pytest.fixture
+def traceability_project(tmp_path, make_traceability_project) -> Path:
+    """A minimal project at ``tmp_path / "proj"``, see `make_traceability_project`."""
+    return make_traceability_project(tmp_path / "proj")
@@ -1,9 +1,12 @@
 from pathlib import Path
 import json
+import os
 import pytest
+import subprocess
 import sys
 
 from regulatory_tools.evidence.evidence_report import EvidenceReport, generate_evidence_summary
+from regulatory_tools.testing import __main__ as testing_main
 from regulatory_tools.traceability import __main__ as traceability_main
 from regulatory_tools.traceability.generator import build_trace_matrix
 from regulatory_tools.traceability.coverage import (
@@ -12,6 +15,7 @@ from regulatory_tools.traceability.coverage import (
     coverage_xml_path,
     save_uncovered_lines,
 )
+from regulatory_tools.traceability.coverage_reports import render_coverage_reports
 from regulatory_tools.traceability.validate_traceability import find_unmarked_tests
 
 # ----------------------------
@@ -250,9 +254,12 @@ def test_compute_code_coverage_and_save_uncovered_lines(tmp_path):
       <classes>
         <class filename="pkg/module.py">
           <lines>
+            <line number="21" hits="0"/>
             <line number="10" hits="1"/>
-            <line number="11" hits="0"/>
             <line number="12" hits="0"/>
+            <line number="11" hits="0"/>
+            <line number="14" hits="0"/>
+            <line number="20" hits="1"/>
           </lines>
         </class>
       </classes>
@@ -266,9 +273,210 @@ def test_compute_code_coverage_and_save_uncovered_lines(tmp_path):
     save_uncovered_lines(tmp_path, uncovered)
 
     assert percent == 75.0
-    assert uncovered == {"pkg/module.py": [11, 12]}
+    # Sorted by line, and the gap at non-statement line 13 ends a range
+    assert uncovered == {"pkg/module.py": [(11, 12), (14, 14), (21, 21)]}
     assert coverage_xml_path(tmp_path) == coverage_xml
-    assert "line 11" in (coverage_dir / "uncovered_lines.txt").read_text()
+
+    text = (coverage_dir / "uncovered_lines.txt").read_text()
+    assert "lines 11-12" in text
+    assert "line 14" in text
+    assert "line 21" in text
+
+    data = json.loads((coverage_dir / "uncovered_lines.json").read_text())
+    assert data["files"] == {"pkg/module.py": [[11, 12], [14, 14], [21, 21]]}
+
+
+@pytest.mark.requirement("VER-005")
+def test_compute_code_coverage_reads_coverage_data_file(tmp_path):
+
+    coverage = pytest.importorskip("coverage")
+
+    module = tmp_path / "src" / "pkg" / "module.py"
+    module.parent.mkdir(parents=True)
+    module.write_text(
+        "def f(x):\n"
+        "    if x:\n"
+        "        return 1\n"
+        "    return 0\n"
+        "\n"
+        "def g():\n"
+        "    return 2\n"
+    )
+
+    data = coverage.CoverageData(basename=str(tmp_path / ".coverage"))
+    data.add_lines({str(module): [1, 2, 6]})
+    data.write()
+
+    percent, uncovered = compute_code_coverage(tmp_path)
+
+    # No coverage.xml was rendered; the data file is read directly
+    assert not coverage_xml_path(tmp_path).exists()
+    assert percent == 50.0
+    assert uncovered == {"src/pkg/module.py": [(3, 4), (7, 7)]}
+
+    # Missed statements on both sides of the blank line 5 stay separate ranges
+    data.erase()
+    data.add_lines({str(module): [1, 2]})
+    data.write()
+
+    assert compute_code_coverage(tmp_path)[1] == {"src/pkg/module.py": [(3, 4), (6, 7)]}
+
+
+@pytest.mark.requirement("VER-005")
+def test_coverage_data_file_honours_report_omit(tmp_path):
+
+    coverage = pytest.importorskip("coverage")
+
+    pkg = tmp_path / "src" / "pkg"
+    pkg.mkdir(parents=True)
+    (pkg / "module.py").write_text("A = 1\nB = 2\n")
+    (pkg / "generated.py").write_text("C = 3\nD = 4\n")
+    (tmp_path / ".coveragerc").write_text("[report]\nomit =\n    src/pkg/generated.py\n")
+
+    data = coverage.CoverageData(basename=str(tmp_path / ".coverage"))
+    data.add_lines({str(pkg / "module.py"): [1, 2], str(pkg / "generated.py"): [1]})
+    data.write()
+
+    percent, uncovered = compute_code_coverage(tmp_path)
+
+    # Same total as `coverage report`, which leaves the omitted file out
+    assert percent == 100.0
+    assert uncovered == {}
+
+
+@pytest.mark.requirement("VER-005")
+def test_coverage_history_diffs_runs_with_line_bitmaps(tmp_path):
+
+    coverage = pytest.importorskip("coverage")
+
+    from regulatory_tools.traceability.coverage_data import CoverageDataReader
+    from regulatory_tools.traceability.coverage_history import (
+        coverage_delta,
+        record_coverage_snapshot,
+    )
+    from regulatory_tools.traceability.generator import write_markdown
+
+    module = tmp_path / "src" / "pkg" / "module.py"
+    module.parent.mkdir(parents=True)
+    module.write_text(
+        "def f(x):\n"
+        "    if x:\n"
+        "        return 1\n"
+        "    return 0\n"
+        "\n"
+        "def g():\n"
+        "    return 2\n"
+    )
+
+    for run_id, executed in (("run1", [1, 2, 3, 6]), ("run2", [1, 2, 4, 6, 7])):
+        data = coverage.CoverageData(basename=str(tmp_path / f".coverage.{run_id}"))
+        data.add_lines({str(module): executed})
+        data.write()
+
+        reader = CoverageDataReader(tmp_path, tmp_path / f".coverage.{run_id}")
+        assert record_coverage_snapshot(tmp_path, reader, run_id=run_id) == run_id
+
+    # Unchanged data is not recorded twice
+    assert record_coverage_snapshot(tmp_path, reader) is None
+
+    delta = coverage_delta(tmp_path)
+
+    assert delta["base"] == "run1"
+    assert delta["head"] == "run2"
+    change = delta["files"]["src/pkg/module.py"]
+    assert change["newly_uncovered"] == [(3, 3)]
+    assert change["newly_covered"] == [(4, 4), (7, 7)]
+    assert round(change["before"], 1) == 66.7
+    assert round(change["after"], 1) == 83.3
+
+    output = tmp_path / "matrix.md"
+    write_markdown([], output, coverage_delta=delta)
+
+    assert "| src/pkg/module.py | 66.7% | 83.3% | 3 | 4, 7 |" in output.read_text()
+
+
+@pytest.mark.requirement("VER-005")
+def test_requirement_code_maps_requirements_to_covered_lines(tmp_path):
+
+    from regulatory_tools.traceability import bitsets
+    from regulatory_tools.traceability.generator import write_markdown
+    from regulatory_tools.traceability.requirement_code import (
+        load_requirement_code_map,
+        update_requirement_code_map,
+    )
+
+    measured = {
+        "tests/test_a.py::test_a": {
+            "src/pkg/a.py": bitsets.from_lines([1, 2, 3]),
+            "src/pkg/b.py": bitsets.from_lines([5]),
+        },
+        # Parametrized cases map through their marked function
+        "tests/test_b.py::test_b[1]": {"src/pkg/a.py": bitsets.from_lines([3, 4])},
+        "tests/test_c.py::test_unmarked": {"src/pkg/c.py": bitsets.from_lines([1])},
+    }
+    requirements_by_test = {
+        "tests/test_a.py::test_a": ["VER-001"],
+        "tests/test_b.py::test_b": ["VER-001", "VER-002"],
+    }
+
+    code_map = update_requirement_code_map(tmp_path, measured, requirements_by_test)
+
+    assert load_requirement_code_map(tmp_path) == code_map
+    ver1 = code_map["requirements"]["VER-001"]
+    assert ver1["tests"] == ["tests/test_a.py::test_a", "tests/test_b.py::test_b[1]"]
+    # The union of the lines of its tests, per file
+    assert {path: bitsets.to_lines(bitsets.decode(bits)) for path, bits in ver1["files"].items()} == {
+        "src/pkg/a.py": [1, 2, 3, 4],
+        "src/pkg/b.py": [5],
+    }
+    assert ver1["lines"] == 5
+    assert code_map["requirements"]["VER-002"]["lines"] == 2
+    assert code_map["files"] == {
+        "src/pkg/a.py": ["VER-001", "VER-002"],
+        "src/pkg/b.py": ["VER-001"],
+    }
+
+    rows = [
+        {"requirement_id": req_id, "title": req_id, "tests": [], "evidence_files": [], "status": "LINKED"}
+        for req_id in ("VER-001", "VER-002", "VER-003")
+    ]
+    output = tmp_path / "matrix.md"
+    write_markdown(rows, output, requirement_code=code_map)
+    text = output.read_text()
+
+    assert "| Status | Covered Code |" in text
+    assert "| LINKED | 5 line(s) in 2 file(s) |" in text
+    assert "| LINKED | 2 line(s) in 1 file(s) |" in text
+    assert "| VER-003 | VER-003 |  |  | LINKED | — |" in text
+
+
+@pytest.mark.requirement("VER-005")
+def test_coverage_reports_render_on_demand_when_data_changes(tmp_path):
+
+    coverage = pytest.importorskip("coverage")
+
+    module = tmp_path / "src" / "pkg" / "module.py"
+    module.parent.mkdir(parents=True)
+    module.write_text("def f():\n    return 1\n")
+
+    data = coverage.CoverageData(basename=str(tmp_path / ".coverage"))
+    data.add_lines({str(module): [1]})
+    data.write()
+
+    testing_main.main(["coverage-report", str(tmp_path), "--format", "xml,json"])
+
+    assert coverage_xml_path(tmp_path).exists()
+    assert (tmp_path / "artifacts" / "coverage" / "coverage.json").exists()
+    assert (tmp_path / "coverage.xml").exists()
+
+    # Unchanged data file: nothing is rendered again
+    assert render_coverage_reports(tmp_path, ("xml", "json")) == []
+
+    data.add_lines({str(module): [2]})
+    data.write()
+
+    assert render_coverage_reports(tmp_path, ("xml",)) == ["xml"]
+    assert 'line-rate="1"' in coverage_xml_path(tmp_path).read_text()
 
 
 @pytest.mark.requirement("VER-005")
@@ -314,6 +522,22 @@ def test_traceability_module_main_dispatches(monkeypatch, tmp_path):
 
     assert called["project_root"] == tmp_path
 
+    # Matrix formats besides the markdown are opt-in
+    def fake_generate_formats(project_root, formats):
+        called["formats"] = formats
+
+    monkeypatch.setattr(traceability_main, "generate_traceability_matrix", fake_generate_formats)
+    monkeypatch.setattr(sys, "argv", ["traceability", str(tmp_path), "--formats", "csv,junit"])
+
+    traceability_main.main()
+
+    assert called["formats"] == ("csv", "junit")
+
+    monkeypatch.setattr(sys, "argv", ["traceability", str(tmp_path), "--formats", "pdf"])
+
+    with pytest.raises(SystemExit):
+        traceability_main.main()
+
 
 @pytest.mark.requirement("SYS-001")
 def test_traceability_module_main_requires_project_root(monkeypatch, capsys):
@@ -325,3 +549,187 @@ def test_traceability_module_main_requires_project_root(monkeypatch, capsys):
 
     assert exc.value.code == 1
     assert "Usage:" in capsys.readouterr().out
+
+
+@pytest.mark.requirement("SYS-001")
+def test_traceability_module_main_dispatches_since(monkeypatch, tmp_path):
+
+    called = {}
+
+    def fake_update(project_root, since):
+        called["args"] = (project_root, since)
+
+    monkeypatch.setattr(traceability_main, "update_traceability_matrix_since", fake_update)
+    monkeypatch.setattr(sys, "argv", ["traceability", str(tmp_path), "--since", "origin/main"])
+
+    traceability_main.main()
+
+    assert called["args"] == (tmp_path, "origin/main")
+
+
+# Cold-start budget for the CLI entry modules, in milliseconds of cumulative
+# import time; REGULATORY_TOOLS_IMPORT_BUDGET_MS overrides it on slow runners
+IMPORT_BUDGET_MS = float(os.environ.get("REGULATORY_TOOLS_IMPORT_BUDGET_MS", "150"))
+
+
+@pytest.mark.requirement("SYS-001")
+@pytest.mark.parametrize(
+    "module", ["regulatory_tools.traceability.__main__", "regulatory_tools.testing.__main__"]
+)
+def test_cli_entry_points_import_lazily(module):
+
+    heavy = ["yaml", "xml.etree.ElementTree", "concurrent.futures", "cProfile",
+             "regulatory_tools.traceability.pipeline"]
+    script = (
+        f"import sys, {module}; "
+        f"print(','.join(name for name in {heavy!r} if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total) / 1000
+
+    assert cumulative[module] < IMPORT_BUDGET_MS, (
+        f"{module} took {cumulative[module]:.1f} ms to import (budget {IMPORT_BUDGET_MS:.0f} ms)"
+    )
+
+
+@pytest.mark.requirement("SYS-001")
+def test_traceability_query_uses_persisted_index(monkeypatch, tmp_path, capsys, make_traceability_project):
+
+    from regulatory_tools.traceability.query import MatrixIndex, query_index_path
+
+    make_traceability_project(tmp_path)
+
+    monkeypatch.setattr(sys, "argv", ["traceability", "query", str(tmp_path), "--status", "UNTESTED"])
+    traceability_main.main()
+
+    captured = capsys.readouterr()
+    assert "rebuilding the query index" in captured.err
+    assert [line.split("\t")[0] for line in captured.out.splitlines()] == ["VER-002", "VER-003"]
+    assert query_index_path(tmp_path).exists()
+
+    monkeypatch.setattr(
+        sys, "argv", ["traceability", "query", str(tmp_path), "--prefix", "VER-", "--has-tests", "--json"]
+    )
+    traceability_main.main()
+
+    captured = capsys.readouterr()
+    assert captured.err == ""
+    assert [json.loads(line)["tests"] for line in captured.out.splitlines()] == [["tests/test_a.py::test_a"]]
+
+    # Rebuilding a stale index leaves stdout to the rows, so --json output stays pipeable
+    (tmp_path / "tests" / "test_a.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.requirement('VER-001')\n"
+        "def test_a():\n"
+        "    pass\n\n"
+        "@pytest.mark.requirement('VER-001')\n"
+        "def test_b():\n"
+        "    pass\n"
+    )
+    traceability_main.main()
+
+    captured = capsys.readouterr()
+    assert "rebuilding the query index" in captured.err
+    assert [json.loads(line)["tests"] for line in captured.out.splitlines()] == [
+        ["tests/test_a.py::test_a", "tests/test_a.py::test_b"]
+    ]
+
+    index = MatrixIndex([
+        {"requirement_id": "SYS-001", "title": "", "tests": [], "evidence_files": ["a.json"],
+         "status": "FAIL"},
+        {"requirement_id": "SYS-002", "title": "", "tests": ["t"], "evidence_files": ["b.json"],
+         "status": "FAIL"},
+        {"requirement_id": "VER-001", "title": "", "tests": [], "evidence_files": [],
+         "status": "UNTESTED"},
+    ])
+
+    assert [r["requirement_id"] for r in index.query(status="FAIL", has_tests=False)] == ["SYS-001"]
+    assert [r["requirement_id"] for r in index.query(status=["FAIL", "UNTESTED"], test="t")] == ["SYS-002"]
+    assert index.query(prefix="SYS", evidence="missing.json") == []
+
+
+@pytest.mark.requirement("VER-004")
+def test_compact_evidence_runs_archives_expires_and_keeps_history(tmp_path):
+
+    from datetime import datetime
+
+    from regulatory_tools.traceability.evidence_archive import (
+        archive_paths,
+        compact_evidence_runs,
+        evidence_archive_dir,
+        evidence_history,
+        iter_archived_records,
+        read_archived_record,
+    )
+
+    evidence_root = tmp_path / "artifacts" / "evidence_runs"
+    for run, result in [("20250101_000000", "PASS"), ("20250601_000000", "FAIL"),
+                        ("20251215_000000", "PASS"), ("20251220_000000", "PASS")]:
+        (evidence_root / run).mkdir(parents=True)
+        for i in range(3):
+            (evidence_root / run / f"t{i}.json").write_text(json.dumps({
+                "test_id": f"tests/test_a.py::test_{i}",
+                "result": result if i == 0 else "PASS",
+                "requirements": ["SYS-001"] if i == 0 else ["SYS-002"],
+            }))
+        (evidence_root / run / "broken.json").write_text("{not json")
+        (evidence_root / run / "list.json").write_text("[1, 2]")
+
+    # Not named after its start time; ordered by its mtime, not its name
+    manual = evidence_root / "manual_run"
+    manual.mkdir()
+    os.utime(manual, (datetime(2024, 6, 1).timestamp(),) * 2)
+
+    result = compact_evidence_runs(
+        tmp_path,
+        keep_runs=1,
+        archive_after_days=30,
+        expire_after_days=365,
+        now=datetime(2026, 1, 1).timestamp(),
+    )
+
+    assert result == {"archived": ["20250601_000000"], "expired": ["manual_run", "20250101_000000"]}
+    # Too recent to archive, and the latest run is always kept
+    assert sorted(p.name for p in evidence_root.iterdir()) == ["20251215_000000", "20251220_000000"]
+
+    archive_dir = evidence_archive_dir(tmp_path)
+    archive, index, summary = archive_paths(archive_dir, "20250601_000000")
+    assert archive.exists() and index.exists()
+    assert json.loads(summary.read_text())["failed"] == 1
+    assert json.loads(summary.read_text())["total_tests"] == 3
+
+    expired_archive, _, expired_summary = archive_paths(archive_dir, "20250101_000000")
+    assert not expired_archive.exists()
+    assert json.loads(expired_summary.read_text())["expired"]
+    assert json.loads(expired_summary.read_text())["passed"] == 3
+
+    assert read_archived_record(archive_dir, "20250601_000000", "t0.json")["result"] == "FAIL"
+    assert len(list(iter_archived_records(archive_dir, "20250601_000000"))) == 3
+
+    history = evidence_history(tmp_path, "SYS-001")
+    assert [(h["run"], h["result"], h["archived"]) for h in history] == [
+        ("20250601_000000", "FAIL", True),
+        ("20251215_000000", "PASS", False),
+        ("20251220_000000", "PASS", False),
+    ]
+
+    # Expiring an archive later keeps its summary
+    compact_evidence_runs(tmp_path, keep_runs=1, expire_after_days=200, now=datetime(2026, 1, 1).timestamp())
+    assert not archive.exists()
+    assert json.loads(summary.read_text())["failed"] == 1
+    assert [h["run"] for h in evidence_history(tmp_path, "SYS-001")] == [
+        "20251215_000000", "20251220_000000"
+    ]
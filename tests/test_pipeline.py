@@ -5,6 +5,8 @@ from regulatory_tools.traceability.generator import build_trace_matrix, apply_te
 from regulatory_tools.traceability.coverage import compute_requirement_coverage
 from regulatory_tools.testing.pytest_runner import run_pytest_with_coverage
 
+import json
+import os
 import pytest
 import sys
 
@@ -128,6 +130,71 @@ def test_run_tests_and_trace_smoke(tmp_path):
 
     assert (project / "docs" / "traceability_matrix.md").exists()
 
+    metrics = (project / "artifacts" / "metrics" / "regulatory_tools.prom").read_text()
+    assert 'regulatory_tools_requirements{project="proj",status="UNTESTED"} 3.0' in metrics
+    assert 'regulatory_tools_requirement_coverage_ratio{project="proj"} 0.0' in metrics
+    assert 'regulatory_tools_pipeline_stage_duration_seconds{project="proj",stage="pytest"}' in metrics
+    assert metrics.endswith("# EOF\n")
+
+
+def _parse_openmetrics(text: str) -> dict[str, list[tuple[dict[str, str], float]]]:
+
+    import re
+
+    label = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+    unescape = {"\\\\": "\\", "\\n": "\n", '\\"': '"'}
+
+    samples: dict[str, list[tuple[dict[str, str], float]]] = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        name, rest = line.split("{", 1)
+        labels, value = rest.rsplit("} ", 1)
+        parsed = {
+            key: re.sub(r"\\.", lambda m: unescape[m.group(0)], raw)
+            for key, raw in label.findall(labels)
+        }
+        samples.setdefault(name, []).append((parsed, float(value)))
+    return samples
+
+
+@pytest.mark.requirement("SYS-001")
+def test_metrics_textfile_has_stage_durations_and_escaped_labels(tmp_path):
+
+    from regulatory_tools.traceability.metrics import write_metrics_textfile
+    from regulatory_tools.traceability.state import save_state
+
+    project = tmp_path / 'proj "a\\b"'
+    project.mkdir()
+    save_state(project, {
+        "matrix": [{"requirement_id": "VER-001", "status": "PASS"}],
+        "verification_cost": [
+            {"requirement_id": "VER-001", "total": 1.5},
+            {"requirement_id": "VER-002", "total": 0.5},
+        ],
+    })
+
+    class Profile:
+        def durations(self):
+            return {"pytest": 2.0, "write\noutputs": 0.25}
+
+    text = write_metrics_textfile(project, Profile()).read_text()
+    samples = _parse_openmetrics(text)
+
+    assert text.endswith("# EOF\n")
+    assert "# HELP regulatory_tools_verification_cost_seconds" in text
+    # Label values round-trip through the escaping
+    assert {labels["project"] for family in samples.values() for labels, _ in family} == {
+        'proj "a\\b"'
+    }
+    assert {labels["stage"]: value for labels, value in samples[
+        "regulatory_tools_pipeline_stage_duration_seconds"
+    ]} == {"pytest": 2.0, "write\noutputs": 0.25}
+    # One sample per requirement, so shared tests are not summed into one total
+    assert {labels["requirement"]: value for labels, value in samples[
+        "regulatory_tools_verification_cost_seconds"
+    ]} == {"VER-001": 1.5, "VER-002": 0.5}
+
 
 @pytest.mark.requirement("VER-002")
 @pytest.mark.requirement("VER-005")
@@ -179,6 +246,308 @@ def test_a():
     assert untested == ["VER-002"]
 
 
+@pytest.mark.requirement("VER-004")
+def test_trace_matrix_is_columnar_with_row_compatible_view():
+
+    from regulatory_tools.traceability.matrix import TraceMatrix
+
+    rows = [
+        {"requirement_id": "VER-001", "title": "A", "tests": "t2, t1",
+         "evidence_files": "a.json", "status": "PASS"},
+        {"requirement_id": "VER-002", "title": "B", "tests": "",
+         "evidence_files": "", "status": "UNTESTED"},
+        {"requirement_id": "VER-003", "title": "C", "tests": "",
+         "evidence_files": "", "status": "UNTESTED"},
+    ]
+
+    matrix = TraceMatrix.from_rows(rows)
+    base = matrix.copy()
+
+    apply_test_markers(matrix, {"VER-001": ["t0"], "VER-002": ["t3"], "VER-999": ["t4"]})
+
+    assert matrix.status == bytearray(b"\x02\x01\x00")
+    assert matrix[0]["tests"] == "t0, t1, t2"
+    assert matrix[-2] == {"requirement_id": "VER-002", "title": "B", "tests": "t3",
+                          "evidence_files": "", "status": "LINKED"}
+    assert compute_requirement_coverage(matrix) == (
+        pytest.approx(66.66666666666666), 2, 3, ["VER-003"]
+    )
+
+    matrix.reset_row("VER-002", base)
+
+    assert matrix.to_rows() == [{**rows[0], "tests": "t0, t1, t2"}, *rows[1:]]
+    assert TraceMatrix.from_rows(matrix.to_rows()) == matrix
+
+
+@pytest.mark.requirement("VER-004")
+def test_matrix_writers_stream_every_format_in_one_pass(tmp_path):
+
+    import csv
+    import xml.etree.ElementTree as ET
+
+    from regulatory_tools.traceability.matrix import TraceMatrix
+    from regulatory_tools.traceability.writers import MatrixWriter, output_writers, write_matrix
+
+    matrix = TraceMatrix.from_rows([
+        {"requirement_id": "VER-001", "title": "A <b>", "tests": "t2, t1",
+         "evidence_files": "a.json", "status": "PASS"},
+        {"requirement_id": "VER-002", "title": "B", "tests": "",
+         "evidence_files": "b.json", "status": "FAIL"},
+        {"requirement_id": "VER-003", "title": "C", "tests": "",
+         "evidence_files": "", "status": "UNTESTED"},
+    ])
+
+    writers = output_writers(tmp_path, ["jsonl", "csv", "html", "junit"])
+    write_matrix(matrix, writers)
+
+    out = tmp_path / "artifacts" / "traceability"
+
+    records = [json.loads(line) for line in (out / "matrix.jsonl").read_text().splitlines()]
+    assert records[0] == {"requirement_id": "VER-001", "title": "A <b>", "tests": ["t1", "t2"],
+                          "evidence_files": ["a.json"], "status": "PASS"}
+    assert [r["status"] for r in records] == ["PASS", "FAIL", "UNTESTED"]
+
+    with (out / "matrix.csv").open(newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["requirement_id", "title", "tests", "evidence_files", "status"]
+    assert rows[1] == ["VER-001", "A <b>", "t1, t2", "a.json", "PASS"]
+
+    html = (out / "matrix.html").read_text()
+    assert "A &lt;b&gt;" in html and "<link" not in html
+    assert "Total Requirements: 3" in html
+
+    suite = ET.parse(out / "matrix.junit.xml").getroot()[0]
+    cases = {case.get("name"): case for case in suite}
+    assert cases["VER-002"].find("failure") is not None
+    assert cases["VER-003"].find("skipped") is not None
+    assert len(cases["VER-001"]) == 1
+
+    # Unchanged content leaves the files alone
+    before = {p.name: p.stat().st_mtime_ns for p in out.iterdir()}
+    write_matrix(matrix, output_writers(tmp_path, ["jsonl", "csv", "html", "junit"]))
+    assert {p.name: p.stat().st_mtime_ns for p in out.iterdir()} == before
+
+    # A writer without write_row fails when created, before any file is opened
+    class IncompleteWriter(MatrixWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteWriter(out / "matrix.txt")
+
+
+@pytest.mark.requirement("VER-004")
+def test_paged_matrix_rewrites_only_changed_pages(tmp_path):
+
+    from regulatory_tools.traceability.generator import PagedMarkdownWriter
+    from regulatory_tools.traceability.matrix import TraceMatrix
+    from regulatory_tools.traceability.writers import write_matrix
+
+    rows = [
+        {"requirement_id": "SYS-001", "title": "A", "tests": "t1",
+         "evidence_files": "", "status": "LINKED"},
+        {"requirement_id": "SYS-002", "title": "B", "tests": "",
+         "evidence_files": "", "status": "UNTESTED"},
+        {"requirement_id": "VER-001", "title": "C", "tests": "",
+         "evidence_files": "c.json", "status": "FAIL"},
+    ]
+    index = tmp_path / "traceability" / "index.md"
+
+    write_matrix(TraceMatrix.from_rows(rows), [PagedMarkdownWriter(index)])
+
+    assert sorted(p.name for p in index.parent.iterdir()) == ["SYS.md", "VER.md", "index.md"]
+    assert "| [SYS](SYS.md) | 2 | SYS-001 – SYS-002 | 1 | 50.0% | 0 |" in index.read_text()
+    assert "| VER-001 | C |  | c.json | FAIL |" in (index.parent / "VER.md").read_text()
+
+    before = {p.name: p.stat().st_mtime_ns for p in index.parent.iterdir()}
+    rows[2]["status"] = "PASS"
+    write_matrix(TraceMatrix.from_rows(rows), [PagedMarkdownWriter(index)])
+    after = {p.name: p.stat().st_mtime_ns for p in index.parent.iterdir()}
+
+    assert after["SYS.md"] == before["SYS.md"]
+    assert after["VER.md"] != before["VER.md"]
+
+    # Fixed-size pages replace the per-prefix ones; files the index never listed stay
+    (index.parent / "notes.md").write_text("Hand-written\n")
+    write_matrix(TraceMatrix.from_rows(rows), [PagedMarkdownWriter(index, page_size=2)])
+
+    assert sorted(p.name for p in index.parent.iterdir()) == [
+        "index.md", "notes.md", "page-0001.md", "page-0002.md"
+    ]
+    assert "| [page-0002](page-0002.md) | 1 | VER-001 – VER-001 | 1 | 100.0% | 0 |" in index.read_text()
+
+    # A prefix named like the index gets a page of its own
+    rows.append({"requirement_id": "index-001", "title": "D", "tests": "",
+                 "evidence_files": "", "status": "UNTESTED"})
+    write_matrix(TraceMatrix.from_rows(rows), [PagedMarkdownWriter(index)])
+
+    assert "| [index](index-page.md) | 1 |" in index.read_text()
+    assert "| index-001 | D |" in (index.parent / "index-page.md").read_text()
+    assert sorted(p.name for p in index.parent.iterdir()) == [
+        "SYS.md", "VER.md", "index-page.md", "index.md", "notes.md"
+    ]
+
+
+@pytest.mark.requirement("VER-004")
+@pytest.mark.requirement("SYS-002")
+def test_generate_traceability_matrix_short_circuits_unchanged_inputs(traceability_project, capsys):
+
+    import os
+
+    project = traceability_project
+
+    generate_traceability_matrix(project)
+
+    output = project / "docs" / "traceability_matrix.md"
+    uncovered = project / "artifacts" / "coverage" / "uncovered_lines.txt"
+    for path in (output, uncovered):
+        os.utime(path, ns=(0, 0))
+    capsys.readouterr()
+
+    generate_traceability_matrix(project)
+
+    assert "No inputs changed" in capsys.readouterr().out
+    assert output.stat().st_mtime_ns == 0
+
+    # Only the marker scan changed: one row is patched, coverage outputs stay untouched
+    (project / "tests" / "test_b.py").write_text(
+        'import pytest\n\n@pytest.mark.requirement("VER-002")\ndef test_b():\n    assert True\n'
+    )
+
+    generate_traceability_matrix(project)
+
+    assert "1 row(s) patched" in capsys.readouterr().out
+    assert "(2 / 3 requirements tested)" in output.read_text()
+    assert uncovered.stat().st_mtime_ns == 0
+
+    # A deleted output is regenerated even though no input changed
+    output.unlink()
+    generate_traceability_matrix(project)
+
+    assert output.exists()
+
+
+@pytest.mark.requirement("SYS-002")
+def test_pipeline_stages_overlap_and_match_the_serial_path(tmp_path, make_traceability_project):
+
+    import threading
+
+    from regulatory_tools.traceability.stages import Stage, run_stages
+
+    # Both independent stages must be running at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    results = run_stages(
+        [
+            Stage("scan", lambda: (barrier.wait(), "markers")[1]),
+            Stage("load", lambda: (barrier.wait(), "rows")[1]),
+            Stage("matrix", lambda scan, load: f"{load}+{scan}", ["scan", "load"]),
+        ],
+        max_workers=2,
+    )
+    assert results["matrix"] == "rows+markers"
+
+    with pytest.raises(ValueError, match="unknown input"):
+        run_stages([Stage("matrix", lambda scan: scan, ["scan"])])
+
+    outputs = {}
+    for workers in (1, 4):
+        project = make_traceability_project(tmp_path / f"proj{workers}")
+
+        generate_traceability_matrix(project, formats=("jsonl",), workers=workers)
+
+        outputs[workers] = [
+            (project / "docs" / "traceability_matrix.md").read_text(),
+            (project / "artifacts" / "traceability" / "matrix.jsonl").read_text(),
+        ]
+
+    assert outputs[1] == outputs[4]
+
+
+@pytest.mark.requirement("SYS-002")
+def test_prepared_stages_are_reused_unless_test_files_changed(traceability_project, monkeypatch):
+
+    from regulatory_tools.traceability import pipeline
+
+    project = traceability_project
+
+    prepared = pipeline.prepare_traceability(project)
+    assert prepared["marker_links"] == {"VER-001": ["tests/test_a.py::test_a"]}
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("markers were scanned again")
+
+    monkeypatch.setattr(pipeline, "scan_test_markers", no_scan)
+    monkeypatch.setattr(pipeline, "load_requirements", no_scan)
+
+    generate_traceability_matrix(project, prepared=prepared)
+
+    assert "(1 / 3 requirements tested)" in (project / "docs" / "traceability_matrix.md").read_text()
+
+    # A test file edited after preparation invalidates the prepared scan
+    (project / "tests" / "test_b.py").write_text(
+        'import pytest\n\n@pytest.mark.requirement("VER-002")\ndef test_b():\n    assert True\n'
+    )
+
+    generate_traceability_matrix(project, prepared=prepared)
+
+    assert "(2 / 3 requirements tested)" in (project / "docs" / "traceability_matrix.md").read_text()
+
+
+@pytest.mark.requirement("SYS-002")
+def test_profiled_pipeline_reports_every_stage(traceability_project, capsys):
+
+    import pstats
+
+    from regulatory_tools.traceability.profiling import PipelineProfile
+
+    project = traceability_project
+
+    profile = PipelineProfile(project, detailed=True)
+    generate_traceability_matrix(project, profile=profile)
+    report = profile.report()
+
+    stages = {record["stage"]: record for record in json.loads(report.read_text())["stages"]}
+
+    assert {"fingerprints", "marker_scan", "requirements", "matrix", "code_health",
+            "write_outputs", "save_state"} <= stages.keys()
+    assert stages["requirements"]["counts"] == {"records": 3}
+    assert stages["marker_scan"]["counts"] == {"files": 1}
+    assert all(r["wall"] >= 0 and r["cpu"] >= 0 and r["peak_memory"] >= 0 for r in stages.values())
+
+    pstats.Stats(str(project / "artifacts" / "profile" / "marker_scan.pstats"))
+    assert "[profile] requirements" in capsys.readouterr().out
+
+
+@pytest.mark.requirement("SYS-002")
+def test_batch_generates_projects_with_shared_catalog_cache(tmp_path, make_traceability_project):
+
+    from regulatory_tools.traceability.batch import generate_batch, resolve_project_roots
+
+    for name in ("svc_a", "svc_b", "svc_broken"):
+        make_traceability_project(tmp_path / "repos" / name, marked_test=name == "svc_a")
+    (tmp_path / "repos" / "svc_broken" / "docs" / "requirements.yaml").write_text("requirements: [")
+    (tmp_path / "repos" / "not_a_project").mkdir()
+
+    roots = resolve_project_roots([str(tmp_path / "repos" / "*")])
+    assert [root.name for root in roots] == ["svc_a", "svc_b", "svc_broken"]
+
+    output = tmp_path / "batch"
+    results = generate_batch(roots, output, workers=2)
+
+    by_name = {Path(r["project"]).name: r for r in results}
+    assert by_name["svc_a"]["tested"] == 1 and by_name["svc_b"]["tested"] == 0
+    assert by_name["svc_broken"]["status"] == "error"
+    assert (roots[1] / "docs" / "traceability_matrix.md").exists()
+
+    # Both healthy projects share one parsed catalog
+    assert len(list((output / "catalog_cache").glob("*.json"))) == 1
+
+    summary = (output / "batch_summary.md").read_text()
+    assert "Projects: 3 (1 failed)" in summary
+    assert "Total Requirements: 6" in summary
+    assert json.loads((output / "batch_summary.json").read_text())["projects"] == results
+
+
 @pytest.mark.requirement("SYS-001")
 def test_run_pytest_with_coverage_uses_active_python(tmp_path, monkeypatch):
 
@@ -207,3 +576,737 @@ def test_run_pytest_with_coverage_uses_active_python(tmp_path, monkeypatch):
 
     assert captured["args"][:3] == [sys.executable, "-m", "pytest"]
     assert captured["cwd"] == project
+    # Per-test contexts and timings are only recorded for the impact index
+    assert "--cov-context=test" not in captured["args"]
+    assert "regulatory_tools.pytest_timing" not in captured["args"]
+
+    run_pytest_with_coverage(project, record_tests=True)
+
+    assert "--cov-context=test" in captured["args"]
+    assert "regulatory_tools.pytest_timing" in captured["args"]
+
+
+@pytest.mark.requirement("SYS-002")
+@pytest.mark.requirement("VER-005")
+def test_incremental_update_since_patches_changed_rows(traceability_project, capsys):
+
+    import subprocess
+
+    from regulatory_tools.traceability.incremental import update_traceability_matrix_since
+    from regulatory_tools.traceability.state import load_state
+
+    project = traceability_project
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=project,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-q", "-m", "init")
+
+    generate_traceability_matrix(project, formats=("csv",), pages=2)
+
+    (project / "tests" / "test_b.py").write_text(
+        'import pytest\n\n@pytest.mark.requirement("VER-002")\ndef test_b():\n    assert True\n'
+    )
+
+    update_traceability_matrix_since(project, "HEAD")
+
+    rows = {row["requirement_id"]: row for row in load_state(project)["matrix"]}
+    output = (project / "docs" / "traceability_matrix.md").read_text()
+
+    assert rows["VER-001"]["status"] == "LINKED"
+    assert rows["VER-002"]["tests"] == "tests/test_b.py::test_b"
+    assert rows["VER-003"]["status"] == "UNTESTED"
+    assert "(2 / 3 requirements tested)" in output
+
+    # Written in the formats and pages of the full run only
+    traceability = project / "artifacts" / "traceability"
+    assert "tests/test_b.py::test_b" in (traceability / "matrix.csv").read_text()
+    assert not (traceability / "matrix.jsonl").exists()
+    assert (project / "docs" / "traceability" / "index.md").exists()
+
+    # The stored state matches the patched outputs, so a full run finds nothing to do
+    assert "tests/test_b.py" in load_state(project)["test_files"]
+    mtime = (traceability / "matrix.csv").stat().st_mtime_ns
+    generate_traceability_matrix(project, formats=("csv",), pages=2)
+    assert (traceability / "matrix.csv").stat().st_mtime_ns == mtime
+    assert "No inputs changed" in capsys.readouterr().out
+
+
+@pytest.mark.requirement("SYS-001")
+def test_plan_shards_balances_by_duration():
+
+    from regulatory_tools.testing.timings import plan_shards
+
+    durations = {
+        "tests/test_slow.py": 10.0,
+        "tests/test_mid.py": 6.0,
+        "tests/test_fast.py": 3.0,
+        "tests/test_tiny.py": 1.0,
+    }
+
+    shards = plan_shards([*durations, "tests/test_new.py"], durations, 2)
+
+    totals = sorted(sum(durations.get(f, 5.0) for f in shard) for shard in shards)
+
+    assert len(shards) == 2
+    assert sorted(f for shard in shards for f in shard) == sorted([*durations, "tests/test_new.py"])
+    assert totals == [12.0, 13.0]
+    assert plan_shards(["tests/test_a.py"], {}, 8) == [["tests/test_a.py"]]
+
+
+@pytest.mark.requirement("SYS-001")
+@pytest.mark.requirement("INF-003")
+def test_run_pytest_with_coverage_sharded_combines_outputs(tmp_path, monkeypatch, capsys):
+
+    import subprocess
+
+    project = tmp_path / "proj"
+    pkg_dir = project / "src" / "dummy_pkg"
+    test_dir = project / "tests"
+    pkg_dir.mkdir(parents=True)
+    test_dir.mkdir()
+
+    (pkg_dir / "__init__.py").write_text(
+        "def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n"
+    )
+    for name, call in (("add", "add(1, 2) == 3"), ("sub", "sub(3, 2) == 1")):
+        (test_dir / f"test_{name}.py").write_text(
+            f"from dummy_pkg import {name}\n\n\ndef test_{name}():\n    assert {call}\n"
+        )
+    (test_dir / "conftest.py").write_text(
+        "import sys\nfrom pathlib import Path\n\n"
+        "sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))\n"
+    )
+
+    run_pytest_with_coverage(project, workers=2, reports=("xml",))
+
+    durations = json.loads((project / "artifacts" / "timing" / "file_durations.json").read_text())
+
+    assert (project / "coverage.xml").exists()
+    assert 'line-rate="1"' in (project / "coverage.xml").read_text()
+    assert set(durations) == {"tests/test_add.py", "tests/test_sub.py"}
+    assert not list((project / "artifacts" / "coverage").glob(".coverage.shard*"))
+
+    # A failed combine fails the run instead of reporting stale coverage
+    run = subprocess.run
+
+    def failing_combine(args, **kwargs):
+        if "combine" in args:
+            return subprocess.CompletedProcess(args, 1)
+        return run(args, **kwargs)
+
+    monkeypatch.setattr("subprocess.run", failing_combine)
+
+    with pytest.raises(SystemExit):
+        run_pytest_with_coverage(project, workers=2)
+
+    assert "coverage combine exited 1" in capsys.readouterr().out
+
+
+def create_impact_project(project: Path):
+
+    pkg_dir = project / "src" / "dummy_pkg"
+    test_dir = project / "tests"
+    pkg_dir.mkdir(parents=True)
+    test_dir.mkdir()
+    (project / "docs").mkdir()
+
+    (project / "docs" / "requirements.yaml").write_text(
+        """
+requirements:
+  - id: VER-001
+    title: Addition
+  - id: VER-002
+    title: Subtraction
+"""
+    )
+    (pkg_dir / "__init__.py").write_text("")
+    (pkg_dir / "add.py").write_text("def add(a, b):\n    return a + b\n")
+    (pkg_dir / "sub.py").write_text("def sub(a, b):\n    return a - b\n")
+
+    (test_dir / "conftest.py").write_text(
+        """
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture(scope="session")
+def evidence_dir():
+    run = ROOT / "artifacts" / "evidence_runs" / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    run.mkdir(parents=True, exist_ok=True)
+    return run
+
+
+@pytest.fixture
+def record(request, evidence_dir):
+    def _record(req_id):
+        name = request.node.name
+        (evidence_dir / f"{name}.json").write_text(json.dumps(
+            {"test_id": request.node.nodeid, "requirements": [req_id], "result": "PASS"}
+        ))
+    return _record
+"""
+    )
+    for name, req_id, call in (
+        ("add", "VER-001", "add(1, 2) == 3"),
+        ("sub", "VER-002", "sub(3, 2) == 1"),
+    ):
+        (test_dir / f"test_{name}.py").write_text(
+            f"import pytest\n\nfrom dummy_pkg.{name} import {name}\n\n\n"
+            f'@pytest.mark.requirement("{req_id}")\n'
+            f"def test_{name}(record):\n    assert {call}\n    record(\"{req_id}\")\n"
+        )
+
+
+@pytest.mark.requirement("SYS-001")
+@pytest.mark.requirement("INF-001")
+def test_run_tests_and_trace_runs_only_impacted_tests(tmp_path):
+
+    from regulatory_tools.testing import run_tests_and_trace
+    from regulatory_tools.testing.impact import load_impact_index
+    from regulatory_tools.traceability.requirement_code import load_requirement_code_map
+
+    project = tmp_path / "proj"
+    create_impact_project(project)
+
+    run_tests_and_trace(project, min_grade=None)
+
+    index = load_impact_index(project)
+    assert index["files"]["src/dummy_pkg/add.py"] == ["tests/test_add.py::test_add"]
+    assert index["requirements"]["tests/test_sub.py::test_sub"] == ["VER-002"]
+
+    code_map = load_requirement_code_map(project)
+    # Only lines run inside the test count; the def line runs at import time
+    assert code_map["requirements"]["VER-001"]["files"] == {"src/dummy_pkg/add.py": "4"}
+    assert code_map["files"] == {
+        "src/dummy_pkg/add.py": ["VER-001"],
+        "src/dummy_pkg/sub.py": ["VER-002"],
+    }
+
+    run_tests_and_trace(project, min_grade=None, changed_files=["src/dummy_pkg/add.py"])
+
+    # Requirements whose tests did not re-run keep their line map
+    assert load_requirement_code_map(project) == code_map
+
+    report = json.loads((project / "artifacts" / "impact" / "impact_report.json").read_text())
+    first, latest = sorted((project / "artifacts" / "evidence_runs").iterdir())
+    carried = json.loads((latest / "test_sub.json").read_text())
+    matrix = (project / "docs" / "traceability_matrix.md").read_text()
+
+    assert report["rerun_tests"] == ["tests/test_add.py::test_add"]
+    assert report["reverified_requirements"] == ["VER-001"]
+    assert report["carried_forward_requirements"] == ["VER-002"]
+    assert carried["carried_forward"] is True
+    assert carried["carried_from"] == first.name
+    assert "**Prior evidence carried forward:** VER-002" in matrix
+    assert (
+        "| VER-002 | Subtraction | tests/test_sub.py::test_sub | test_sub.json | PASS "
+        "| 1 line(s) in 1 file(s) |"
+    ) in matrix
+
+    # Deleting a test re-runs nothing and drops its evidence instead of failing pytest
+    (project / "tests" / "test_sub.py").unlink()
+    run_tests_and_trace(project, min_grade=None, changed_files=["tests/test_sub.py"])
+
+    report = json.loads((project / "artifacts" / "impact" / "impact_report.json").read_text())
+    latest = project / "artifacts" / "evidence_runs" / report["evidence_run"]
+    assert report["rerun_tests"] == []
+    assert sorted(p.name for p in latest.iterdir()) == ["test_add.json"]
+
+
+@pytest.mark.requirement("SYS-001")
+def test_select_impacted_tests_skips_deleted_tests_and_runs_all_for_new_sources(tmp_path):
+
+    from regulatory_tools.testing.impact import INDEX_VERSION, impact_index_path, select_impacted_tests
+
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "tests").mkdir()
+    for rel_path in ("src/pkg/a.py", "src/pkg/unused.py", "tests/test_a.py"):
+        (tmp_path / rel_path).write_text("")
+
+    impact_index_path(tmp_path).parent.mkdir(parents=True)
+    impact_index_path(tmp_path).write_text(json.dumps({
+        "version": INDEX_VERSION,
+        "files": {"src/pkg/a.py": ["tests/test_a.py::test_a", "tests/test_gone.py::test_gone"]},
+        "sources": ["src/pkg/a.py", "src/pkg/unused.py"],
+        "requirements": {},
+    }))
+
+    # Tests in deleted files are not passed to pytest
+    assert select_impacted_tests(tmp_path, ["src/pkg/a.py", "tests/test_gone.py"]) == [
+        "tests/test_a.py::test_a"
+    ]
+    # A known source file no test executed selects nothing
+    assert select_impacted_tests(tmp_path, ["src/pkg/unused.py"]) == []
+
+    # A source file the index has never seen has no impact history
+    (tmp_path / "src" / "pkg" / "new.py").write_text("")
+    assert select_impacted_tests(tmp_path, ["src/pkg/new.py"]) is None
+
+
+@pytest.mark.requirement("VER-005")
+@pytest.mark.requirement("INF-003")
+def test_verification_cost_aggregates_timings_per_requirement(tmp_path):
+
+    from regulatory_tools.traceability.generator import write_markdown
+    from regulatory_tools.traceability.verification_cost import compute_verification_cost
+
+    timings = {
+        "tests/test_a.py::test_slow[1]": {"setup": 0.5, "call": 2.0, "teardown": 0.1},
+        "tests/test_a.py::test_slow[2]": {"setup": 0.0, "call": 1.0, "teardown": 0.0},
+        "tests/test_b.py::test_fast": {"setup": 0.0, "call": 0.25, "teardown": 0.0},
+    }
+    marker_links = {
+        "VER-001": ["tests/test_b.py::test_fast"],
+        "VER-002": ["tests/test_a.py::test_slow", "tests/test_b.py::test_fast"],
+        "VER-003": ["tests/test_c.py::test_untimed"],
+    }
+
+    cost = compute_verification_cost(timings, marker_links)
+
+    assert [row["requirement_id"] for row in cost] == ["VER-002", "VER-001"]
+    assert cost[0]["tests"] == 2
+    assert cost[0]["call"] == pytest.approx(3.25)
+    assert cost[0]["total"] == pytest.approx(3.85)
+
+    output = tmp_path / "matrix.md"
+    write_markdown([], output, verification_cost=cost)
+
+    assert "| VER-002 | 2 | 0.500 | 3.250 | 0.100 | 3.850 |" in output.read_text()
+
+
+@pytest.mark.requirement("SYS-001")
+@pytest.mark.skipif(not hasattr(__import__("os"), "fork"), reason="warm worker needs os.fork")
+def test_warm_worker_runs_pytest_with_fresh_project_modules(tmp_path, monkeypatch):
+
+    import subprocess
+    import time
+
+    from regulatory_tools.testing.warm_worker import stop_worker, worker_socket_path
+
+    project = tmp_path / "proj"
+    pkg_dir = project / "src" / "dummy_pkg"
+    test_dir = project / "tests"
+    pkg_dir.mkdir(parents=True)
+    test_dir.mkdir()
+
+    (pkg_dir / "__init__.py").write_text("VALUE = 1\n")
+    (test_dir / "conftest.py").write_text(
+        "import sys\nfrom pathlib import Path\n\n"
+        "sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))\n"
+    )
+    (test_dir / "test_value.py").write_text(
+        "import dummy_pkg\n\n\ndef test_value():\n    assert dummy_pkg.VALUE == 1\n"
+    )
+
+    socket_path = worker_socket_path(project)
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "regulatory_tools.testing", "worker", str(project)],
+        stdout=subprocess.DEVNULL,
+    )
+
+    try:
+        for _ in range(100):
+            if socket_path.exists():
+                break
+            time.sleep(0.05)
+
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("pytest should run in the warm worker")
+
+        monkeypatch.setattr("subprocess.run", no_subprocess)
+
+        run_pytest_with_coverage(project)
+        assert (project / ".coverage").exists()
+
+        # Project modules are re-imported on every run, never served stale
+        (pkg_dir / "__init__.py").write_text("VALUE = 2\n")
+        (test_dir / "test_value.py").write_text(
+            "import dummy_pkg\n\n\ndef test_value():\n    assert dummy_pkg.VALUE == 2\n"
+        )
+        run_pytest_with_coverage(project)
+    finally:
+        monkeypatch.undo()
+        stop_worker(socket_path)
+        worker.wait(timeout=10)
+
+    assert not socket_path.exists()
+
+
+_FORGE_STUB = '''
+import json
+import os
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+
+_CONFIG = json.loads(Path(__file__).with_name("behaviour.json").read_text())
+
+
+def _grade(scores):
+    scored = [score for score in scores.values() if score is not None]
+    overall = sum(scored) / len(scored) if scored else None
+    return overall, "A" if overall is not None and overall >= 0.75 else "C"
+
+
+if _CONFIG["grader"]:
+    grade_scores = _grade
+
+
+def _meet(name, log):
+    # Returns only once every collector of the rendezvous has started
+    Path(f"{log}.{name}").touch()
+    others = [n for n, b in _CONFIG["collectors"].items() if isinstance(b, dict) and b.get("meet")]
+    deadline = time.monotonic() + 10
+    while not all(Path(f"{log}.{n}").exists() for n in others):
+        if time.monotonic() > deadline:
+            raise RuntimeError("collectors did not run concurrently")
+        time.sleep(0.02)
+
+
+class Aggregator:
+
+    def __init__(self, collectors=None):
+        self.collectors = collectors or list(_CONFIG["collectors"])
+
+    def run(self, project_root, skip_test_run=False):
+        scores = {}
+        for name in self.collectors:
+            behaviour = _CONFIG["collectors"][name]
+            with open(_CONFIG["log"], "a") as log:
+                log.write(f"{name} {os.getpid()}\\n")
+            if behaviour == "hang":
+                time.sleep(60)
+            if behaviour == "crash":
+                raise RuntimeError("vulture crashed")
+            if isinstance(behaviour, dict):
+                _meet(name, _CONFIG["log"])
+                behaviour = behaviour["score"]
+            scores[name] = behaviour
+
+        overall, grade = _grade(scores)
+        report = types.SimpleNamespace(
+            project_name="proj", overall_score=overall, grade=grade, generated_at=datetime(2026, 1, 1)
+        )
+        for name, score in scores.items():
+            setattr(report, name, types.SimpleNamespace(
+                score=score, skipped=False, skip_reason=None, line_coverage=80.0
+            ))
+        return report
+'''
+
+
+def _install_forge_stub(monkeypatch, tmp_path, collectors, grader=True):
+    """
+    Install a minimal ``forge`` package, importable here and in forge job
+    processes, whose Aggregator reports each collector per *collectors*
+    (a score, ``"hang"``, ``"crash"`` or ``{"score": ..., "meet": True}`` to
+    wait until all meeting collectors run). With *grader* it exposes
+    ``grade_scores``, grading 0.75 and up as A. Returns a function reading
+    the ``(collector, pid)`` runs logged so far.
+    """
+
+    from regulatory_tools.quality import forge_integration
+
+    stub_dir = tmp_path / "forge_stub"
+    (stub_dir / "forge").mkdir(parents=True, exist_ok=True)
+    (stub_dir / "forge" / "__init__.py").write_text("")
+    (stub_dir / "forge" / "aggregator.py").write_text(_FORGE_STUB)
+    log = stub_dir / "runs.log"
+    log.write_text("")
+    (stub_dir / "forge" / "behaviour.json").write_text(
+        json.dumps({"collectors": collectors, "grader": grader, "log": str(log)})
+    )
+
+    monkeypatch.syspath_prepend(str(stub_dir))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(stub_dir), os.environ.get("PYTHONPATH")])))
+    monkeypatch.delitem(sys.modules, "forge", raising=False)
+    monkeypatch.delitem(sys.modules, "forge.aggregator", raising=False)
+    monkeypatch.setattr(forge_integration, "_FORGE_AVAILABLE", None)
+    monkeypatch.setattr(
+        "regulatory_tools.traceability.coverage_reports.render_coverage_reports",
+        lambda project_root, formats: [],
+    )
+
+    return lambda: [tuple(line.split()) for line in log.read_text().splitlines()]
+
+
+@pytest.mark.requirement("SYS-001")
+def test_forge_summary_is_cached_per_project_inputs(tmp_path, monkeypatch):
+
+    from regulatory_tools.quality import forge_integration
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "src" / "mod.py").write_text("X = 1\n")
+    (tmp_path / "tests" / "test_mod.py").write_text("def test_x():\n    pass\n")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.regulatory_tools.forge]\ncollectors = ["test_metrics", "complexity"]\n'
+    )
+
+    runs = _install_forge_stub(monkeypatch, tmp_path, {"test_metrics": 0.8, "complexity": 0.8})
+
+    def ran():
+        names = sorted(name for name, _ in runs())
+        (tmp_path / "forge_stub" / "runs.log").write_text("")
+        return names
+
+    summary = forge_integration.get_forge_summary(tmp_path)
+    assert summary["collectors"]["test_metrics"]["line_coverage"] == 80.0
+    assert forge_integration.get_forge_summary(tmp_path) == summary
+    assert ran() == ["complexity", "test_metrics"]
+
+    # A test change only re-runs the collectors that read the tests
+    (tmp_path / "tests" / "test_mod.py").write_text("def test_x():\n    assert True\n")
+    forge_integration.get_forge_summary(tmp_path)
+    assert ran() == ["test_metrics"]
+
+    # Reverting hits the entry recorded for the original tree
+    (tmp_path / "tests" / "test_mod.py").write_text("def test_x():\n    pass\n")
+    assert forge_integration.get_forge_summary(tmp_path) == summary
+    assert ran() == []
+
+
+@pytest.mark.requirement("SYS-001")
+def test_forge_reuses_collectors_whose_inputs_did_not_change(tmp_path, monkeypatch, capsys):
+
+    from regulatory_tools.quality import forge_integration
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "src" / "mod.py").write_text("X = 1\n")
+    (tmp_path / "tests" / "test_mod.py").write_text("def test_x():\n    pass\n")
+
+    _install_forge_stub(monkeypatch, tmp_path, {"test_metrics": 0.8, "complexity": 0.6})
+    forge_integration.get_forge_summary(tmp_path, ["test_metrics", "complexity"])
+
+    # Re-running complexity now would score it differently
+    runs = _install_forge_stub(monkeypatch, tmp_path, {"test_metrics": 1.0, "complexity": 0.1})
+    (tmp_path / "tests" / "test_mod.py").write_text("def test_x():\n    assert True\n")
+    capsys.readouterr()
+
+    summary = forge_integration.get_forge_summary(tmp_path, ["test_metrics", "complexity"])
+
+    assert [name for name, _ in runs()] == ["test_metrics"]
+    assert "Reusing cached results for: complexity" in capsys.readouterr().out
+    assert summary["collectors"]["complexity"]["score"] == 0.6
+    assert summary["collectors"]["test_metrics"]["score"] == 1.0
+    # Graded by forge over the reused and the fresh score
+    assert summary["overall_score"] == pytest.approx(0.8)
+    assert summary["grade"] == "A"
+
+
+@pytest.mark.requirement("SYS-001")
+def test_forge_collectors_started_before_the_tests_are_not_run_again(tmp_path, monkeypatch):
+
+    from regulatory_tools.quality import forge_integration
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "mod.py").write_text("X = 1\n")
+    selected = ["test_metrics", "complexity", "static_analysis"]
+    runs = _install_forge_stub(
+        monkeypatch, tmp_path, {"test_metrics": 0.8, "complexity": 0.6, "static_analysis": 0.7}
+    )
+
+    # test_metrics reads the coverage of the test run, so it is not started early
+    started = forge_integration.start_forge_collectors(tmp_path, selected)
+    assert sorted(started["jobs"]) == ["complexity", "static_analysis"]
+
+    summary = forge_integration.get_forge_summary(tmp_path, selected, started)
+
+    assert sorted(name for name, _ in runs()) == sorted(selected)
+    assert {name: c["score"] for name, c in summary["collectors"].items()} == {
+        "test_metrics": 0.8, "complexity": 0.6, "static_analysis": 0.7
+    }
+    assert started["jobs"] == {}
+
+    # A job whose source changed after it started is stopped and run again
+    (tmp_path / "src" / "mod.py").write_text("X = 2\n")
+    started = forge_integration.start_forge_collectors(tmp_path, ["complexity"])
+    early = started["jobs"]["complexity"]["proc"]
+    (tmp_path / "src" / "mod.py").write_text("X = 3\n")
+
+    restarted = []
+    start_job = forge_integration._start_job
+    monkeypatch.setattr(
+        forge_integration, "_start_job", lambda *args: restarted.append(args[1]) or start_job(*args)
+    )
+    summary = forge_integration.get_forge_summary(tmp_path, ["complexity"], started)
+
+    assert restarted == ["complexity"]
+    assert early.poll() is not None
+    assert summary["collectors"]["complexity"]["score"] == 0.6
+
+
+@pytest.mark.requirement("SYS-001")
+def test_forge_collectors_run_concurrently_within_budgets(tmp_path, monkeypatch, capsys):
+
+    from regulatory_tools.quality import forge_integration
+
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.regulatory_tools.forge]\n"
+        "budget = 20\n"
+        "[tool.regulatory_tools.forge.budgets]\n"
+        "complexity = 1\n"
+    )
+
+    runs = _install_forge_stub(monkeypatch, tmp_path, {
+        # Both must be running at the same time to meet
+        "test_metrics": {"score": 0.9, "meet": True},
+        "static_analysis": {"score": 0.7, "meet": True},
+        "complexity": "hang",
+        "dead_code": "crash",
+        # Configured in forge but not selected
+        "type_coverage": 0.1,
+    })
+
+    summary = forge_integration.get_forge_summary(
+        tmp_path, ["test_metrics", "complexity", "static_analysis", "dead_code"]
+    )
+
+    collectors = summary["collectors"]
+    assert sorted(collectors) == ["complexity", "dead_code", "static_analysis", "test_metrics"]
+    assert len({pid for _, pid in runs()}) == 4
+
+    # The collectors that finished keep their scores
+    assert collectors["test_metrics"]["score"] == 0.9
+    assert collectors["static_analysis"]["score"] == 0.7
+    assert collectors["complexity"]["skipped"]
+    assert collectors["complexity"]["skip_reason"] == "exceeded its 1 s budget"
+    assert collectors["dead_code"]["skip_reason"] == "failed: vulture crashed"
+    assert "Collector complexity exceeded its 1 s budget" in capsys.readouterr().out
+
+    # The over-budget collector was stopped, not left running
+    pid = int(dict(runs())["complexity"])
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+    # Combined scores are graded by forge, not by thresholds of our own
+    assert summary["overall_score"] == pytest.approx(0.8)
+    assert summary["grade"] == "A"
+
+    # A forge older than the supported API is not run at all
+    runs = _install_forge_stub(monkeypatch, tmp_path, {"test_metrics": 0.9}, grader=False)
+
+    assert forge_integration.get_forge_summary(tmp_path, ["test_metrics"]) is None
+    assert "lacks grade_scores" in capsys.readouterr().out
+    assert runs() == []
+
+    with pytest.raises(ValueError, match="Unknown forge collector"):
+        forge_integration.forge_collector_settings(tmp_path, ["coverage"])
+
+
+@pytest.mark.requirement("SYS-001")
+def test_unknown_forge_collector_is_reported_when_forge_runs(tmp_path, monkeypatch):
+
+    from regulatory_tools.quality import forge_integration
+    from regulatory_tools.traceability.fingerprint import value_digest
+    from regulatory_tools.traceability.pipeline import _input_fingerprints
+
+    runs = _install_forge_stub(monkeypatch, tmp_path, {"test_metrics": 0.9})
+
+    # Fingerprinting and the early start do not fail on the name...
+    fingerprints = _input_fingerprints(tmp_path, {}, None, (), None, ["coverage"])
+    assert fingerprints["forge"] == value_digest(None)
+    assert forge_integration.start_forge_collectors(tmp_path, ["coverage"]) is None
+
+    # ...it is reported once, by the forge run itself
+    with pytest.raises(ValueError, match="Unknown forge collector"):
+        forge_integration.get_forge_summary(tmp_path, ["coverage"])
+    assert runs() == []
+
+
+@pytest.mark.requirement("SYS-001")
+def test_forge_cache_evicts_least_recently_used(tmp_path):
+
+    from regulatory_tools.quality.forge_cache import ForgeCache
+
+    def inputs(source):
+        return {"source": source, "tests": "t", "coverage": "c", "requirements": "r",
+                "dependencies": "d", "forge": "1.0"}
+
+    cache = ForgeCache(tmp_path / "cache.json", max_entries=2)
+    for source in ("a", "b"):
+        cache.put(inputs(source), {"grade": source, "collectors": {"complexity": {"score": 1.0}}})
+
+    assert cache.get(inputs("a"))["grade"] == "a"
+    cache.put(inputs("c"), {"grade": "c", "collectors": {"complexity": {"score": 1.0}}})
+    cache.save()
+
+    cache = ForgeCache(tmp_path / "cache.json", max_entries=2)
+    assert cache.get(inputs("b")) is None
+    assert [cache.get(inputs(s))["grade"] for s in ("a", "c")] == ["a", "c"]
+    assert len(cache.collectors["complexity"]) == 2
+
+
+@pytest.mark.requirement("SYS-001")
+def test_serve_answers_live_status_and_refreshes_changed_tests(tmp_path, make_traceability_project):
+
+    import threading
+    import urllib.error
+    import urllib.request
+
+    from regulatory_tools.traceability.server import TraceabilityService, make_server
+
+    make_traceability_project(tmp_path)
+    test_file = tmp_path / "tests" / "test_a.py"
+
+    service = TraceabilityService(tmp_path)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path):
+        with urllib.request.urlopen(base + path) as response:
+            return json.loads(response.read())
+
+    try:
+        summary = get("/summary")
+        assert summary["statuses"]["LINKED"] == 1 and summary["requirements"] == 3
+        assert [row["requirement_id"] for row in get("/matrix?status=UNTESTED")] == ["VER-002", "VER-003"]
+
+        detail = get("/requirements/VER-001")
+        assert detail["tests"] == ["tests/test_a.py::test_a"]
+        assert detail["evidence"] == []
+
+        assert service.refresh() == set()
+
+        test_file.write_text(
+            "import pytest\n\n@pytest.mark.requirement('VER-002')\ndef test_a():\n    assert True\n"
+        )
+        assert service.refresh() == {"tests"}
+        assert [row["requirement_id"] for row in get("/matrix?has_tests=true")] == ["VER-002"]
+
+        run = tmp_path / "artifacts" / "evidence_runs" / "2026-01-01T00-00-00"
+        run.mkdir(parents=True)
+        (run / "ver3.json").write_text(
+            json.dumps({"requirements": ["VER-003"], "test_id": "t::v3", "result": "FAIL"})
+        )
+        assert service.refresh() == {"evidence"}
+        assert get("/summary")["statuses"]["FAIL"] == 1
+        assert get("/requirements/VER-003")["evidence"][0]["result"] == "FAIL"
+
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            get("/requirements/VER-999")
+        assert exc.value.code == 404
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            get("/matrix?colour=red")
+        assert exc.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()